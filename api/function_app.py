@@ -2,10 +2,85 @@ import azure.functions as func
 import logging
 import json
 import os
+import threading
+import time
 import pyodbc
+from azure.storage.blob import BlobServiceClient
+from datetime import datetime, timedelta, timezone
 
 app = func.FunctionApp()
 
+# Seconds a /stats result is served from memory before SQL is queried again
+STATS_CACHE_TTL = int(os.environ.get('STATS_CACHE_TTL', '30'))
+
+# Warm connection reused across invocations of this worker process
+_conn = None
+_conn_lock = threading.Lock()
+_stats_cache = {"data": None, "expires": 0.0}
+_stats_lock = threading.Lock()
+
+# Gold snapshots published by the pipeline (src/snapshots.py). The pointer is
+# re-read at most every SNAPSHOT_POINTER_TTL seconds; the versioned view
+# blobs it names never change, so their bodies are cached per version.
+SNAPSHOT_CONTAINER = os.environ.get('SNAPSHOT_CONTAINER', 'gold')
+SNAPSHOT_POINTER = 'snapshots/latest.json'
+SNAPSHOT_POINTER_TTL = int(os.environ.get('SNAPSHOT_POINTER_TTL', '60'))
+
+_snapshot_container = None
+_snapshot_cache = {"pointer": None, "expires": 0.0, "bodies": {}}
+_snapshot_lock = threading.Lock()
+
+# /electricity/series limits and defaults
+SERIES_DEFAULT_POINTS = 1000
+SERIES_MAX_POINTS = int(os.environ.get('SERIES_MAX_POINTS', '5000'))
+SERIES_DEFAULT_DAYS = 7
+# Fingrid dataset 192 is published at 3-minute resolution
+SERIES_RAW_RESOLUTION = int(os.environ.get('SERIES_RAW_RESOLUTION', '180'))
+# A level is used when it yields at most this many rows per requested point,
+# so LTTB has enough detail to pick from without pulling the raw table
+SERIES_OVERSAMPLE = 4
+
+# Series sources from finest to coarsest: (name, bucket seconds, query)
+SERIES_LEVELS = [
+    ("raw", SERIES_RAW_RESOLUTION, """
+        SELECT start_time, value_mw, NULL, NULL FROM fact_electricity_production
+        WHERE dataset_id = ? AND start_time >= ? AND start_time < ?
+        ORDER BY start_time
+    """),
+    ("hourly", 3600, """
+        SELECT bucket_start, avg_mw, min_mw, max_mw FROM agg_electricity_hourly
+        WHERE dataset_id = ? AND bucket_start >= ? AND bucket_start < ?
+        ORDER BY bucket_start
+    """),
+    ("daily", 86400, """
+        SELECT bucket_start, avg_mw, min_mw, max_mw FROM agg_electricity_daily
+        WHERE dataset_id = ? AND bucket_start >= ? AND bucket_start < ?
+        ORDER BY bucket_start
+    """),
+    ("monthly", 30 * 86400, """
+        SELECT bucket_start, avg_mw, min_mw, max_mw FROM agg_electricity_monthly
+        WHERE dataset_id = ? AND bucket_start >= ? AND bucket_start < ?
+        ORDER BY bucket_start
+    """),
+]
+
+# All dashboard numbers in one round trip. Row counts come from partition
+# metadata instead of COUNT(*) scans; the latest value is a TOP 1 seek.
+STATS_QUERY = """
+SELECT
+    (SELECT SUM(p.rows) FROM sys.partitions AS p
+     WHERE p.object_id = OBJECT_ID('dbo.fact_electricity_production') AND p.index_id IN (0, 1)) AS electricity_rows,
+    (SELECT SUM(p.rows) FROM sys.partitions AS p
+     WHERE p.object_id = OBJECT_ID('dbo.dim_companies') AND p.index_id IN (0, 1)) AS company_rows,
+    latest.value_mw,
+    latest.start_time
+FROM (SELECT 1 AS anchor) AS one
+OUTER APPLY (
+    SELECT TOP 1 value_mw, start_time FROM fact_electricity_production ORDER BY start_time DESC
+) AS latest;
+"""
+
+
 def get_db_connection():
     # Use the same connection string from environment variables
     conn_str = os.environ.get('SQL_CONNECTION_STRING')
@@ -20,12 +95,236 @@ def get_db_connection():
     
     return pyodbc.connect(conn_str)
 
+
+def fetch_one(query: str, params: tuple = ()):
+    """Run a query on the warm connection and return its first row."""
+    return _execute(query, params, lambda cursor: cursor.fetchone())
+
+
+def fetch_all(query: str, params: tuple = ()) -> list:
+    """Run a query on the warm connection and return all rows."""
+    return _execute(query, params, lambda cursor: cursor.fetchall())
+
+
+def _execute(query: str, params: tuple, fetch):
+    """Execute on the warm connection, reconnecting once if it has dropped."""
+    global _conn
+    with _conn_lock:
+        for attempt in range(2):
+            try:
+                if _conn is None:
+                    _conn = get_db_connection()
+                cursor = _conn.cursor()
+                cursor.execute(query, params)
+                return fetch(cursor)
+            except pyodbc.Error:
+                logging.warning('SQL connection failed, reconnecting (attempt %d)', attempt + 1)
+                try:
+                    if _conn is not None:
+                        _conn.close()
+                except pyodbc.Error:
+                    pass
+                _conn = None
+                if attempt:
+                    raise
+
+
+def get_snapshot_container():
+    """Container client for Gold snapshots, or None when storage is not configured."""
+    global _snapshot_container
+    conn_str = os.environ.get('AZURE_STORAGE_CONNECTION_STRING')
+    if _snapshot_container is None and conn_str:
+        _snapshot_container = BlobServiceClient.from_connection_string(conn_str).get_container_client(
+            SNAPSHOT_CONTAINER
+        )
+    return _snapshot_container
+
+
+def load_snapshot(view: str):
+    """
+    Return (body bytes, ETag) of the current snapshot of a view.
+
+    Returns None when snapshots are not configured, not yet published or do
+    not contain the view, so callers can fall back to SQL.
+    """
+    container = get_snapshot_container()
+    if container is None:
+        return None
+
+    with _snapshot_lock:
+        if time.monotonic() >= _snapshot_cache["expires"]:
+            try:
+                pointer = json.loads(container.get_blob_client(SNAPSHOT_POINTER).download_blob().readall())
+            except Exception as e:
+                logging.warning('Could not read snapshot pointer: %s', e)
+                pointer = _snapshot_cache["pointer"]
+            if pointer and pointer != _snapshot_cache["pointer"]:
+                _snapshot_cache["bodies"] = {}
+            _snapshot_cache.update(pointer=pointer, expires=time.monotonic() + SNAPSHOT_POINTER_TTL)
+
+        pointer = _snapshot_cache["pointer"]
+        if not pointer or view not in pointer["views"]:
+            return None
+
+        body = _snapshot_cache["bodies"].get(view)
+        if body is None:
+            body = container.get_blob_client(pointer["views"][view]).download_blob().readall()
+            _snapshot_cache["bodies"][view] = body
+        return body, f'"{pointer["version"]}-{view}"'
+
+
+def snapshot_response(req: func.HttpRequest, body: bytes, etag: str) -> func.HttpResponse:
+    """Serve a snapshot body, answering 304 when the client already has this version."""
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={STATS_CACHE_TTL}"}
+    known = [tag.strip().removeprefix('W/') for tag in req.headers.get('If-None-Match', '').split(',')]
+    if etag in known or '*' in known:
+        return func.HttpResponse(status_code=304, headers=headers)
+    return func.HttpResponse(body, mimetype="application/json", status_code=200, headers=headers)
+
+
+def load_stats() -> dict:
+    """Dashboard stats, served from the in-process cache while fresh."""
+    with _stats_lock:
+        if _stats_cache["data"] is not None and time.monotonic() < _stats_cache["expires"]:
+            return _stats_cache["data"]
+
+        electricity_rows, company_rows, latest_val, _ = fetch_one(STATS_QUERY)
+        data = {
+            "electricity": {
+                "latest_mw": float(latest_val or 0),
+                "total_records": int(electricity_rows or 0)
+            },
+            "companies": {
+                "total": int(company_rows or 0)
+            },
+            "source": "Azure SQL Database"
+        }
+        _stats_cache.update(data=data, expires=time.monotonic() + STATS_CACHE_TTL)
+        return data
+
+
+def _parse_time(value: str, default: datetime) -> datetime:
+    """Parse an ISO-8601 query parameter into a naive UTC datetime."""
+    if not value:
+        return default
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def choose_level(start: datetime, end: datetime, points: int) -> tuple:
+    """Pick the finest series level that returns at most points * SERIES_OVERSAMPLE rows."""
+    span = (end - start).total_seconds()
+    for level in SERIES_LEVELS:
+        if span / level[1] <= points * SERIES_OVERSAMPLE:
+            return level
+    return SERIES_LEVELS[-1]
+
+
+def lttb(xs: list, ys: list, threshold: int) -> list:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Args:
+        xs: Ascending x values
+        ys: Values at xs
+        threshold: Number of points to keep (>= 3)
+
+    Returns:
+        Indices of the kept points, ascending
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    bucket_size = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle vertex
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        count = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / count
+        avg_y = sum(ys[next_start:next_end]) / count
+
+        ax, ay = xs[a], ys[a]
+        best, best_area = next_start - 1, -1.0
+        for j in range(int(i * bucket_size) + 1, next_start):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+
+    selected.append(n - 1)
+    return selected
+
+
+def envelopes(keep: list, lows: list, highs: list) -> tuple:
+    """
+    Min and max over all source rows each kept point stands for.
+
+    The rows between two kept indices are split at their midpoint, so every
+    source row (including those LTTB dropped) falls in exactly one point's
+    envelope.
+
+    Args:
+        keep: Ascending kept indices, as returned by lttb
+        lows: Minimum of each source row
+        highs: Maximum of each source row
+
+    Returns:
+        (mins, maxs), one entry per kept index
+    """
+    mins, maxs = [], []
+    for p, index in enumerate(keep):
+        first = 0 if p == 0 else (keep[p - 1] + index) // 2 + 1
+        last = len(lows) if p == len(keep) - 1 else (index + keep[p + 1]) // 2 + 1
+        mins.append(min(lows[first:last]))
+        maxs.append(max(highs[first:last]))
+    return mins, maxs
+
+
+def load_series(dataset: int, start: datetime, end: datetime, points: int) -> dict:
+    """Fetch a range from the best rollup level and downsample it to ``points``."""
+    name, _, query = choose_level(start, end, points)
+    rows = fetch_all(query, (dataset, start, end))
+
+    epoch = datetime(1970, 1, 1)
+    xs = [int((row[0] - epoch).total_seconds()) for row in rows]
+    ys = [float(row[1]) for row in rows]
+    keep = lttb(xs, ys, points)
+
+    data = {
+        "dataset": dataset,
+        "granularity": name,
+        "start": start.isoformat() + 'Z',
+        "end": end.isoformat() + 'Z',
+        "source_points": len(rows),
+        "t": [xs[i] for i in keep],
+        "v": [round(ys[i], 4) for i in keep],
+    }
+    if name != "raw":
+        data["min"], data["max"] = envelopes(
+            keep, [float(row[2]) for row in rows], [float(row[3]) for row in rows]
+        )
+    return data
+
+
 @app.route(route="stats", auth_level=func.AuthLevel.ANONYMOUS)
 def get_stats(req: func.HttpRequest) -> func.HttpResponse:
     logging.info('Processing request for stats.')
 
     try:
-        # Connect to DB (In a real app, use a connection pool or Context Manager)
+        snapshot = load_snapshot("stats")
+        if snapshot is not None:
+            return snapshot_response(req, *snapshot)
+    except Exception as e:
+        logging.warning('Serving stats from SQL, snapshot unavailable: %s', e)
+
+    try:
         # Note: This requires the SQL ENV VARS to be set in Azure Static Web App settings!
         
         # For this demo, we'll try to connect. If no env vars, we return error.
@@ -36,39 +335,14 @@ def get_stats(req: func.HttpRequest) -> func.HttpResponse:
                 status_code=500
             )
 
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            # 1. Fetch latest electricity consumption (Simulated query for now as we need to know exact table state)
-            # We'll just try to count rows or get the latest record
-            cursor.execute("SELECT COUNT(*) FROM fact_electricity_production")
-            count = cursor.fetchone()[0]
-
-            cursor.execute("SELECT TOP 1 value_mw, start_time FROM fact_electricity_production ORDER BY start_time DESC")
-            latest = cursor.fetchone()
-            
-            latest_val = latest[0] if latest else 0
-            
-            # 2. Fetch companies count
-            cursor.execute("SELECT COUNT(*) FROM dim_companies")
-            companies = cursor.fetchone()[0]
-
-            data = {
-                "electricity": {
-                    "latest_mw": float(latest_val),
-                    "total_records": int(count)
-                },
-                "companies": {
-                    "total": int(companies)
-                },
-                "source": "Azure SQL Database"
-            }
-
-            return func.HttpResponse(
-                json.dumps(data),
-                mimetype="application/json",
-                status_code=200
-            )
+        data = load_stats()
+
+        return func.HttpResponse(
+            json.dumps(data),
+            mimetype="application/json",
+            status_code=200,
+            headers={"Cache-Control": f"public, max-age={STATS_CACHE_TTL}"}
+        )
 
     except Exception as e:
         logging.error(f"Error connecting to DB: {str(e)}")
@@ -85,3 +359,74 @@ def get_stats(req: func.HttpRequest) -> func.HttpResponse:
             mimetype="application/json",
             status_code=500
         )
+
+
+@app.route(route="electricity/series", auth_level=func.AuthLevel.ANONYMOUS)
+def get_electricity_series(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Downsampled electricity series.
+
+    Query parameters: start, end (ISO-8601, default the last 7 days),
+    dataset (default 192) and points (default 1000, at most SERIES_MAX_POINTS).
+    The response is columnar: ``t`` holds epoch seconds and ``v`` the values,
+    plus ``min``/``max`` envelopes when a rollup level is used: the extremes
+    of all rollup buckets a point stands for, so LTTB does not hide spikes.
+    """
+    logging.info('Processing request for electricity series.')
+
+    try:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        end = _parse_time(req.params.get('end'), now)
+        start = _parse_time(req.params.get('start'), end - timedelta(days=SERIES_DEFAULT_DAYS))
+        dataset = int(req.params.get('dataset', '192'))
+        points = min(max(int(req.params.get('points', SERIES_DEFAULT_POINTS)), 3), SERIES_MAX_POINTS)
+        if start >= end:
+            raise ValueError("start must be before end")
+    except ValueError as e:
+        return func.HttpResponse(
+            json.dumps({"error": f"Invalid parameters: {e}"}),
+            mimetype="application/json",
+            status_code=400
+        )
+
+    try:
+        data = load_series(dataset, start, end, points)
+        return func.HttpResponse(
+            json.dumps(data, separators=(',', ':')),
+            mimetype="application/json",
+            status_code=200,
+            headers={"Cache-Control": f"public, max-age={STATS_CACHE_TTL}"}
+        )
+
+    except Exception as e:
+        logging.error(f"Error loading electricity series: {str(e)}")
+        return func.HttpResponse(
+            json.dumps({"error": str(e)}),
+            mimetype="application/json",
+            status_code=500
+        )
+
+
+@app.route(route="snapshots/{view}", auth_level=func.AuthLevel.ANONYMOUS)
+def get_snapshot(req: func.HttpRequest) -> func.HttpResponse:
+    """Serve a published Gold snapshot view (stats, companies_by_city, electricity_daily, ...)."""
+    view = req.route_params.get('view')
+    logging.info('Processing request for snapshot %s.', view)
+
+    try:
+        snapshot = load_snapshot(view)
+    except Exception as e:
+        logging.error(f"Error reading snapshot {view}: {str(e)}")
+        return func.HttpResponse(
+            json.dumps({"error": str(e)}),
+            mimetype="application/json",
+            status_code=500
+        )
+
+    if snapshot is None:
+        return func.HttpResponse(
+            json.dumps({"error": f"No snapshot for view '{view}'"}),
+            mimetype="application/json",
+            status_code=404
+        )
+    return snapshot_response(req, *snapshot)
@@ -0,0 +1 @@
+# NordicDataFlow benchmarks
@@ -0,0 +1,88 @@
+"""
+Benchmark: bytes stored and peak RSS of each Bronze format.
+
+Each format is measured in a fresh subprocess so peak RSS is not shared.
+Peak RSS is reported as the growth over the process's high-water mark
+after the synthetic payload has been built, i.e. the cost of serialising
+and uploading it.
+
+Usage:
+    python -m benchmarks.bench_bronze_format --records 1000000
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.stubs import MemoryBlobServiceClient
+from src.storage import AzureStorageClient, BRONZE_FORMATS
+
+
+def fingrid_payload(records: int) -> dict:
+    """Synthetic Bronze payload shaped like a Fingrid /data page."""
+    return {
+        "source": "fingrid",
+        "ingested_at": "2024-01-01T00:00:00",
+        "dataset_id": 192,
+        "data": {
+            "data": [
+                {
+                    "datasetId": 192,
+                    "startTime": f"2024-01-01T{(n // 20) % 24:02d}:{(n * 3) % 60:02d}:00.000Z",
+                    "endTime": f"2024-01-01T{(n // 20) % 24:02d}:{(n * 3 + 3) % 60:02d}:00.000Z",
+                    "value": 8000 + (n * 7919) % 3000 + 0.25,
+                }
+                for n in range(records)
+            ],
+            "pagination": {"currentPage": 1, "lastPage": 1},
+        },
+    }
+
+
+def peak_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def worker(fmt: str, records: int) -> dict:
+    payload = fingrid_payload(records)
+    service = MemoryBlobServiceClient(discard=True)
+    storage = AzureStorageClient(blob_service_client=service)
+    baseline = peak_rss_kb()
+    started = time.perf_counter()
+    blob_name = storage.upload_to_bronze(payload, "fingrid", "dataset_192", records_path="data.data", fmt=fmt)
+    return {
+        "format": fmt,
+        "bytes": service.sizes[("bronze", blob_name)],
+        "seconds": time.perf_counter() - started,
+        "peak_rss_growth_mb": (peak_rss_kb() - baseline) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=500_000)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args.worker, args.records)))
+        return
+
+    print(f"Records: {args.records:,}")
+    print(f"{'format':<12}{'bytes':>14}{'seconds':>10}{'peak RSS +MB':>14}")
+    for fmt in BRONZE_FORMATS:
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_bronze_format", "--worker", fmt, "--records", str(args.records)],
+            capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            print(f"{fmt:<12}failed: {completed.stderr.strip().splitlines()[-1]}")
+            continue
+        stats = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(f"{fmt:<12}{stats['bytes']:>14,}{stats['seconds']:>10.2f}{stats['peak_rss_growth_mb']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: per-row MERGE vs set-based bulk upsert into dim_companies.
+
+Runs against the database configured in .env. Synthetic companies use the
+business ID prefix ``BENCH-`` and are deleted before and after the run, so
+point this at a development database.
+
+Usage:
+    python -m benchmarks.bench_company_load --rows 100000 --rowwise-rows 2000
+"""
+import argparse
+import time
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from src.database import GoldLoader
+
+BENCH_PREFIX = "BENCH-"
+FORMS = ["OY", "OYJ", "KY", "AY", "OK", "SÄÄ"]
+CITIES = ["HELSINKI", "ESPOO", "TAMPERE", "VANTAA", "OULU", "TURKU", "JYVÄSKYLÄ"]
+
+
+def synthetic_companies(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Generate a Silver-shaped companies frame."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(rows)
+    dates = pd.Timestamp("1990-01-01") + pd.to_timedelta(rng.integers(0, 12000, rows), unit="D")
+    return pd.DataFrame({
+        "business_id": [f"{BENCH_PREFIX}{i:07d}" for i in ids],
+        "name": [f"Benchmark Company {i} Oy" for i in ids],
+        "registration_date": dates.strftime("%Y-%m-%d"),
+        "company_form": rng.choice(FORMS, rows),
+        "status": rng.choice(["1", "2"], rows),
+        "city": rng.choice(CITIES, rows),
+        "post_code": [f"{code:05d}" for code in rng.integers(100, 99999, rows)],
+    })
+
+
+def to_parquet(df: pd.DataFrame) -> BytesIO:
+    buffer = BytesIO()
+    df.to_parquet(buffer, index=False)
+    buffer.seek(0)
+    return buffer
+
+
+def cleanup(loader: GoldLoader) -> None:
+    loader.db.execute_query("DELETE FROM dim_companies WHERE business_id LIKE ?", (f"{BENCH_PREFIX}%",))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Companies for the bulk path")
+    parser.add_argument("--rowwise-rows", type=int, default=2_000,
+                        help="Companies timed on the per-row path (extrapolated to --rows)")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    loader = GoldLoader()
+    df = synthetic_companies(args.rows)
+    cleanup(loader)
+
+    try:
+        sample = df.head(args.rowwise_rows)
+        started = time.perf_counter()
+        loader.upsert_companies_rowwise(sample)
+        rowwise_secs = time.perf_counter() - started
+        rowwise_rate = len(sample) / rowwise_secs
+        cleanup(loader)
+
+        started = time.perf_counter()
+        first = loader.upsert_companies_bulk(to_parquet(df), batch_size=args.batch_size)
+        bulk_secs = time.perf_counter() - started
+
+        # Second pass: same extract with 10% changed rows exercises the update/unchanged paths
+        changed = df.copy()
+        changed.loc[changed.index % 10 == 0, "status"] = "3"
+        started = time.perf_counter()
+        second = loader.upsert_companies_bulk(to_parquet(changed), batch_size=args.batch_size)
+        rerun_secs = time.perf_counter() - started
+    finally:
+        cleanup(loader)
+
+    print(f"\nCompanies: {args.rows:,}")
+    print(f"Per-row MERGE : {rowwise_rate:10,.0f} rows/s  "
+          f"(measured on {len(sample):,}, ~{args.rows / rowwise_rate:,.0f}s extrapolated)")
+    print(f"Bulk (insert) : {args.rows / bulk_secs:10,.0f} rows/s  ({bulk_secs:,.1f}s)  {first}")
+    print(f"Bulk (re-run) : {args.rows / rerun_secs:10,.0f} rows/s  ({rerun_secs:,.1f}s)  {second}")
+    print(f"Speed-up      : {(args.rows / rowwise_rate) / bulk_secs:,.1f}x")
+
+
+if __name__ == "__main__":
+    main()
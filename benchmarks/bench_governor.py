@@ -0,0 +1,81 @@
+"""
+Benchmark: request governor behaviour against a fault-injecting stub API.
+
+Fetches a multi-page Fingrid window under several upstream conditions and
+reports wall time, answers by status, retries and the concurrency limit
+the governor settled on.
+
+Usage:
+    python -m benchmarks.bench_governor --pages 60 --capacity 4 --max-per-host 16
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("FINGRID_API_KEY", "benchmark")
+
+import src.ingest as ingest  # noqa: E402
+from src.governor import CircuitOpenError  # noqa: E402
+from benchmarks.stubs import MemoryStorage, StubAPIServer  # noqa: E402
+
+
+def scenarios(args) -> list:
+    return [
+        ("healthy", {}),
+        (f"capacity {args.capacity}", {"capacity": args.capacity, "retry_after": 0.2}),
+        ("5% 503s", {"error_rate": 0.05}),
+        ("outage", {"error_rate": 1.0}),
+    ]
+
+
+def run(faults: dict, args) -> dict:
+    with StubAPIServer(latency=args.latency, fingrid_pages=args.pages, records_per_page=10, **faults) as stub:
+        # Only Fingrid: every stub API shares one host, which would otherwise
+        # get the StatFin rate limit from API_RATE_LIMITS
+        ingester = ingest.DataIngester(storage=MemoryStorage(), endpoints={"fingrid": stub.endpoints["fingrid"]},
+                                       max_per_host=args.max_per_host)
+        started = time.perf_counter()
+        try:
+            result = ingester.ingest_fingrid_window(
+                192, start_time="2024-01-01T00:00:00Z", end_time="2024-01-02T00:00:00Z",
+                page_size=10, max_in_flight=args.max_per_host, incremental=False,
+            )
+            outcome = f"{result['pages']} pages"
+        except CircuitOpenError:
+            outcome = "circuit open"
+        except Exception as e:
+            outcome = type(e).__name__
+        elapsed = time.perf_counter() - started
+        stats = next(iter(ingester.governor_stats().values()))
+        ingester.close()
+        return {
+            "seconds": elapsed,
+            "outcome": outcome,
+            "statuses": dict(sorted(stub.statuses.items())),
+            "peak": stub.peak_in_flight,
+            **stats,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub response delay in seconds")
+    parser.add_argument("--pages", type=int, default=60, help="Fingrid pages in the window")
+    parser.add_argument("--capacity", type=int, default=4, help="Concurrent requests the stub accepts")
+    parser.add_argument("--max-per-host", type=int, default=16, help="Concurrency ceiling of the governor")
+    parser.add_argument("--rate", type=float, default=200, help="Governor requests/s per host")
+    args = parser.parse_args()
+
+    ingest.GOVERNOR_RATE = args.rate
+    ingest.GOVERNOR_BURST = args.max_per_host
+
+    print(f"\n{'scenario':<14}{'seconds':>9}  {'outcome':<14}{'retries':>8}{'limit':>7}{'peak':>6}"
+          f"  {'circuit':<9}statuses")
+    for name, faults in scenarios(args):
+        stats = run(faults, args)
+        print(f"{name:<14}{stats['seconds']:>9.2f}  {stats['outcome']:<14}{stats['retries']:>8}"
+              f"{stats['limit']:>7}{stats['peak']:>6}  {stats['circuit']:<9}{stats['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
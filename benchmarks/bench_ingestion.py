@@ -0,0 +1,53 @@
+"""
+Benchmark: sequential vs concurrent run_full_ingestion against a local stub API.
+
+Usage:
+    python -m benchmarks.bench_ingestion --latency 0.2 --fingrid-pages 8
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("FINGRID_API_KEY", "benchmark")
+
+import src.ingest as ingest  # noqa: E402
+from benchmarks.stubs import MemoryStorage, StubAPIServer  # noqa: E402
+
+
+def run(concurrent: bool, args) -> dict:
+    with StubAPIServer(latency=args.latency, fingrid_pages=args.fingrid_pages) as stub:
+        ingester = ingest.DataIngester(
+            storage=MemoryStorage(),
+            endpoints=stub.endpoints,
+            max_per_host=args.max_per_host,
+        )
+        started = time.perf_counter()
+        results = ingest.run_full_ingestion(concurrent=concurrent, ingester=ingester)
+        elapsed = time.perf_counter() - started
+        ingester.close()
+        return {
+            "seconds": elapsed,
+            "requests": stub.requests,
+            "connections": stub.connections,
+            "ok": all(result.get("status") in ("success", "skipped") for result in results.values()),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub response delay in seconds")
+    parser.add_argument("--fingrid-pages", type=int, default=8)
+    parser.add_argument("--max-per-host", type=int, default=4)
+    args = parser.parse_args()
+
+    sequential = run(False, args)
+    concurrent = run(True, args)
+
+    print(f"\n{'mode':<12}{'seconds':>10}{'requests':>10}{'connections':>13}{'ok':>5}")
+    for name, stats in (("sequential", sequential), ("concurrent", concurrent)):
+        print(f"{name:<12}{stats['seconds']:>10.2f}{stats['requests']:>10}{stats['connections']:>13}{stats['ok']!s:>5}")
+    print(f"Speed-up: {sequential['seconds'] / concurrent['seconds']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Benchmark: offline end-to-end pipeline run (ingest → transform → load).
+
+Synthetic Fingrid, PRH, StatFin and Eurostat payloads (benchmarks.synthetic)
+are served by the local stub API. Bronze and Silver go to in-memory blob
+storage, or to files under --storage-dir, and the Gold load runs against
+the recording SQL stand-in, or against a development database given with
+--sql (its tables are created and written to).
+
+Each stage (one source through one phase) reports rows/s, input bytes/s,
+latency percentiles of its operations (HTTP requests for ingest, blobs for
+transform and load) and peak RSS. Results are saved as JSON; pass an
+earlier file as --baseline to compare runs across commits.
+
+Usage:
+    python -m benchmarks.bench_pipeline --scale 1 --output before.json
+    python -m benchmarks.bench_pipeline --scale 1 --baseline before.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("FINGRID_API_KEY", "benchmark")
+
+import numpy as np  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+import src.ingest as ingest  # noqa: E402
+import src.storage as storage_module  # noqa: E402
+import src.transform as transform_module  # noqa: E402
+from src.config import BRONZE_CONTAINER, SILVER_CONTAINER, STATE_PREFIX  # noqa: E402
+from src.database import LOAD_TARGETS, ConnectionPool, DatabaseManager, GoldLoader, load_target  # noqa: E402
+from src.storage import BRONZE_FORMATS, AzureStorageClient  # noqa: E402
+from src.transform import ENGINES, TRANSFORM_SOURCES, DataTransformer, transform_source  # noqa: E402
+from benchmarks.stubs import (  # noqa: E402
+    LocalBlobServiceClient,
+    MemoryBlobServiceClient,
+    RecordingSQLPool,
+    StubAPIServer,
+)
+from benchmarks.synthetic import (  # noqa: E402
+    EUROSTAT_DATASET,
+    PRH_FIRST_DAY,
+    PRH_LAST_DAY,
+    STATFIN_TABLE,
+    SyntheticAPI,
+)
+
+FINGRID_START = datetime(2024, 1, 1)
+
+# Ingest stages: (source, SyntheticAPI.records key, ingest call)
+INGEST_STAGES = [
+    ("fingrid", "fingrid", lambda ingester, api, args: ingester.ingest_fingrid_window(
+        192, start_time=FINGRID_START, end_time=FINGRID_START + timedelta(minutes=3 * api.fingrid_records),
+        page_size=args.fingrid_page_size, incremental=False,
+    )),
+    ("prh", "prh", lambda ingester, api, args: ingester.crawl_prh_companies(
+        start_date=PRH_FIRST_DAY, end_date=PRH_LAST_DAY,
+    )),
+    ("stat_finland_tables", "stat_finland", lambda ingester, api, args: ingester.ingest_stat_finland_table(
+        STATFIN_TABLE,
+    )),
+    ("eurostat", "eurostat", lambda ingester, api, args: ingester.ingest_eurostat(EUROSTAT_DATASET)),
+]
+TRANSFORM_STAGES = ["fingrid", "prh", "stat_finland_tables", "eurostat"]
+LOAD_STAGES = ["electricity", "companies", "eurostat"]
+
+
+def current_rss_mb() -> float:
+    """Resident set size now (Linux), or the process high-water mark elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class RssSampler:
+    """Tracks the peak RSS while a ``with`` block runs by sampling in a background thread."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.start_mb = self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def __enter__(self):
+        self.start_mb = self.peak_mb = current_rss_mb()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+
+def timed(fn, samples: list):
+    """Wrap ``fn`` so every call's duration is appended to ``samples``."""
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - started)
+    return wrapper
+
+
+def layer_bytes(service, container: str) -> int:
+    """Bytes stored in a container, excluding pipeline state documents."""
+    return sum(
+        blob.size for blob in service.get_container_client(container).list_blobs()
+        if not blob.name.startswith(f"{STATE_PREFIX}/")
+    )
+
+
+def silver_rows(storage: AzureStorageClient, blob_paths) -> int:
+    """Rows in Silver Parquet blobs, from their footers."""
+    return sum(
+        pq.ParquetFile(io.BytesIO(storage.read_from_container(SILVER_CONTAINER, path))).metadata.num_rows
+        for path in blob_paths if path
+    )
+
+
+def run_stage(name: str, fn, samples: list, verbose: bool) -> tuple:
+    """Run one stage, returning (result, seconds, RssSampler)."""
+    samples.clear()
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with output, RssSampler() as rss:
+        started = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - started
+    if isinstance(result, dict) and result.get("status") == "error":
+        raise RuntimeError(f"{name}: {result['error']}")
+    return result, seconds, rss
+
+
+def stage_record(name: str, seconds: float, rows: int, bytes_in: int, bytes_out: int,
+                 samples: list, rss: RssSampler, **extra) -> dict:
+    latencies = np.array(samples or [0.0]) * 1000
+    record = {
+        "stage": name,
+        "seconds": round(seconds, 4),
+        "rows": rows,
+        "rows_per_s": round(rows / seconds, 1) if seconds else None,
+        "bytes_in": bytes_in,
+        "bytes_out": bytes_out,
+        "bytes_per_s": round(bytes_in / seconds, 1) if seconds else None,
+        "operations": len(samples),
+        "latency_ms": {
+            "p50": round(float(np.percentile(latencies, 50)), 3),
+            "p95": round(float(np.percentile(latencies, 95)), 3),
+            "p99": round(float(np.percentile(latencies, 99)), 3),
+            "max": round(float(latencies.max()), 3),
+        },
+        "rss_start_mb": round(rss.start_mb, 1),
+        "peak_rss_mb": round(rss.peak_mb, 1),
+        **extra,
+    }
+    print(f"   {name:<30}{rows:>10,}{seconds:>9.2f}s{record['rows_per_s'] or 0:>12,.0f}"
+          f"{(record['bytes_per_s'] or 0) / 2**20:>9.1f}{record['latency_ms']['p50']:>9.1f}"
+          f"{record['latency_ms']['p95']:>9.1f}{record['latency_ms']['p99']:>9.1f}{rss.peak_mb:>9.0f}")
+    return record
+
+
+def run(args) -> dict:
+    api = SyntheticAPI(scale=args.scale)
+    service = LocalBlobServiceClient(args.storage_dir) if args.storage_dir else MemoryBlobServiceClient()
+    storage = AzureStorageClient(blob_service_client=service)
+    if args.sql:
+        db = DatabaseManager(pool=ConnectionPool(args.sql))
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.create_schema()
+    else:
+        db = DatabaseManager(pool=RecordingSQLPool())
+
+    stages = []
+    samples = []
+    print(f"\n   {'stage':<30}{'rows':>10}{'time':>10}{'rows/s':>12}{'MB/s':>9}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'RSS MB':>9}")
+
+    with StubAPIServer(latency=args.latency, payloads=api) as stub:
+        ingester = ingest.DataIngester(storage=storage, endpoints=stub.endpoints, max_per_host=args.max_per_host)
+        ingester._request = timed(ingester._request, samples)
+        for source, counter, call in INGEST_STAGES:
+            records, http, bronze = api.records[counter], stub.bytes_sent, layer_bytes(service, BRONZE_CONTAINER)
+            _, seconds, rss = run_stage(f"ingest:{source}", lambda: call(ingester, api, args), samples, args.verbose)
+            stages.append(stage_record(
+                f"ingest:{source}", seconds, api.records[counter] - records, stub.bytes_sent - http,
+                layer_bytes(service, BRONZE_CONTAINER) - bronze, samples, rss,
+            ))
+        ingester.close()
+
+    transformer = DataTransformer(storage=storage)
+    for _, _, method in TRANSFORM_SOURCES:
+        setattr(transformer, method, timed(getattr(transformer, method), samples))
+    for source in TRANSFORM_STAGES:
+        read, silver = service.bytes_read.get(BRONZE_CONTAINER, 0), layer_bytes(service, SILVER_CONTAINER)
+        paths, seconds, rss = run_stage(
+            f"transform:{source}", lambda: transform_source(transformer, source), samples, args.verbose
+        )
+        bytes_in = service.bytes_read.get(BRONZE_CONTAINER, 0) - read
+        stages.append(stage_record(
+            f"transform:{source}", seconds, silver_rows(storage, paths), bytes_in,
+            layer_bytes(service, SILVER_CONTAINER) - silver, samples, rss,
+        ))
+
+    loader = GoldLoader(storage=storage, db=db)
+    for _, _, method in LOAD_TARGETS:
+        setattr(loader, method, timed(getattr(loader, method), samples))
+    for target in LOAD_STAGES:
+        read, sql = service.bytes_read.get(SILVER_CONTAINER, 0), db.pool_stats()
+        loaded, seconds, rss = run_stage(
+            f"load:{target}", lambda: load_target(loader, target), samples, args.verbose
+        )
+        bytes_in = service.bytes_read.get(SILVER_CONTAINER, 0) - read
+        after = db.pool_stats()
+        extra = {"sql_checkouts": after["checkouts"] - sql["checkouts"]}
+        if "round_trips" in after:
+            extra["sql_round_trips"] = after["round_trips"] - sql["round_trips"]
+            extra["sql_rows_bound"] = after["rows_bound"] - sql["rows_bound"]
+        stages.append(stage_record(
+            f"load:{target}", seconds, silver_rows(storage, loaded), bytes_in, 0, samples, rss, **extra,
+        ))
+
+    return {
+        "benchmark": "pipeline",
+        "commit": git_commit(),
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "args": vars(args),
+        "sizes": {
+            "fingrid_records": api.fingrid_records,
+            "prh_companies": api.prh_companies,
+            "statfin_cells": api.statfin_cells,
+            "eurostat_cells": api.eurostat_cells,
+        },
+        "stages": stages,
+        "totals": {
+            "seconds": round(sum(stage["seconds"] for stage in stages), 4),
+            "peak_rss_mb": max(stage["peak_rss_mb"] for stage in stages),
+        },
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print rows/s and peak RSS of each stage relative to a baseline run."""
+    before = {stage["stage"]: stage for stage in baseline["stages"]}
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'} ({baseline.get('created_at')}):")
+    print(f"   {'stage':<30}{'rows/s':>12}{'change':>9}{'RSS MB':>9}{'change':>9}")
+    for stage in results["stages"]:
+        old = before.get(stage["stage"])
+        if not old or not old["rows_per_s"] or not stage["rows_per_s"]:
+            continue
+        speed = stage["rows_per_s"] / old["rows_per_s"] - 1
+        memory = stage["peak_rss_mb"] - old["peak_rss_mb"]
+        print(f"   {stage['stage']:<30}{stage['rows_per_s']:>12,.0f}{speed:>+9.1%}"
+              f"{stage['peak_rss_mb']:>9.0f}{memory:>+9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier of the synthetic source sizes")
+    parser.add_argument("--storage-dir", help="Keep blobs as files under this (empty) directory instead of in memory")
+    parser.add_argument("--sql", help="ODBC connection string of a development database to load into")
+    parser.add_argument("--bronze-format", choices=BRONZE_FORMATS, default=storage_module.BRONZE_FORMAT)
+    parser.add_argument("--transform-engine", choices=ENGINES, default=transform_module.TRANSFORM_ENGINE)
+    parser.add_argument("--fingrid-page-size", type=int, default=ingest.FINGRID_PAGE_SIZE)
+    parser.add_argument("--max-per-host", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub response delay in seconds")
+    parser.add_argument("--output", help="Results JSON (default: bench_pipeline_<commit>_<time>.json)")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare with")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own output")
+    args = parser.parse_args()
+
+    if args.storage_dir and os.path.isdir(args.storage_dir) and os.listdir(args.storage_dir):
+        parser.error(f"--storage-dir {args.storage_dir} is not empty")
+
+    storage_module.BRONZE_FORMAT = ingest.BRONZE_FORMAT = args.bronze_format
+    transform_module.TRANSFORM_ENGINE, transform_module.TRANSFORM_ENGINES = args.transform_engine, {}
+    # Measure the pipeline, not the politeness limits of the real APIs
+    ingest.GOVERNOR_RATE = 1e6
+    ingest.GOVERNOR_BURST = 1_000_000
+    ingest.API_RATE_LIMITS = {}
+
+    results = run(args)
+    print(f"   {'total':<30}{'':>10}{results['totals']['seconds']:>9.2f}s")
+
+    output = args.output or f"bench_pipeline_{results['commit'] or 'local'}_{storage_module.utc_timestamp()}.json"
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Micro-benchmark: per-record PRH flattening loop vs columnar flattening.
+
+The loop is the pre-columnar transform_prh_companies body (a datetime call
+and dict .get chains per company, then a DataFrame); the columnar path is
+flatten_prh_companies. Both run over synthetic YTJ v3 companies.
+
+Usage:
+    python -m benchmarks.bench_prh_flatten --companies 500000
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from src.transform import flatten_prh_companies
+
+FORMS = [("OY", "Osakeyhtiö", "Limited company"), ("KY", "Kommandiittiyhtiö", "Limited partnership"),
+         ("OYJ", "Julkinen osakeyhtiö", "Public limited company")]
+CITIES = [("HELSINKI", "HELSINGFORS"), ("ESPOO", "ESBO"), ("TAMPERE", "TAMMERFORS"), ("OULU", "ULEÅBORG")]
+
+
+def synthetic_companies(count: int, seed: int = 7) -> list:
+    """Companies in the PRH YTJ v3 response shape."""
+    rng = random.Random(seed)
+    companies = []
+    for n in range(count):
+        form = rng.choice(FORMS)
+        city_fi, city_sv = rng.choice(CITIES)
+        names = [{"name": f"Company {n} Oy", "type": "1", "registrationDate": "2015-01-01",
+                  "endDate": None, "version": 1, "source": "1"}]
+        if n % 4 == 0:
+            names.append({"name": f"Old Name {n} Oy", "type": "1", "registrationDate": "2001-01-01",
+                          "endDate": "2014-12-31", "version": 2, "source": "1"})
+        companies.append({
+            "businessId": {"value": f"{n:07d}-{n % 10}", "registrationDate": "2001-01-01", "source": "3"},
+            "names": names,
+            "companyForms": [{"type": form[0], "registrationDate": "2001-01-01", "endDate": None, "version": 1,
+                              "descriptions": [{"languageCode": "1", "description": form[1]},
+                                               {"languageCode": "3", "description": form[2]}]}],
+            "addresses": [{"type": 1, "street": f"Katu {n % 200}", "buildingNumber": str(n % 50 + 1),
+                           "postCode": f"{rng.randint(100, 99999):05d}", "registrationDate": "2001-01-01",
+                           "postOffices": [{"city": city_fi, "languageCode": "1", "municipalityCode": "091"},
+                                           {"city": city_sv, "languageCode": "2", "municipalityCode": "091"}]}],
+            "registrationDate": "2001-01-01",
+            "status": "2",
+        })
+    return companies
+
+
+def loop_flatten(companies: list) -> pd.DataFrame:
+    """The per-record loop the columnar path replaced."""
+    cleaned_records = []
+    for company in companies:
+        record = {
+            "business_id": company.get("businessId", ""),
+            "name": company.get("name", ""),
+            "registration_date": company.get("registrationDate", ""),
+            "company_form": company.get("companyForm", ""),
+            "status": company.get("status", ""),
+            "transformed_at": datetime.utcnow().isoformat(),
+        }
+        addresses = company.get("addresses", [])
+        if addresses:
+            addr = addresses[0]
+            record["street"] = addr.get("street", "")
+            record["city"] = addr.get("city", "")
+            record["post_code"] = addr.get("postCode", "")
+        cleaned_records.append(record)
+    return pd.DataFrame(cleaned_records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    companies = synthetic_companies(args.companies)
+    transformed_at = datetime.utcnow().isoformat()
+
+    def best_of(fn) -> float:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    loop_secs = best_of(lambda: loop_flatten(companies))
+    columnar_secs = best_of(lambda: flatten_prh_companies(companies, transformed_at))
+
+    print(f"Companies: {args.companies:,} (best of {args.repeat})")
+    print(f"Loop     : {loop_secs:6.2f}s  {args.companies / loop_secs:12,.0f} companies/s")
+    print(f"Columnar : {columnar_secs:6.2f}s  {args.companies / columnar_secs:12,.0f} companies/s")
+    print(f"Speed-up : {loop_secs / columnar_secs:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Benchmark: pandas vs Arrow transform engines on synthetic Bronze blobs.
+
+Each (transform, engine) pair runs in a fresh subprocess so peak RSS is
+not shared. The Bronze blob is built and uploaded first; the reported
+time, rows/s and peak RSS growth cover the Bronze → Silver transform
+only. The digest is a SHA-256 of the Silver table without its
+``transformed_at`` column, so equal digests mean identical output.
+
+Before the timed runs both engines transform a small Fingrid blob of
+int-only and float batches with null-bearing and repeated rows; the
+benchmark exits non-zero when the engines' output differs there or in
+any timed run. For PRH both engines share the Arrow flattener and only
+deduplicate business IDs differently.
+
+Usage:
+    python -m benchmarks.bench_transform_engine --records 1000000
+    python -m benchmarks.bench_transform_engine --transforms fingrid --bronze-format json
+"""
+import argparse
+import hashlib
+import io
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import pyarrow.parquet as pq
+
+from benchmarks.stubs import MemoryBlobServiceClient
+from benchmarks.synthetic import SyntheticAPI
+from src.config import SILVER_CONTAINER
+from src.storage import AzureStorageClient, BRONZE_FORMATS
+from src.transform import DataTransformer, ENGINES
+
+TRANSFORMS = ("fingrid", "prh")
+# With this batch size the parity_records() batches alternate int-only and
+# float values, which pandas infers as different dtypes
+PARITY_BATCH_SIZE = 3
+
+
+def fingrid_records(records: int) -> list:
+    """Fingrid rows with ~1% non-numeric or negative values and ~5% repeated rows."""
+    rows = []
+    for n in range(records):
+        value = 8000 + (n * 7919) % 3000 + (n % 4) * 0.25
+        if n % 211 == 0:
+            value = "n/a"
+        elif n % 307 == 0:
+            value = -value
+        minute = 3 * n
+        rows.append({
+            "datasetId": 192 + n % 3,
+            "startTime": f"2024-{1 + minute // 44640 % 12:02d}-{1 + minute // 1440 % 28:02d}T"
+                         f"{minute // 60 % 24:02d}:{minute % 60:02d}:00.000Z",
+            "endTime": f"2024-01-01T00:{(minute + 3) % 60:02d}:00.000Z",
+            "value": value,
+        })
+    return rows + rows[::20]
+
+
+def parity_records() -> list:
+    """Fingrid rows with dtype and null edge cases, repeated across batches of PARITY_BATCH_SIZE."""
+    def row(minute, value, dataset_id=192):
+        start = None if minute is None else f"2024-01-01T00:{minute:02d}:00.000Z"
+        return {"datasetId": dataset_id, "startTime": start, "endTime": "2024-01-01T00:03:00.000Z", "value": value}
+
+    return [
+        row(0, 9000), row(3, 9001), row(6, 9002, dataset_id=None),
+        row(0, 9000), row(9, 9001.5), row(6, 9002.0, dataset_id=None),
+        row(None, 9003, dataset_id=193), row(3, "n/a"), row(12, -5),
+        row(None, 9003.0, dataset_id=193), row(9, 9001.5), row(15, 0),
+    ]
+
+
+def bronze_blob(storage: AzureStorageClient, transform: str, records: int, fmt: str,
+                fingrid_rows: list = None) -> str:
+    """Upload a synthetic Bronze blob under a fixed name (source_blob is part of the compared output)."""
+    if transform == "fingrid":
+        rows = fingrid_records(records) if fingrid_rows is None else fingrid_rows
+        payload = {"source": "fingrid", "dataset_id": 192, "data": {"data": rows}}
+        source, dataset, records_path = "fingrid", "dataset_192", "data.data"
+    else:
+        api = SyntheticAPI()
+        api.prh_companies = records
+        companies = [api.prh_company(n) for n in range(records)]
+        payload = {"source": "prh", "data": {"companies": companies + companies[::20]}}
+        source, dataset, records_path = "prh", "companies", "data.companies"
+    return storage.upload_to_bronze(payload, source, dataset, records_path=records_path, fmt=fmt, blob_stem="bench")
+
+
+def silver_digest(storage: AzureStorageClient, silver_path: str) -> tuple:
+    table = pq.read_table(io.BytesIO(storage.read_from_container(SILVER_CONTAINER, silver_path)))
+    table = table.drop_columns(["transformed_at"])
+    # Hash values rather than Arrow buffers, whose layout may differ for equal data
+    digest = hashlib.sha256(str(table.schema.remove_metadata()).encode())
+    for column in table.columns:
+        digest.update(repr(column.to_pylist()).encode())
+    return table.num_rows, digest.hexdigest()[:16]
+
+
+def parity_check(fmt: str) -> dict:
+    """(rows, digest) of each engine's Silver output for the parity_records() blob."""
+    storage = AzureStorageClient(blob_service_client=MemoryBlobServiceClient())
+    blob = bronze_blob(storage, "fingrid", 0, fmt, fingrid_rows=parity_records())
+    transformer = DataTransformer(storage=storage)
+    results = {}
+    for engine in ENGINES:
+        silver_path = transformer.transform_fingrid_data(blob, batch_size=PARITY_BATCH_SIZE, engine=engine)
+        results[engine] = silver_digest(storage, silver_path)
+    return results
+
+
+def peak_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def worker(transform: str, engine: str, records: int, fmt: str, batch_size: int) -> dict:
+    storage = AzureStorageClient(blob_service_client=MemoryBlobServiceClient())
+    blob = bronze_blob(storage, transform, records, fmt)
+    transformer = DataTransformer(storage=storage)
+    method = transformer.transform_fingrid_data if transform == "fingrid" else transformer.transform_prh_companies
+
+    baseline = peak_rss_kb()
+    started = time.perf_counter()
+    silver_path = method(blob, batch_size=batch_size, engine=engine)
+    seconds = time.perf_counter() - started
+    rss_growth = (peak_rss_kb() - baseline) / 1024
+
+    rows, digest = silver_digest(storage, silver_path)
+    return {
+        "transform": transform,
+        "engine": engine,
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds else 0.0,
+        "peak_rss_growth_mb": rss_growth,
+        "digest": digest,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=500_000, help="Fingrid records / PRH companies")
+    parser.add_argument("--transforms", nargs="+", choices=TRANSFORMS, default=list(TRANSFORMS))
+    parser.add_argument("--bronze-format", choices=BRONZE_FORMATS, default="ndjson.gz")
+    parser.add_argument("--batch-size", type=int, default=None, help="Records per batch (default: TRANSFORM_BATCH_SIZE)")
+    parser.add_argument("--worker", nargs=2, metavar=("TRANSFORM", "ENGINE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        transform, engine = args.worker
+        print(json.dumps(worker(transform, engine, args.records, args.bronze_format, args.batch_size)))
+        return
+
+    parity = parity_check(args.bronze_format)
+    identical = len(set(parity.values())) == 1
+    print(f"Parity (mixed dtypes, nulls): output {'identical' if identical else 'DIFFERS'} across engines "
+          f"({', '.join(f'{engine} {rows} rows {digest}' for engine, (rows, digest) in parity.items())})")
+
+    print(f"Records: {args.records:,}  Bronze format: {args.bronze_format}")
+    print(f"{'transform':<10}{'engine':<8}{'rows':>10}{'seconds':>9}{'rows/s':>11}{'peak RSS +MB':>14}  digest")
+    for transform in args.transforms:
+        digests = set()
+        for engine in ENGINES:
+            command = [
+                sys.executable, "-m", "benchmarks.bench_transform_engine", "--worker", transform, engine,
+                "--records", str(args.records), "--bronze-format", args.bronze_format,
+            ]
+            if args.batch_size:
+                command += ["--batch-size", str(args.batch_size)]
+            completed = subprocess.run(command, capture_output=True, text=True)
+            if completed.returncode != 0:
+                print(f"{transform:<10}{engine:<8}failed: {completed.stderr.strip().splitlines()[-1]}")
+                identical = False
+                continue
+            stats = json.loads(completed.stdout.strip().splitlines()[-1])
+            digests.add(stats["digest"])
+            print(f"{transform:<10}{engine:<8}{stats['rows']:>10,}{stats['seconds']:>9.2f}"
+                  f"{stats['rows_per_second']:>11,.0f}{stats['peak_rss_growth_mb']:>14.1f}  {stats['digest']}")
+        print(f"{'':<18}output {'identical' if len(digests) == 1 else 'DIFFERS'} across engines")
+        identical = identical and len(digests) == 1
+
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
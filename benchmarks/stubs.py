@@ -0,0 +1,479 @@
+"""Local stand-ins for the upstream APIs, Blob Storage and Azure SQL used by benchmarks."""
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from src.migrations import MIGRATIONS
+
+
+class MemoryBlobServiceClient:
+    """
+    In-memory stand-in for azure.storage.blob.BlobServiceClient.
+
+    Covers the calls AzureStorageClient makes, so
+    ``AzureStorageClient(blob_service_client=MemoryBlobServiceClient())``
+    runs the real storage code without Azure. With ``discard=True`` blob
+    contents are dropped and only their sizes kept, for memory benchmarks.
+    ``bytes_written`` and ``bytes_read`` count traffic per container.
+    """
+
+    def __init__(self, discard: bool = False):
+        self.discard = discard
+        self.blobs = {}
+        self.sizes = {}
+        self.bytes_written = {}
+        self.bytes_read = {}
+        self._lock = threading.Lock()
+
+    def get_container_client(self, container: str):
+        return _MemoryContainerClient(self, container)
+
+    def get_blob_client(self, container: str, blob: str):
+        return _MemoryBlobClient(self, container, blob)
+
+    def _put(self, key: tuple, data: bytes) -> None:
+        with self._lock:
+            self.sizes[key] = len(data)
+            self.blobs[key] = b"" if self.discard else data
+            self.bytes_written[key[0]] = self.bytes_written.get(key[0], 0) + len(data)
+
+    def _get(self, key: tuple) -> bytes:
+        return self.blobs[key]
+
+    def _exists(self, key: tuple) -> bool:
+        return key in self.blobs
+
+    def _list(self, container: str, prefix: str) -> list:
+        with self._lock:
+            return [(name, self.sizes[(blob_container, name)])
+                    for blob_container, name in sorted(self.blobs)
+                    if blob_container == container and name.startswith(prefix)]
+
+    def _count_read(self, container: str, size: int) -> None:
+        with self._lock:
+            self.bytes_read[container] = self.bytes_read.get(container, 0) + size
+
+
+class LocalBlobServiceClient(MemoryBlobServiceClient):
+    """
+    BlobServiceClient stand-in keeping blobs as files under ``root``.
+
+    Blob ``name`` of ``container`` is stored at ``root/container/name``, so
+    a benchmark's Bronze/Silver output can be inspected after the run and
+    large scales do not have to fit in memory.
+    """
+
+    def __init__(self, root: str):
+        super().__init__()
+        self.root = root
+
+    def _path(self, key: tuple) -> str:
+        return os.path.join(self.root, key[0], *key[1].split("/"))
+
+    def _put(self, key: tuple, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        with self._lock:
+            self.bytes_written[key[0]] = self.bytes_written.get(key[0], 0) + len(data)
+
+    def _get(self, key: tuple) -> bytes:
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    def _exists(self, key: tuple) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def _list(self, container: str, prefix: str) -> list:
+        base = os.path.join(self.root, container)
+        blobs = []
+        for directory, _, files in os.walk(base):
+            for file in files:
+                path = os.path.join(directory, file)
+                name = os.path.relpath(path, base).replace(os.sep, "/")
+                if name.startswith(prefix):
+                    blobs.append((name, os.path.getsize(path)))
+        return sorted(blobs)
+
+
+class _MemoryContainerClient:
+    def __init__(self, service: MemoryBlobServiceClient, container: str):
+        self.service = service
+        self.container = container
+
+    def get_blob_client(self, blob: str):
+        return _MemoryBlobClient(self.service, self.container, blob)
+
+    def list_blobs(self, name_starts_with: str = None):
+        return [_BlobProperties(name, size) for name, size in self.service._list(self.container, name_starts_with or "")]
+
+
+class _BlobProperties:
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+
+
+class _MemoryBlobClient:
+    def __init__(self, service: MemoryBlobServiceClient, container: str, blob: str):
+        self.service = service
+        self.key = (container, blob)
+        self._blocks = {}
+
+    def upload_blob(self, data, overwrite: bool = False, **kwargs):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        elif not isinstance(data, (bytes, bytearray)):
+            data = data.read()
+        self.service._put(self.key, bytes(data))
+
+    def stage_block(self, block_id: str, data: bytes, **kwargs):
+        if self.service.discard:
+            self._blocks[block_id] = len(data)
+        else:
+            self._blocks[block_id] = bytes(data)
+
+    def commit_block_list(self, block_ids: list, **kwargs):
+        if self.service.discard:
+            size = sum(self._blocks[block_id] for block_id in block_ids)
+            with self.service._lock:
+                self.service.sizes[self.key] = size
+                self.service.blobs[self.key] = b""
+                self.service.bytes_written[self.key[0]] = self.service.bytes_written.get(self.key[0], 0) + size
+        else:
+            self.service._put(self.key, b"".join(self._blocks[block_id] for block_id in block_ids))
+        self._blocks.clear()
+
+    def exists(self) -> bool:
+        return self.service._exists(self.key)
+
+    def download_blob(self, **kwargs):
+        container = self.key[0]
+        return _MemoryDownloader(self.service._get(self.key), lambda size: self.service._count_read(container, size))
+
+
+class _MemoryDownloader:
+    def __init__(self, data: bytes, on_read, chunk_size: int = 4 * 1024 * 1024):
+        self.data = data
+        self.on_read = on_read
+        self.chunk_size = chunk_size
+
+    def readall(self) -> bytes:
+        self.on_read(len(self.data))
+        return self.data
+
+    def chunks(self):
+        for offset in range(0, len(self.data), self.chunk_size):
+            chunk = self.data[offset:offset + self.chunk_size]
+            self.on_read(len(chunk))
+            yield chunk
+
+
+class MemoryStorage:
+    """In-memory replacement for AzureStorageClient's Bronze/state methods."""
+
+    def __init__(self):
+        self.blobs = {}
+        self.state = {}
+        self._lock = threading.Lock()
+
+    def upload_to_bronze(self, data: dict, source_name: str, dataset_name: str, blob_stem: str = None, **kwargs) -> str:
+        with self._lock:
+            blob_name = f"{source_name}/{dataset_name}/{blob_stem or len(self.blobs)}.json"
+            self.blobs[blob_name] = json.dumps(data).encode("utf-8")
+        return blob_name
+
+    def read_state(self, name: str) -> dict:
+        return self.state.get(name)
+
+    def write_state(self, name: str, state: dict) -> None:
+        self.state[name] = json.loads(json.dumps(state, default=str))
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops SYNs when many pooled connections open
+    # at once, adding TCP retransmit delays of a second or more
+    request_queue_size = 128
+
+
+class StubAPIServer:
+    """
+    Threaded HTTP/1.1 server imitating StatFi, PRH, Eurostat and Fingrid.
+
+    Every response is delayed by ``latency`` seconds. ``connections`` counts
+    accepted TCP connections, which shows whether clients reuse keep-alive
+    sockets, and ``bytes_sent`` the response bodies served. Responses come
+    from ``payloads`` (e.g. benchmarks.synthetic.SyntheticAPI) when given,
+    otherwise from the small fixed documents of ``respond``.
+
+    Faults can be injected to exercise the request governor: requests
+    beyond ``capacity`` concurrent ones are answered 429, a fraction
+    ``throttle_rate`` of requests gets 429 and ``error_rate`` gets 503 (with
+    a ``Retry-After`` header when ``retry_after`` is set). ``statuses``
+    counts the answers sent and ``peak_in_flight`` the highest concurrency
+    the server saw.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        fingrid_pages: int = 5,
+        records_per_page: int = 100,
+        capacity: int = None,
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        retry_after: float = None,
+        seed: int = 0,
+        payloads=None,
+    ):
+        self.latency = latency
+        self.fingrid_pages = fingrid_pages
+        self.records_per_page = records_per_page
+        self.capacity = capacity
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.payloads = payloads
+        self.connections = 0
+        self.requests = 0
+        self.bytes_sent = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.statuses = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _StubHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def endpoints(self) -> dict:
+        """API_ENDPOINTS-shaped mapping pointing at this server."""
+        return {
+            "stat_finland": f"{self.base_url}/statfin/",
+            "prh_ytj": f"{self.base_url}/prh/companies",
+            "eurostat": f"{self.base_url}/eurostat/",
+            "fingrid": f"{self.base_url}/fingrid/",
+        }
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def respond(self, path: str, query: dict, method: str = "GET", body: bytes = b"") -> tuple:
+        """Return (status, headers, body) for a request."""
+        if self.payloads is not None:
+            return self.payloads.respond(method, path, query, body)
+        if path.startswith("/statfin"):
+            body = [{"id": f"cat{i}", "text": f"Category {i}", "type": "l", "updated": "2024-01-01"}
+                    for i in range(50)]
+        elif path.startswith("/prh"):
+            body = {"totalResults": 3, "results": [
+                {"businessId": f"123456{i}-0", "name": f"Company {i}", "registrationDate": "2020-01-01"}
+                for i in range(3)
+            ]}
+        elif path.startswith("/eurostat"):
+            body = {"label": "GDP and main components", "id": ["geo"], "size": [1], "value": {"0": 1.0}}
+        elif path.startswith("/fingrid"):
+            page = int(query.get("page", ["1"])[0])
+            body = {
+                "data": [
+                    {"datasetId": 192, "startTime": f"2024-01-01T00:00:{n % 60:02d}.000Z",
+                     "endTime": "2024-01-01T00:03:00.000Z", "value": 9000 + n}
+                    for n in range((page - 1) * self.records_per_page, page * self.records_per_page)
+                ],
+                "pagination": {"currentPage": page, "lastPage": self.fingrid_pages},
+            }
+        else:
+            return 404, {}, {"error": "not found"}
+        return 200, {}, body
+
+    def fault(self) -> tuple:
+        """Pick an injected (status, headers, body) for a request, or None to answer normally."""
+        with self._lock:
+            over_capacity = self.capacity is not None and self.in_flight > self.capacity
+            roll = self._random.random()
+        headers = {"Retry-After": f"{self.retry_after:g}"} if self.retry_after is not None else {}
+        if over_capacity or roll < self.throttle_rate:
+            return 429, headers, {"error": "too many requests"}
+        if roll < self.throttle_rate + self.error_rate:
+            return 503, headers, {"error": "service unavailable"}
+        return None
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; with Nagle on, small
+            # responses stall ~40ms on the client's delayed ACK
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                self._serve("GET", b"")
+
+            def do_POST(self):
+                self._serve("POST", self.rfile.read(int(self.headers.get("Content-Length", 0))))
+
+            def _serve(self, method: str, request_body: bytes):
+                with stub._lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+                status = 500
+                try:
+                    time.sleep(stub.latency)
+                    url = urlsplit(self.path)
+                    status, headers, body = stub.fault() or stub.respond(
+                        url.path, parse_qs(url.query), method, request_body
+                    )
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+                        stub.statuses[status] = stub.statuses.get(status, 0) + 1
+                payload = json.dumps(body).encode("utf-8")
+                with stub._lock:
+                    stub.bytes_sent += len(payload)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+class RecordingSQLPool:
+    """
+    Local stand-in for database.ConnectionPool that records instead of executing.
+
+    ``DatabaseManager(pool=RecordingSQLPool())`` runs the real Gold load
+    code (Parquet decoding, parameter conversion, array binding) without
+    Azure SQL. Every ``execute``/``executemany`` is counted as a round trip
+    and the rows bound through ``executemany`` are summed. Result queries
+    are answered as if Gold were empty, i.e. every staged row is new.
+    """
+
+    def __init__(self):
+        self.round_trips = 0
+        self.rows_bound = 0
+        self.statements = {}
+        self._checkouts = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        with self._lock:
+            self._checkouts += 1
+        yield _RecordingConnection(self)
+
+    def stats(self) -> dict:
+        """Same keys as ConnectionPool.stats, plus the recorded traffic."""
+        with self._lock:
+            return {
+                "max_size": 1, "open": 0, "idle": 0, "checked_out": 0,
+                "checkouts": self._checkouts, "waits": 0, "wait_seconds": 0.0,
+                "created": self._checkouts, "recycled": 0, "failed_health_checks": 0,
+                "round_trips": self.round_trips, "rows_bound": self.rows_bound,
+            }
+
+    def _record(self, statement: str, rows: int = 0) -> None:
+        # Statements are grouped by their first line, e.g. "INSERT INTO #stg_companies (...)"
+        head = next((line.strip() for line in statement.splitlines() if line.strip()), "")[:80]
+        with self._lock:
+            self.round_trips += 1
+            self.rows_bound += rows
+            self.statements[head] = self.statements.get(head, 0) + 1
+
+
+class _RecordingConnection:
+    def __init__(self, pool: RecordingSQLPool):
+        self.pool = pool
+        self.staged = 0
+
+    def cursor(self):
+        return _RecordingCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _RecordingCursor:
+    def __init__(self, connection: _RecordingConnection):
+        self.connection = connection
+        self.fast_executemany = False
+        self.description = None
+        self.rowcount = -1
+        self._result = None
+        self._rows = []
+
+    def setinputsizes(self, sizes):
+        pass
+
+    def execute(self, statement: str, params=None):
+        self.connection.pool._record(statement)
+        staged = self.connection.staged
+        self._rows = []
+        if "FROM schema_migrations" in statement:
+            # Gold is taken to be fully migrated
+            self._rows = [(MIGRATIONS[-1][0],)]
+            self._result = self._rows[0]
+        elif "MERGE fact_electricity_production" in statement:
+            # insert_electricity_bulk(merge=True): (inserted, updated)
+            self._result = (staged, 0)
+        elif "COUNT(DISTINCT" in statement:
+            # upsert_companies_bulk: (staged, inserted, updated)
+            self._result = (staged, staged, 0)
+        elif "@@ROWCOUNT" in statement:
+            # load_eurostat: (loaded, staged)
+            self._result = (staged, staged)
+        else:
+            self._result = (0, 0)
+        if self._rows:
+            self.description = [("version",)]
+        else:
+            self.description = [("value",)] if statement.lstrip().upper().startswith("SELECT") else None
+        # Single-row INSERTs insert their row, as Gold is taken to be empty
+        self.rowcount = 1 if params is not None and statement.lstrip().upper().startswith("INSERT") else -1
+        return self
+
+    def executemany(self, statement: str, rows):
+        self.connection.pool._record(statement, len(rows))
+        self.connection.staged += len(rows)
+
+    def fetchone(self):
+        return self._result
+
+    def fetchall(self):
+        return self._rows
@@ -0,0 +1,222 @@
+"""
+Synthetic upstream payloads for offline pipeline benchmarks.
+
+SyntheticAPI answers the requests DataIngester makes to Fingrid, PRH,
+Statistics Finland (PxWeb tables) and Eurostat with deterministic,
+realistically shaped documents. Sizes scale linearly with ``scale``; at
+scale 1 a run is roughly 200k Fingrid records, 20k PRH companies, a 100k
+cell StatFin table and 200k Eurostat observations.
+"""
+import json
+import math
+import threading
+from datetime import date, datetime, timedelta
+
+FINGRID_RECORDS = 200_000
+PRH_COMPANIES = 20_000
+STATFIN_CELLS = 100_000
+EUROSTAT_CELLS = 200_000
+
+# PRH YTJ v3 answers 100 companies per page
+PRH_PAGE_SIZE = 100
+PRH_FIRST_DAY = date(2000, 1, 1)
+PRH_LAST_DAY = date(2023, 12, 31)
+
+STATFIN_TABLE = "bench/statfin_bench_pxt_001.px"
+EUROSTAT_DATASET = "nama_10_gdp"
+
+FORMS = [("OY", "Osakeyhtiö", "Limited company"), ("KY", "Kommandiittiyhtiö", "Limited partnership"),
+         ("OYJ", "Julkinen osakeyhtiö", "Public limited company"), ("AY", "Avoin yhtiö", "General partnership")]
+CITIES = [("HELSINKI", "HELSINGFORS"), ("ESPOO", "ESBO"), ("TAMPERE", "TAMMERFORS"), ("VANTAA", "VANDA"),
+          ("OULU", "ULEÅBORG"), ("TURKU", "ÅBO"), ("JYVÄSKYLÄ", "JYVÄSKYLÄ")]
+
+
+class SyntheticAPI:
+    """
+    Deterministic payload generator behind StubAPIServer(payloads=...).
+
+    ``records`` counts the records (Fingrid rows, companies, table cells,
+    observations) served per source, which the benchmark uses as the
+    ingest stage's row count.
+    """
+
+    def __init__(self, scale: float = 1.0):
+        self.scale = scale
+        self.fingrid_records = max(1, int(FINGRID_RECORDS * scale))
+        self.prh_companies = max(1, int(PRH_COMPANIES * scale))
+        self.statfin_cells = max(1, int(STATFIN_CELLS * scale))
+        self.eurostat_cells = max(1, int(EUROSTAT_CELLS * scale))
+        self.records = {"fingrid": 0, "prh": 0, "stat_finland": 0, "eurostat": 0}
+        self._lock = threading.Lock()
+
+    def respond(self, method: str, path: str, query: dict, body: bytes) -> tuple:
+        """Return (status, headers, body) for a request to the stub server."""
+        if path.startswith("/fingrid/"):
+            return 200, {}, self.fingrid_page(query)
+        if path.startswith("/prh"):
+            return 200, {}, self.prh_page(query)
+        if path.startswith("/statfin/") and path.endswith(".px"):
+            if method == "POST":
+                return 200, {}, self.statfin_query(json.loads(body))
+            return 200, {}, self.statfin_metadata()
+        if path.startswith("/eurostat/"):
+            return 200, {}, self.eurostat_dataset(path.rsplit("/", 1)[-1])
+        return 404, {}, {"error": "not found"}
+
+    def _count(self, source: str, records: int) -> None:
+        with self._lock:
+            self.records[source] += records
+
+    # Fingrid: /datasets/{id}/data, 3-minute values from startTime on
+
+    def fingrid_page(self, query: dict) -> dict:
+        page = int(query.get("page", ["1"])[0])
+        page_size = int(query.get("pageSize", ["20000"])[0])
+        start = datetime.strptime(query.get("startTime", ["2024-01-01T00:00:00Z"])[0], "%Y-%m-%dT%H:%M:%SZ")
+        first, last = (page - 1) * page_size, min(page * page_size, self.fingrid_records)
+        data = []
+        for n in range(first, last):
+            begin = start + timedelta(minutes=3 * n)
+            data.append({
+                "datasetId": 192,
+                "startTime": begin.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                "endTime": (begin + timedelta(minutes=3)).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                "value": round(8000 + (n * 7919) % 3000 + (n % 4) * 0.25, 2),
+            })
+        self._count("fingrid", len(data))
+        return {
+            "data": data,
+            "pagination": {"currentPage": page, "lastPage": max(1, math.ceil(self.fingrid_records / page_size)),
+                           "perPage": page_size, "total": self.fingrid_records},
+        }
+
+    # PRH: YTJ v3 companies, registration dates spread evenly over PRH_FIRST_DAY..PRH_LAST_DAY
+
+    def prh_registration_date(self, n: int) -> date:
+        days = (PRH_LAST_DAY - PRH_FIRST_DAY).days + 1
+        return PRH_FIRST_DAY + timedelta(days=n * days // self.prh_companies)
+
+    def _prh_first_company(self, day: date) -> int:
+        """Index of the first company registered on or after ``day``."""
+        days = (PRH_LAST_DAY - PRH_FIRST_DAY).days + 1
+        offset = min(max((day - PRH_FIRST_DAY).days, 0), days)
+        return math.ceil(offset * self.prh_companies / days)
+
+    def prh_page(self, query: dict) -> dict:
+        page = int(query.get("page", ["1"])[0])
+        first_day = date.fromisoformat(query.get("registrationDateStart", [PRH_FIRST_DAY.isoformat()])[0])
+        last_day = date.fromisoformat(query.get("registrationDateEnd", [PRH_LAST_DAY.isoformat()])[0])
+        first = self._prh_first_company(first_day)
+        end = self._prh_first_company(last_day + timedelta(days=1))
+        total = max(0, end - first)
+        begin = first + (page - 1) * PRH_PAGE_SIZE
+        companies = [self.prh_company(n) for n in range(begin, min(begin + PRH_PAGE_SIZE, end))]
+        self._count("prh", len(companies))
+        return {"totalResults": total, "companies": companies}
+
+    def prh_company(self, n: int) -> dict:
+        registered = self.prh_registration_date(n).isoformat()
+        form = FORMS[n % len(FORMS)]
+        city_fi, city_sv = CITIES[(n * 31) % len(CITIES)]
+        names = [{"name": f"Synthetic Company {n} Oy", "type": "1", "registrationDate": registered,
+                  "endDate": None, "version": 1, "source": "1"}]
+        if n % 4 == 0:
+            names.append({"name": f"Former Name {n} Oy", "type": "1", "registrationDate": registered,
+                          "endDate": "2019-12-31", "version": 2, "source": "1"})
+        return {
+            "businessId": {"value": f"{n % 10_000_000:07d}-{n % 10}", "registrationDate": registered, "source": "3"},
+            "names": names,
+            "companyForms": [{"type": form[0], "registrationDate": registered, "endDate": None, "version": 1,
+                              "descriptions": [{"languageCode": "1", "description": form[1]},
+                                               {"languageCode": "3", "description": form[2]}]}],
+            "addresses": [{"type": 1, "street": f"Katu {n % 200}", "buildingNumber": str(n % 50 + 1),
+                           "postCode": f"{(n * 7907) % 99900 + 100:05d}", "registrationDate": registered,
+                           "postOffices": [{"city": city_fi, "languageCode": "1", "municipalityCode": "091"},
+                                           {"city": city_sv, "languageCode": "2", "municipalityCode": "091"}]}],
+            "registrationDate": registered,
+            "status": "2",
+        }
+
+    # Statistics Finland: PxWeb table metadata and json-stat2 query answers
+
+    def statfin_variables(self) -> list:
+        years = [str(year) for year in range(1990, 2024)]
+        sexes = ["SSS", "1", "2"]
+        measures = ["vaesto", "syntyneet", "kuolleet", "muuttoliike"]
+        regions = max(1, math.ceil(self.statfin_cells / (len(years) * len(sexes) * len(measures))))
+        return [
+            {"code": "Alue", "text": "Area", "values": [f"KU{n:03d}" for n in range(regions)]},
+            {"code": "Vuosi", "text": "Year", "values": years, "time": True},
+            {"code": "Sukupuoli", "text": "Sex", "values": sexes},
+            {"code": "Tiedot", "text": "Information", "values": measures},
+        ]
+
+    def statfin_metadata(self) -> dict:
+        variables = self.statfin_variables()
+        return {
+            "title": "Synthetic population table",
+            "variables": [{**variable, "valueTexts": variable["values"]} for variable in variables],
+        }
+
+    def statfin_query(self, query: dict) -> dict:
+        selection = {item["code"]: item["selection"]["values"] for item in query["query"]}
+        ids = list(selection)
+        sizes = [len(values) for values in selection.values()]
+        cells = math.prod(sizes)
+        self._count("stat_finland", cells)
+        return {
+            "version": "2.0",
+            "class": "dataset",
+            "label": "Synthetic population table",
+            "source": "Statistics Finland",
+            "updated": "2024-01-01T08:00:00Z",
+            "id": ids,
+            "size": sizes,
+            "role": {"time": ["Vuosi"], "geo": ["Alue"], "metric": ["Tiedot"]},
+            "dimension": {
+                code: {"label": code, "category": {
+                    "index": {value: i for i, value in enumerate(values)},
+                    "label": {value: value for value in values},
+                }}
+                for code, values in selection.items()
+            },
+            "value": [float((n * 2654435761) % 100_000) for n in range(cells)],
+        }
+
+    # Eurostat: sparse JSON-stat 2.0 dataset with a few flagged and missing cells
+
+    def eurostat_dataset(self, dataset_code: str) -> dict:
+        dims = {
+            "freq": ["A"],
+            "unit": ["CP_MEUR", "CLV10_MEUR", "PC_GDP"],
+            "na_item": ["B1GQ", "P3", "P31_S14", "P3_S13", "P5G", "P6", "P7", "B11", "D1", "B2A3G"],
+            "geo": ["FI", "SE", "NO", "DK", "IS", "EE", "LV", "LT", "DE", "FR",
+                    "NL", "BE", "AT", "PL", "ES", "IT", "PT", "IE", "CZ", "SK"],
+        }
+        per_period = math.prod(len(values) for values in dims.values())
+        periods = max(1, math.ceil(self.eurostat_cells / per_period))
+        dims["time"] = [f"{1995 + n // 12}-{n % 12 + 1:02d}" for n in range(periods)]
+
+        total = per_period * periods
+        value = {str(n): round((n * 40503) % 1_000_000 / 10, 1) for n in range(total) if n % 17}
+        status = {str(n): "p" for n in range(0, total, 23) if n % 17}
+        self._count("eurostat", len(value))
+        return {
+            "version": "2.0",
+            "class": "dataset",
+            "label": f"Synthetic {dataset_code}",
+            "source": "ESTAT",
+            "updated": "2024-01-01T23:00:00+0100",
+            "id": list(dims),
+            "size": [len(values) for values in dims.values()],
+            "role": {"time": ["time"], "geo": ["geo"]},
+            "dimension": {
+                name: {"label": name, "category": {
+                    "index": {code: i for i, code in enumerate(values)},
+                    "label": {code: code for code in values},
+                }}
+                for name, values in dims.items()
+            },
+            "value": value,
+            "status": status,
+        }
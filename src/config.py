@@ -42,3 +42,101 @@ API_ENDPOINTS = {
     "eurostat": "https://ec.europa.eu/eurostat/api/dissemination/statistics/1.0/data/",
     "fingrid": "https://data.fingrid.fi/api/datasets/",
 }
+
+# Gold load tuning
+GOLD_LOAD_BATCH_SIZE = int(os.getenv("GOLD_LOAD_BATCH_SIZE", "10000"))
+
+# Pipeline state (watermarks, checkpoints) is kept as JSON blobs under this
+# prefix in the Bronze container
+STATE_PREFIX = "_state"
+# Blob manifests (transform and load checkpoints) are saved every
+# MANIFEST_SAVE_EVERY recorded blobs and when the phase ends; a crash
+# redoes at most that many blobs
+MANIFEST_SAVE_EVERY = int(os.getenv("MANIFEST_SAVE_EVERY", "50"))
+
+# Fingrid windowed ingestion
+FINGRID_PAGE_SIZE = int(os.getenv("FINGRID_PAGE_SIZE", "20000"))
+FINGRID_MAX_IN_FLIGHT = int(os.getenv("FINGRID_MAX_IN_FLIGHT", "4"))
+FINGRID_LOOKBACK_HOURS = int(os.getenv("FINGRID_LOOKBACK_HOURS", "24"))
+
+# Statistics Finland PxWeb table extraction. Tables are paths under the
+# StatFin API root, e.g. "vaerak/statfin_vaerak_pxt_11re.px" (comma-separated)
+STAT_FINLAND_TABLES = [table.strip() for table in os.getenv("STAT_FINLAND_TABLES", "").split(",") if table.strip()]
+STAT_FINLAND_CELL_LIMIT = int(os.getenv("STAT_FINLAND_CELL_LIMIT", "100000"))   # cells per PxWeb query
+STAT_FINLAND_RATE_LIMIT = int(os.getenv("STAT_FINLAND_RATE_LIMIT", "30"))       # requests per window
+STAT_FINLAND_RATE_WINDOW = float(os.getenv("STAT_FINLAND_RATE_WINDOW", "10"))  # seconds
+STAT_FINLAND_MAX_IN_FLIGHT = int(os.getenv("STAT_FINLAND_MAX_IN_FLIGHT", "4"))
+
+# PRH registry crawl, partitioned by registration date. Empty PRH_CRAWL_START
+# disables the crawl; after the first full crawl each run continues from the
+# last crawled date.
+PRH_CRAWL_START = os.getenv("PRH_CRAWL_START", "")                        # e.g. "1900-01-01"
+PRH_CRAWL_PARTITION_DAYS = int(os.getenv("PRH_CRAWL_PARTITION_DAYS", "31"))
+PRH_PARTITION_MAX_RESULTS = int(os.getenv("PRH_PARTITION_MAX_RESULTS", "10000"))  # split larger partitions
+PRH_MAX_IN_FLIGHT = int(os.getenv("PRH_MAX_IN_FLIGHT", "4"))                      # pages per partition
+PRH_CRAWL_PARTITIONS_IN_FLIGHT = int(os.getenv("PRH_CRAWL_PARTITIONS_IN_FLIGHT", "2"))
+
+# HTTP ingestion concurrency
+INGEST_MAX_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", "4"))
+INGEST_MAX_PER_HOST = int(os.getenv("INGEST_MAX_PER_HOST", "4"))
+
+# Request governor (one per upstream host): request rate, retries, adaptive
+# concurrency (up to INGEST_MAX_PER_HOST) and circuit breaker
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+GOVERNOR_RATE = float(os.getenv("GOVERNOR_RATE", "10"))                     # requests/s per host
+GOVERNOR_BURST = int(os.getenv("GOVERNOR_BURST", "10"))
+GOVERNOR_MAX_RETRIES = int(os.getenv("GOVERNOR_MAX_RETRIES", "4"))
+GOVERNOR_BACKOFF_BASE = float(os.getenv("GOVERNOR_BACKOFF_BASE", "0.5"))    # seconds
+GOVERNOR_BACKOFF_CAP = float(os.getenv("GOVERNOR_BACKOFF_CAP", "30"))       # seconds
+GOVERNOR_LATENCY_TARGET = float(os.getenv("GOVERNOR_LATENCY_TARGET", "5"))  # slower responses shrink concurrency
+GOVERNOR_BREAKER_FAILURES = int(os.getenv("GOVERNOR_BREAKER_FAILURES", "5"))
+GOVERNOR_BREAKER_RESET = float(os.getenv("GOVERNOR_BREAKER_RESET", "30"))   # seconds before a probe
+GOVERNOR_SLOT_TIMEOUT = float(os.getenv("GOVERNOR_SLOT_TIMEOUT", "300"))     # seconds to wait for a concurrency slot
+
+# Per-API (rate, burst) overriding GOVERNOR_RATE / GOVERNOR_BURST
+API_RATE_LIMITS = {
+    "stat_finland": (STAT_FINLAND_RATE_LIMIT / STAT_FINLAND_RATE_WINDOW, STAT_FINLAND_RATE_LIMIT),
+}
+
+# HTTP validation cache for slowly changing catalogs (StatFi, Eurostat)
+HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "256"))
+HTTP_CACHE_TTL_DAYS = int(os.getenv("HTTP_CACHE_TTL_DAYS", "30"))
+
+# Bronze blob format: "json" (pretty-printed document), "ndjson.gz" or
+# "ndjson.zst" (compressed newline-delimited records, streamed in blocks)
+BRONZE_FORMAT = os.getenv("BRONZE_FORMAT", "json")
+BLOB_BLOCK_SIZE = int(os.getenv("BLOB_BLOCK_SIZE", str(4 * 1024 * 1024)))
+
+# Records per Arrow batch / Parquet row group in streaming transforms
+TRANSFORM_BATCH_SIZE = int(os.getenv("TRANSFORM_BATCH_SIZE", "50000"))
+
+# Transform engine, "pandas" or "arrow"; TRANSFORM_ENGINES overrides it per
+# source, e.g. "fingrid=arrow,prh=pandas"
+TRANSFORM_ENGINE = os.getenv("TRANSFORM_ENGINE", "pandas")
+TRANSFORM_ENGINES = {
+    source.strip(): engine.strip()
+    for source, _, engine in (item.partition("=") for item in os.getenv("TRANSFORM_ENGINES", "").split(","))
+    if engine.strip()
+}
+
+# Pipeline DAG scheduler: tasks run at once across source lanes
+PIPELINE_MAX_WORKERS = int(os.getenv("PIPELINE_MAX_WORKERS", "4"))
+
+# SQL connection pool
+SQL_POOL_SIZE = int(os.getenv("SQL_POOL_SIZE", "5"))
+SQL_POOL_TIMEOUT = float(os.getenv("SQL_POOL_TIMEOUT", "30"))            # max wait for a free connection (s)
+SQL_POOL_IDLE_TIMEOUT = float(os.getenv("SQL_POOL_IDLE_TIMEOUT", "300"))  # close connections idle longer (s)
+SQL_POOL_MAX_LIFETIME = float(os.getenv("SQL_POOL_MAX_LIFETIME", "1800"))  # recycle older connections (s)
+SQL_POOL_PING_AFTER = float(os.getenv("SQL_POOL_PING_AFTER", "30"))      # health-check if idle longer (s)
+
+# Gold snapshots served to the dashboard API
+SNAPSHOT_PREFIX = "snapshots"
+SNAPSHOT_HOURLY_DAYS = int(os.getenv("SNAPSHOT_HOURLY_DAYS", "7"))     # hourly rollup window
+SNAPSHOT_DAILY_DAYS = int(os.getenv("SNAPSHOT_DAILY_DAYS", "365"))     # daily rollup window
+SNAPSHOT_TOP_CITIES = int(os.getenv("SNAPSHOT_TOP_CITIES", "50"))
+
+# Run metrics: OTLP JSON traces are written to the gold container under
+# TRACE_PREFIX; peak RSS of open spans is sampled every METRICS_RSS_INTERVAL s
+TRACE_PREFIX = "traces"
+METRICS_RSS_INTERVAL = float(os.getenv("METRICS_RSS_INTERVAL", "0.05"))
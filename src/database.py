@@ -1,20 +1,327 @@
 """Database operations for Azure SQL (Gold layer)."""
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
 import pyodbc
 import pandas as pd
+import pyarrow.parquet as pq
 from io import BytesIO
-from src.config import SQL_CONNECTION_STRING, SILVER_CONTAINER
-from src.storage import AzureStorageClient
+from src import metrics
+from src.config import (
+    SQL_CONNECTION_STRING,
+    SILVER_CONTAINER,
+    GOLD_LOAD_BATCH_SIZE,
+    SQL_POOL_SIZE,
+    SQL_POOL_TIMEOUT,
+    SQL_POOL_IDLE_TIMEOUT,
+    SQL_POOL_MAX_LIFETIME,
+    SQL_POOL_PING_AFTER,
+)
+from src.manifest import BlobManifest
+from src.migrations import apply_migrations, current_version
+from src.storage import AzureStorageClient, blob_stem
+
+# Columns of dim_companies populated from the Silver companies Parquet
+COMPANY_COLUMNS = [
+    "business_id", "name", "registration_date", "company_form",
+    "status", "city", "post_code",
+]
+
+# Columns of fact_electricity_production populated from the Silver Fingrid Parquet
+ELECTRICITY_COLUMNS = [
+    "start_time", "end_time", "value_mw", "dataset_id",
+    "hour_of_day", "day_of_week", "date_key",
+]
+
+# Columns of fact_eurostat_observations populated from the Silver Eurostat Parquet
+EUROSTAT_COLUMNS = [
+    "dataset_code", "geo", "time_period", "dimension_key", "value", "status",
+]
+
+# Columns of pipeline_stage_metrics, one row per metrics span; the counter
+# columns follow metrics.COUNTERS
+STAGE_METRIC_COLUMNS = [
+    "trace_id", "span_id", "parent_span_id", "name", "stage", "source", "status", "error_message",
+    "started_at", "finished_at", "wall_seconds", "cpu_seconds", "peak_rss_mb",
+    "http_requests", "http_bytes", "blob_bytes_read", "blob_bytes_written",
+    "rows_in", "rows_out", "rows_dropped", "rows_unchanged", "sql_round_trips", "sql_rows_bound",
+    "attributes",
+]
+# Migrations adding the run timing columns / pipeline_stage_metrics and
+# its rows_unchanged column; older databases get the earlier layout
+RUN_METRICS_MIGRATION = 6
+ROWS_UNCHANGED_MIGRATION = 7
+
+# Electricity rollup tables, finest first, with the T-SQL DATEADD unit of
+# their bucket. Each level is refreshed from the one before it.
+ROLLUP_TABLES = [
+    ("agg_electricity_hourly", "HOUR"),
+    ("agg_electricity_daily", "DAY"),
+    ("agg_electricity_monthly", "MONTH"),
+]
+
+
+class ConnectionPool:
+    """
+    Bounded pool of pyodbc connections.
+
+    At most ``max_size`` connections are open. Callers beyond that wait up
+    to ``timeout`` seconds for one to be returned. Idle connections are
+    closed after ``idle_timeout`` seconds, connections older than
+    ``max_lifetime`` are recycled, and a connection idle for more than
+    ``ping_after`` seconds is checked with ``SELECT 1`` before reuse (e.g.
+    after the serverless database auto-paused).
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        max_size: int = None,
+        timeout: float = None,
+        idle_timeout: float = None,
+        max_lifetime: float = None,
+        ping_after: float = None,
+    ):
+        self.connection_string = connection_string
+        self.max_size = SQL_POOL_SIZE if max_size is None else max_size
+        self.timeout = SQL_POOL_TIMEOUT if timeout is None else timeout
+        self.idle_timeout = SQL_POOL_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        self.max_lifetime = SQL_POOL_MAX_LIFETIME if max_lifetime is None else max_lifetime
+        self.ping_after = SQL_POOL_PING_AFTER if ping_after is None else ping_after
+        self._idle = deque()  # (connection, created_at, last_used_at)
+        self._created_at = {}
+        self._size = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            "checkouts": 0, "waits": 0, "wait_seconds": 0.0,
+            "created": 0, "recycled": 0, "failed_health_checks": 0,
+        }
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a connection for the duration of a ``with`` block.
+
+        Like a pyodbc connection used as a context manager, the transaction
+        is committed when the block succeeds and rolled back when it
+        raises. Connections that raised a database error are discarded.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+            conn.commit()
+        except pyodbc.Error:
+            self.release(conn, discard=True)
+            raise
+        except BaseException:
+            try:
+                conn.rollback()
+            except pyodbc.Error:
+                self.release(conn, discard=True)
+                raise
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def acquire(self):
+        """
+        Take a healthy connection from the pool, opening one if allowed.
+
+        Health-check pings, logins and closing expired connections happen
+        outside the pool lock, so a slow server only stalls its caller.
+        """
+        deadline = None
+        while True:
+            conn, ping, expired, timed_out = None, False, [], False
+            with self._cond:
+                while True:
+                    expired += self._take_expired()
+                    conn, ping = self._pop_idle(expired)
+                    if conn is not None:
+                        break
+
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+
+                    if deadline is None:
+                        deadline = time.monotonic() + self.timeout
+                        self._stats["waits"] += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        timed_out = True
+                        break
+                    begin = time.monotonic()
+                    self._cond.wait(remaining)
+                    self._stats["wait_seconds"] += time.monotonic() - begin
+            self._close_all(expired)
+
+            if timed_out:
+                raise TimeoutError(f"No SQL connection available within {self.timeout}s")
+            if conn is None:
+                return self._open()
+            if not ping or self._ping(conn):
+                return conn
+            with self._cond:
+                self._forget(conn)
+                self._stats["checkouts"] -= 1
+                self._stats["failed_health_checks"] += 1
+                self._cond.notify()
+            self._close_all([conn])
+
+    def release(self, conn, discard: bool = False) -> None:
+        """Return a checked-out connection to the pool (or close it)."""
+        with self._cond:
+            if discard:
+                self._forget(conn)
+                expired = [conn]
+            else:
+                self._idle.append((conn, self._created_at[id(conn)], time.monotonic()))
+                expired = self._take_expired()
+            self._cond.notify()
+        self._close_all(expired)
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._cond:
+            idle = [conn for conn, _, _ in self._idle]
+            self._idle.clear()
+            for conn in idle:
+                self._forget(conn)
+            self._cond.notify_all()
+        self._close_all(idle)
+
+    def stats(self) -> dict:
+        """Pool size and usage counters."""
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "open": self._size,
+                "idle": len(self._idle),
+                "checked_out": self._size - len(self._idle),
+                **self._stats,
+                "wait_seconds": round(self._stats["wait_seconds"], 3),
+            }
+
+    def _open(self):
+        """Open a connection for a slot already reserved in ``_size``."""
+        # Outside the lock; logins can take a while
+        try:
+            conn = pyodbc.connect(self.connection_string)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created_at[id(conn)] = time.monotonic()
+            self._stats["created"] += 1
+            self._stats["checkouts"] += 1
+        return conn
+
+    def _pop_idle(self, expired: list) -> tuple:
+        """
+        Pop the most recently used idle connection that has not expired;
+        call with the lock held. Expired ones popped on the way are added
+        to ``expired``.
+
+        Returns:
+            (connection, whether it needs a health check), or (None, False)
+        """
+        while self._idle:
+            conn, created_at, last_used = self._idle.pop()
+            now = time.monotonic()
+            if now - last_used > self.idle_timeout or now - created_at > self.max_lifetime:
+                self._forget(conn)
+                self._stats["recycled"] += 1
+                expired.append(conn)
+                continue
+            self._stats["checkouts"] += 1
+            return conn, now - last_used > self.ping_after
+        return None, False
+
+    def _take_expired(self) -> list:
+        """
+        Remove expired connections from the idle deque, oldest (left) first;
+        call with the lock held and close the returned connections after
+        releasing it.
+        """
+        expired = []
+        now = time.monotonic()
+        while self._idle:
+            conn, created_at, last_used = self._idle[0]
+            if now - last_used <= self.idle_timeout and now - created_at <= self.max_lifetime:
+                break
+            self._idle.popleft()
+            self._forget(conn)
+            self._stats["recycled"] += 1
+            expired.append(conn)
+        if expired:
+            self._cond.notify_all()  # freed slots
+        return expired
+
+    def _forget(self, conn) -> None:
+        """Free the slot of a connection that is being closed; call with the lock held."""
+        self._created_at.pop(id(conn), None)
+        self._size -= 1
+
+    @staticmethod
+    def _close_all(connections: list) -> None:
+        for conn in connections:
+            try:
+                conn.close()
+            except pyodbc.Error:
+                pass
+
+    @staticmethod
+    def _ping(conn) -> bool:
+        try:
+            conn.cursor().execute("SELECT 1").fetchone()
+            return True
+        except pyodbc.Error:
+            return False
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(connection_string: str) -> ConnectionPool:
+    """Process-wide pool for a connection string, shared by all DatabaseManagers."""
+    with _pools_lock:
+        if connection_string not in _pools:
+            _pools[connection_string] = ConnectionPool(connection_string)
+        return _pools[connection_string]
 
 
 class DatabaseManager:
     """Manages connections and operations for Azure SQL Database."""
 
-    def __init__(self):
+    def __init__(self, pool: ConnectionPool = None):
         self.connection_string = SQL_CONNECTION_STRING
+        self.pool = pool or get_pool(self.connection_string)
+        self._schema_version = None
 
+    @contextmanager
     def get_connection(self):
-        """Get a new database connection."""
-        return pyodbc.connect(self.connection_string)
+        """
+        Check out a pooled database connection.
+
+        Use as ``with db.get_connection() as conn:``; the transaction is
+        committed on success and the connection returned to the pool.
+        Statements executed on its cursors are counted as SQL round trips
+        of the current metrics span.
+        """
+        with self.pool.connection() as conn:
+            yield MeteredConnection(conn)
+
+    def pool_stats(self) -> dict:
+        """Connection pool statistics (checked-out, waits, wait time, ...)."""
+        return self.pool.stats()
 
     def execute_query(self, query: str, params: tuple = None) -> None:
         """Execute a query without returning results."""
@@ -103,33 +410,200 @@ class DatabaseManager:
         self.execute_query(create_electricity)
         self.execute_query(create_stat_categories)
         self.execute_query(create_pipeline_log)
-        
+
+        # Electricity rollups (hourly/daily/monthly), one row per dataset and bucket
+        for table, _ in ROLLUP_TABLES:
+            self.execute_query(f"""
+            IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='{table}' AND xtype='U')
+            CREATE TABLE {table} (
+                dataset_id INT NOT NULL,
+                bucket_start DATETIME2 NOT NULL,
+                sample_count INT NOT NULL,
+                min_mw DECIMAL(10,2),
+                max_mw DECIMAL(10,2),
+                avg_mw DECIMAL(12,4),
+                sum_mw DECIMAL(18,2),
+                updated_at DATETIME2 DEFAULT GETUTCDATE(),
+                PRIMARY KEY (dataset_id, bucket_start)
+            );
+            """)
+
+        self.migrate()
+        self.backfill_rollups()
+
         print("✅ Schema created successfully!")
 
-    def log_pipeline_run(self, source: str, records: int, status: str, error: str = None):
-        """Log a pipeline run to the database."""
+    def migrate(self, target: int = None) -> list:
+        """Bring an existing schema up to date with the versioned migrations."""
+        applied = apply_migrations(self, target)
+        self._schema_version = None
+        return applied
+
+    def schema_version(self) -> int:
+        """Applied migration version, read once per manager (``migrate`` refreshes it)."""
+        if self._schema_version is None:
+            self._schema_version = current_version(self)
+        return self._schema_version
+
+    def backfill_rollups(self) -> None:
+        """Build the electricity rollups from the whole fact table if they are empty."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+            SELECT
+                (SELECT COUNT(*) FROM {ROLLUP_TABLES[0][0]}),
+                (SELECT COUNT(*) FROM fact_electricity_production);
+            """)
+            rollup_rows, fact_rows = cursor.fetchone()
+            if rollup_rows or not fact_rows:
+                return
+            print(f"🔄 Backfilling electricity rollups from {fact_rows} fact rows...")
+            refresh_electricity_rollups(cursor, "fact_electricity_production")
+            conn.commit()
+
+    def log_pipeline_run(self, source: str, records: int, status: str, error: str = None, span=None):
+        """
+        Log a pipeline run to the database.
+
+        The row carries the trace id of the current metrics span; pass the
+        finished run ``span`` to also store its timings and peak memory.
+        Databases not yet at RUN_METRICS_MIGRATION get the original columns.
+        """
+        if self.schema_version() < RUN_METRICS_MIGRATION:
+            self.execute_query("""
+            INSERT INTO pipeline_runs (source_name, records_processed, status, error_message)
+            VALUES (?, ?, ?, ?)
+            """, (source, records, status, error))
+            return
+
+        current = span or metrics.current_span()
         query = """
-        INSERT INTO pipeline_runs (source_name, records_processed, status, error_message)
-        VALUES (?, ?, ?, ?)
+        INSERT INTO pipeline_runs
+            (source_name, records_processed, status, error_message,
+             trace_id, started_at, finished_at, wall_seconds, cpu_seconds, peak_rss_mb)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        timings = (None, None, None, None, None)
+        if span is not None:
+            timings = (
+                _span_time(span.start_ns), _span_time(span.end_ns),
+                span.wall_seconds, span.cpu_seconds, span.peak_rss_mb,
+            )
+        self.execute_query(query, (
+            source, records, status, error, current.trace_id if current else None, *timings
+        ))
+
+    def log_stage_metrics(self, root) -> None:
+        """
+        Store a finished run in pipeline_runs and its spans in pipeline_stage_metrics.
+
+        Args:
+            root: Root metrics span of the run
         """
-        self.execute_query(query, (source, records, status, error))
+        spans = [span for span in root.trace.spans if span is not root]
+        loaded = sum(span.counters["rows.out"] for span in spans if span.attributes.get("stage") == "load")
+        self.log_pipeline_run(
+            "pipeline", loaded, "success" if root.status == "ok" else "error", root.error, span=root,
+        )
+        version = self.schema_version()
+        if not spans or version < RUN_METRICS_MIGRATION:
+            return
+
+        columns = STAGE_METRIC_COLUMNS
+        if version < ROWS_UNCHANGED_MIGRATION:
+            columns = [column for column in columns if column != "rows_unchanged"]
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.fast_executemany = True
+            cursor.executemany(
+                f"INSERT INTO pipeline_stage_metrics ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                [_stage_metric_row(span, columns) for span in spans],
+            )
+            conn.commit()
+
+
+class MeteredConnection:
+    """pyodbc connection proxy whose cursors count SQL round trips."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self):
+        return MeteredCursor(self._conn.cursor())
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class MeteredCursor:
+    """
+    pyodbc cursor proxy recording ``sql.round_trips`` (one per execute or
+    executemany call) and ``sql.rows_bound`` in the current metrics span.
+    """
+
+    def __init__(self, cursor):
+        object.__setattr__(self, "_cursor", cursor)
+
+    def execute(self, *args):
+        metrics.add("sql.round_trips")
+        self._cursor.execute(*args)
+        return self
+
+    def executemany(self, query: str, rows):
+        rows = rows if isinstance(rows, (list, tuple)) else list(rows)
+        metrics.add("sql.round_trips")
+        metrics.add("sql.rows_bound", len(rows))
+        return self._cursor.executemany(query, rows)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
 
 
 class GoldLoader:
     """Loads data from Silver to Gold (SQL Database)."""
 
-    def __init__(self):
-        self.storage = AzureStorageClient()
-        self.db = DatabaseManager()
+    def __init__(self, storage=None, db: DatabaseManager = None):
+        self.storage = storage or AzureStorageClient()
+        self.db = db or DatabaseManager()
+
+    def load_companies(self, silver_blob_path: str, bulk: bool = True) -> int:
+        """
+        Load company data from Silver Parquet to Gold SQL table.
+
+        Args:
+            silver_blob_path: Path to the Silver Parquet blob
+            bulk: Use the set-based staging-table upsert (default) instead
+                of one MERGE per row
 
-    def load_companies(self, silver_blob_path: str) -> int:
-        """Load company data from Silver Parquet to Gold SQL table."""
+        Returns:
+            Number of companies processed
+        """
         print(f"📤 Loading companies from: {silver_blob_path}")
         
         # Read Parquet from Silver
         data = self.storage.read_from_container(SILVER_CONTAINER, silver_blob_path)
-        df = pd.read_parquet(BytesIO(data))
-        
+
+        if bulk:
+            counts = self.upsert_companies_bulk(BytesIO(data))
+            loaded = counts["inserted"] + counts["updated"] + counts["unchanged"]
+            print(
+                f"   ✅ Loaded {loaded} companies to Gold "
+                f"({counts['inserted']} inserted, {counts['updated']} updated, "
+                f"{counts['unchanged']} unchanged)"
+            )
+        else:
+            loaded = self.upsert_companies_rowwise(pd.read_parquet(BytesIO(data)))
+            print(f"   ✅ Loaded {loaded} companies to Gold")
+
+        self.db.log_pipeline_run("prh_companies", loaded, "success")
+        return loaded
+
+    def upsert_companies_rowwise(self, df: pd.DataFrame) -> int:
+        """Upsert companies with one MERGE round trip per row."""
         loaded = 0
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
@@ -166,47 +640,640 @@ class GoldLoader:
                 loaded += 1
             
             conn.commit()
-        
-        self.db.log_pipeline_run("prh_companies", loaded, "success")
-        print(f"   ✅ Loaded {loaded} companies to Gold")
+
+        metrics.add("rows.in", len(df))
+        metrics.add("rows.out", loaded)
         return loaded
 
-    def load_electricity(self, silver_blob_path: str) -> int:
-        """Load electricity data from Silver to Gold."""
+    def upsert_companies_bulk(self, parquet_source, batch_size: int = None) -> dict:
+        """
+        Upsert companies through a staging table and a single set-based MERGE.
+
+        The Parquet file is read in record batches and each batch is sent to
+        a session temp table with ``fast_executemany`` array binding, so the
+        number of round trips is proportional to rows / batch_size.
+
+        Args:
+            parquet_source: Path or file-like object of the Silver Parquet
+            batch_size: Rows per executemany batch (default: GOLD_LOAD_BATCH_SIZE)
+
+        Returns:
+            Dict with inserted, updated and unchanged counts
+        """
+        batch_size = batch_size or GOLD_LOAD_BATCH_SIZE
+        parquet_file = pq.ParquetFile(parquet_source)
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            CREATE TABLE #stg_companies (
+                business_id NVARCHAR(50) NOT NULL,
+                name NVARCHAR(255) NOT NULL,
+                registration_date DATE,
+                company_form NVARCHAR(100),
+                status NVARCHAR(50),
+                city NVARCHAR(100),
+                post_code NVARCHAR(20)
+            );
+            """)
+
+            cursor.fast_executemany = True
+            insert_staging = f"""
+            INSERT INTO #stg_companies ({", ".join(COMPANY_COLUMNS)})
+            VALUES ({", ".join("?" for _ in COMPANY_COLUMNS)})
+            """
+            read = 0
+            for batch in parquet_file.iter_batches(batch_size=batch_size):
+                read += batch.num_rows
+                rows = _company_rows(batch.to_pandas())
+                if rows:
+                    cursor.setinputsizes([
+                        (pyodbc.SQL_WVARCHAR, 50, 0),
+                        (pyodbc.SQL_WVARCHAR, 255, 0),
+                        (pyodbc.SQL_TYPE_DATE, 0, 0),
+                        (pyodbc.SQL_WVARCHAR, 100, 0),
+                        (pyodbc.SQL_WVARCHAR, 50, 0),
+                        (pyodbc.SQL_WVARCHAR, 100, 0),
+                        (pyodbc.SQL_WVARCHAR, 20, 0),
+                    ])
+                    cursor.executemany(insert_staging, rows)
+
+            # Only rows whose attributes differ are updated, so repeated loads
+            # of the same extract leave dim_companies untouched.
+            cursor.execute("""
+            SET NOCOUNT ON;
+            DECLARE @changes TABLE (change_action NVARCHAR(10));
+
+            MERGE dim_companies AS target
+            USING (
+                SELECT business_id, name, registration_date, company_form, status, city, post_code
+                FROM (
+                    SELECT *, ROW_NUMBER() OVER (PARTITION BY business_id ORDER BY (SELECT NULL)) AS rn
+                    FROM #stg_companies
+                ) AS deduped
+                WHERE rn = 1
+            ) AS source
+            ON target.business_id = source.business_id
+            WHEN MATCHED AND EXISTS (
+                SELECT source.name, source.registration_date, source.company_form,
+                       source.status, source.city, source.post_code
+                EXCEPT
+                SELECT target.name, target.registration_date, target.company_form,
+                       target.status, target.city, target.post_code
+            ) THEN
+                UPDATE SET
+                    name = source.name,
+                    registration_date = source.registration_date,
+                    company_form = source.company_form,
+                    status = source.status,
+                    city = source.city,
+                    post_code = source.post_code,
+                    loaded_at = GETUTCDATE()
+            WHEN NOT MATCHED BY TARGET THEN
+                INSERT (business_id, name, registration_date, company_form, status, city, post_code)
+                VALUES (source.business_id, source.name, source.registration_date, source.company_form,
+                        source.status, source.city, source.post_code)
+            OUTPUT $action INTO @changes;
+
+            SELECT
+                (SELECT COUNT(DISTINCT business_id) FROM #stg_companies),
+                (SELECT COUNT(*) FROM @changes WHERE change_action = 'INSERT'),
+                (SELECT COUNT(*) FROM @changes WHERE change_action = 'UPDATE');
+            """)
+            staged, inserted, updated = cursor.fetchone()
+            cursor.execute("DROP TABLE #stg_companies")
+            conn.commit()
+
+        metrics.add("rows.in", read)
+        metrics.add("rows.out", inserted + updated)
+        metrics.add("rows.dropped", read - staged)
+        metrics.add("rows.unchanged", staged - inserted - updated)
+
+        return {
+            "inserted": inserted,
+            "updated": updated,
+            "unchanged": staged - inserted - updated,
+        }
+
+    def load_electricity(self, silver_blob_path: str, bulk: bool = True, batch_size: int = None,
+                         repair: bool = False) -> int:
+        """
+        Load electricity data from Silver to Gold.
+
+        Args:
+            silver_blob_path: Path to the Silver Parquet blob
+            bulk: Use the batched staging-table load (default) instead of
+                one INSERT per row; both skip rows already in Gold
+            batch_size: Rows per executemany batch in bulk mode
+            repair: Merge instead of insert (always in bulk): rows already
+                in Gold get the Silver value_mw/end_time where these differ
+
+        Returns:
+            Number of rows inserted (or, with ``repair``, inserted or corrected)
+        """
         print(f"📤 Loading electricity data from: {silver_blob_path}")
         
         data = self.storage.read_from_container(SILVER_CONTAINER, silver_blob_path)
-        df = pd.read_parquet(BytesIO(data))
-        
+
+        if repair:
+            counts = self.insert_electricity_bulk(BytesIO(data), batch_size=batch_size, merge=True)
+            loaded = counts["inserted"] + counts["updated"]
+            print(
+                f"   ✅ Repaired electricity records in Gold: {counts['inserted']} inserted, "
+                f"{counts['updated']} corrected, {counts['duplicates']} unchanged"
+            )
+        elif bulk:
+            counts = self.insert_electricity_bulk(BytesIO(data), batch_size=batch_size)
+            loaded = counts["inserted"]
+            print(
+                f"   ✅ Loaded {loaded} electricity records to Gold "
+                f"({counts['duplicates']} already present)"
+            )
+        else:
+            loaded = self.insert_electricity_rowwise(pd.read_parquet(BytesIO(data)))
+            print(f"   ✅ Loaded {loaded} electricity records to Gold")
+
+        self.db.log_pipeline_run("fingrid_electricity", loaded, "success")
+        return loaded
+
+    def insert_electricity_rowwise(self, df: pd.DataFrame) -> int:
+        """
+        Insert electricity rows with one INSERT round trip per row.
+
+        Rows whose (dataset_id, start_time) key is already in Gold are
+        skipped, as in the bulk load, so reloading a Silver blob does not
+        violate ux_fact_electricity_dataset_start.
+        """
+        rows = _electricity_rows(df)
+        query = f"""
+        INSERT INTO fact_electricity_production ({", ".join(ELECTRICITY_COLUMNS)})
+        OUTPUT inserted.dataset_id, inserted.start_time INTO #new_rows
+        SELECT ?, ?, ?, ?, ?, ?, ?
+        WHERE NOT EXISTS (
+            SELECT 1 FROM fact_electricity_production
+            WHERE dataset_id = ? AND start_time = ?
+        )
+        """
         loaded = 0
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            
-            for _, row in df.iterrows():
-                query = """
-                INSERT INTO fact_electricity_production 
-                (start_time, end_time, value_mw, dataset_id, hour_of_day, day_of_week, date_key)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """
-                
-                cursor.execute(query, (
-                    row.get("startTime"),
-                    row.get("endTime"),
-                    row.get("value"),
-                    row.get("datasetId", 192),
-                    row.get("hour"),
-                    row.get("day_of_week"),
-                    row.get("date")
-                ))
-                loaded += 1
-            
+            cursor.execute("CREATE TABLE #new_rows (dataset_id INT, start_time DATETIME2);")
+
+            for row in rows:
+                start_time, dataset_id = row[0], row[3]
+                cursor.execute(query, (*row, dataset_id, start_time))
+                loaded += max(cursor.rowcount, 0)
+
+            refresh_electricity_rollups(cursor)
+            cursor.execute("DROP TABLE #new_rows")
             conn.commit()
-        
-        self.db.log_pipeline_run("fingrid_electricity", loaded, "success")
-        print(f"   ✅ Loaded {loaded} electricity records to Gold")
+
+        metrics.add("rows.in", len(df))
+        metrics.add("rows.out", loaded)
+        metrics.add("rows.dropped", len(df) - loaded)
+        return loaded
+
+    def insert_electricity_bulk(self, parquet_source, batch_size: int = None, merge: bool = False) -> dict:
+        """
+        Insert electricity rows that are not yet in Gold, in chunks.
+
+        Rows are array-bound into a staging temp table batch by batch, then
+        a single anti-join insert adds only the (dataset_id, start_time) keys
+        missing from fact_electricity_production. Re-running the same load
+        therefore inserts nothing. The keys that were inserted are captured
+        and only the rollup buckets they fall into are recomputed.
+
+        With ``merge`` the staged rows are merged instead, so existing rows
+        whose value_mw or end_time differ are corrected (reload repairs) and
+        their rollup buckets recomputed as well.
+
+        Args:
+            parquet_source: Path or file-like object of the Silver Parquet
+            batch_size: Rows per executemany batch (default: GOLD_LOAD_BATCH_SIZE)
+            merge: Update existing rows that differ instead of skipping them
+
+        Returns:
+            Dict with staged, inserted, updated and duplicates (rows left
+            as they were) counts
+        """
+        batch_size = batch_size or GOLD_LOAD_BATCH_SIZE
+        parquet_file = pq.ParquetFile(parquet_source)
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            CREATE TABLE #stg_electricity (
+                start_time DATETIME2 NOT NULL,
+                end_time DATETIME2,
+                value_mw DECIMAL(10,2) NOT NULL,
+                dataset_id INT NOT NULL,
+                hour_of_day INT,
+                day_of_week INT,
+                date_key DATE
+            );
+            """)
+
+            cursor.fast_executemany = True
+            insert_staging = f"""
+            INSERT INTO #stg_electricity ({", ".join(ELECTRICITY_COLUMNS)})
+            VALUES ({", ".join("?" for _ in ELECTRICITY_COLUMNS)})
+            """
+            staged, read = 0, 0
+            for batch in parquet_file.iter_batches(batch_size=batch_size):
+                read += batch.num_rows
+                rows = _electricity_rows(batch.to_pandas())
+                if rows:
+                    cursor.setinputsizes([
+                        (pyodbc.SQL_TYPE_TIMESTAMP, 27, 7),
+                        (pyodbc.SQL_TYPE_TIMESTAMP, 27, 7),
+                        (pyodbc.SQL_DOUBLE, 0, 0),
+                        (pyodbc.SQL_INTEGER, 0, 0),
+                        (pyodbc.SQL_INTEGER, 0, 0),
+                        (pyodbc.SQL_INTEGER, 0, 0),
+                        (pyodbc.SQL_TYPE_DATE, 0, 0),
+                    ])
+                    cursor.executemany(insert_staging, rows)
+                    staged += len(rows)
+
+            if merge:
+                inserted, updated = _merge_staged_electricity(cursor)
+            else:
+                inserted, updated = _insert_staged_electricity(cursor), 0
+            if inserted or updated:
+                refresh_electricity_rollups(cursor)
+            cursor.execute("DROP TABLE #new_rows")
+            cursor.execute("DROP TABLE #stg_electricity")
+            conn.commit()
+
+        metrics.add("rows.in", read)
+        metrics.add("rows.out", inserted + updated)
+        metrics.add("rows.dropped", read - staged)
+        metrics.add("rows.unchanged", staged - inserted - updated)
+
+        return {"staged": staged, "inserted": inserted, "updated": updated,
+                "duplicates": staged - inserted - updated}
+
+    def load_eurostat(self, silver_blob_path: str, batch_size: int = None) -> int:
+        """
+        Upsert Eurostat observations from Silver into Gold.
+
+        Observations are staged with array binding like the other bulk
+        loads, then merged on (dataset_code, geo, time_period,
+        dimension_key); revised values and status flags overwrite old ones.
+
+        Returns:
+            Number of observations inserted or updated
+        """
+        print(f"📤 Loading Eurostat observations from: {silver_blob_path}")
+        batch_size = batch_size or GOLD_LOAD_BATCH_SIZE
+        data = self.storage.read_from_container(SILVER_CONTAINER, silver_blob_path)
+        parquet_file = pq.ParquetFile(BytesIO(data))
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            CREATE TABLE #stg_eurostat (
+                dataset_code NVARCHAR(50) NOT NULL,
+                geo NVARCHAR(20) NOT NULL,
+                time_period NVARCHAR(20) NOT NULL,
+                dimension_key NVARCHAR(300) NOT NULL,
+                value FLOAT NOT NULL,
+                status NVARCHAR(10)
+            );
+            """)
+
+            cursor.fast_executemany = True
+            insert_staging = f"""
+            INSERT INTO #stg_eurostat ({", ".join(EUROSTAT_COLUMNS)})
+            VALUES ({", ".join("?" for _ in EUROSTAT_COLUMNS)})
+            """
+            read = 0
+            for batch in parquet_file.iter_batches(batch_size=batch_size, columns=EUROSTAT_COLUMNS):
+                read += batch.num_rows
+                rows = _eurostat_rows(batch.to_pandas())
+                if rows:
+                    cursor.setinputsizes([
+                        (pyodbc.SQL_WVARCHAR, 50, 0),
+                        (pyodbc.SQL_WVARCHAR, 20, 0),
+                        (pyodbc.SQL_WVARCHAR, 20, 0),
+                        (pyodbc.SQL_WVARCHAR, 300, 0),
+                        (pyodbc.SQL_DOUBLE, 0, 0),
+                        (pyodbc.SQL_WVARCHAR, 10, 0),
+                    ])
+                    cursor.executemany(insert_staging, rows)
+
+            cursor.execute("""
+            SET NOCOUNT ON;
+
+            MERGE fact_eurostat_observations AS target
+            USING (
+                SELECT dataset_code, geo, time_period, dimension_key, value, status
+                FROM (
+                    SELECT *, ROW_NUMBER() OVER (
+                        PARTITION BY dataset_code, geo, time_period, dimension_key ORDER BY (SELECT NULL)
+                    ) AS rn
+                    FROM #stg_eurostat
+                ) AS deduped
+                WHERE rn = 1
+            ) AS source
+            ON target.dataset_code = source.dataset_code
+               AND target.geo = source.geo
+               AND target.time_period = source.time_period
+               AND target.dimension_key = source.dimension_key
+            WHEN MATCHED AND EXISTS (
+                SELECT source.value, source.status EXCEPT SELECT target.value, target.status
+            ) THEN
+                UPDATE SET value = source.value, status = source.status, loaded_at = GETUTCDATE()
+            WHEN NOT MATCHED BY TARGET THEN
+                INSERT (dataset_code, geo, time_period, dimension_key, value, status)
+                VALUES (source.dataset_code, source.geo, source.time_period, source.dimension_key,
+                        source.value, source.status);
+
+            DECLARE @loaded INT = @@ROWCOUNT;
+            SELECT @loaded, (
+                SELECT COUNT(*) FROM (
+                    SELECT DISTINCT dataset_code, geo, time_period, dimension_key FROM #stg_eurostat
+                ) AS staged_keys
+            );
+            """)
+            loaded, staged = cursor.fetchone()
+            cursor.execute("DROP TABLE #stg_eurostat")
+            conn.commit()
+
+        metrics.add("rows.in", read)
+        metrics.add("rows.out", loaded)
+        metrics.add("rows.dropped", read - staged)
+        metrics.add("rows.unchanged", staged - loaded)
+
+        print(f"   ✅ Loaded {loaded} new or revised Eurostat observations to Gold")
+        self.db.log_pipeline_run("eurostat", loaded, "success")
         return loaded
 
 
+def _insert_staged_electricity(cursor) -> int:
+    """Insert the #stg_electricity keys missing from Gold, recording them in #new_rows; returns the count."""
+    cursor.execute("""
+    SET NOCOUNT ON;
+    CREATE TABLE #new_rows (dataset_id INT, start_time DATETIME2);
+
+    INSERT INTO fact_electricity_production
+        (start_time, end_time, value_mw, dataset_id, hour_of_day, day_of_week, date_key)
+    OUTPUT inserted.dataset_id, inserted.start_time INTO #new_rows
+    SELECT start_time, end_time, value_mw, dataset_id, hour_of_day, day_of_week, date_key
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (PARTITION BY dataset_id, start_time ORDER BY (SELECT NULL)) AS rn
+        FROM #stg_electricity
+    ) AS source
+    WHERE source.rn = 1
+      AND NOT EXISTS (
+          SELECT 1 FROM fact_electricity_production AS target
+          WHERE target.dataset_id = source.dataset_id
+            AND target.start_time = source.start_time
+      );
+
+    SELECT @@ROWCOUNT;
+    """)
+    return cursor.fetchone()[0]
+
+
+def _merge_staged_electricity(cursor) -> tuple:
+    """
+    Merge #stg_electricity into Gold: insert missing keys and correct rows
+    whose value_mw or end_time differ. Inserted and corrected keys are
+    recorded in #new_rows.
+
+    Returns:
+        (inserted, updated)
+    """
+    cursor.execute("""
+    SET NOCOUNT ON;
+    CREATE TABLE #new_rows (change_action NVARCHAR(10), dataset_id INT, start_time DATETIME2);
+
+    MERGE fact_electricity_production AS target
+    USING (
+        SELECT start_time, end_time, value_mw, dataset_id, hour_of_day, day_of_week, date_key
+        FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY dataset_id, start_time ORDER BY (SELECT NULL)) AS rn
+            FROM #stg_electricity
+        ) AS deduped
+        WHERE rn = 1
+    ) AS source
+    ON target.dataset_id = source.dataset_id AND target.start_time = source.start_time
+    WHEN MATCHED AND EXISTS (
+        SELECT source.value_mw, source.end_time EXCEPT SELECT target.value_mw, target.end_time
+    ) THEN
+        UPDATE SET value_mw = source.value_mw, end_time = source.end_time
+    WHEN NOT MATCHED BY TARGET THEN
+        INSERT (start_time, end_time, value_mw, dataset_id, hour_of_day, day_of_week, date_key)
+        VALUES (source.start_time, source.end_time, source.value_mw, source.dataset_id,
+                source.hour_of_day, source.day_of_week, source.date_key)
+    OUTPUT $action, inserted.dataset_id, inserted.start_time INTO #new_rows;
+
+    SELECT
+        (SELECT COUNT(*) FROM #new_rows WHERE change_action = 'INSERT'),
+        (SELECT COUNT(*) FROM #new_rows WHERE change_action = 'UPDATE');
+    """)
+    inserted, updated = cursor.fetchone()
+    return inserted, updated
+
+
+def refresh_electricity_rollups(cursor, changed_rows: str = "#new_rows") -> None:
+    """
+    Recompute the rollup buckets touched by a set of fact rows.
+
+    The hourly level is aggregated from fact_electricity_production for the
+    hours that contain a changed row; each coarser level is then rebuilt
+    from the level below for the buckets that were just refreshed, so a
+    load of a few hours never rescans a whole month of raw data.
+
+    Args:
+        cursor: Cursor on the connection that inserted the rows
+        changed_rows: Table with (dataset_id, start_time) of the changed rows
+    """
+    touched_from = f"SELECT DISTINCT dataset_id, start_time AS ts FROM {changed_rows}"
+    aggregate_from = ("fact_electricity_production", "start_time",
+                      "COUNT(*), MIN(f.value_mw), MAX(f.value_mw), SUM(f.value_mw)")
+
+    for table, unit in ROLLUP_TABLES:
+        touched = f"#touched_{unit.lower()}"
+        source_table, time_column, aggregates = aggregate_from
+        cursor.execute(f"""
+        SET NOCOUNT ON;
+
+        SELECT DISTINCT dataset_id,
+               CAST(DATEADD({unit}, DATEDIFF({unit}, 0, ts), 0) AS DATETIME2) AS bucket_start
+        INTO {touched}
+        FROM ({touched_from}) AS changed
+        WHERE dataset_id IS NOT NULL;
+
+        MERGE {table} AS target
+        USING (
+            SELECT t.dataset_id, t.bucket_start, {aggregates}
+            FROM {touched} AS t
+            JOIN {source_table} AS f
+              ON f.dataset_id = t.dataset_id
+             AND f.{time_column} >= t.bucket_start
+             AND f.{time_column} < DATEADD({unit}, 1, t.bucket_start)
+            GROUP BY t.dataset_id, t.bucket_start
+        ) AS source (dataset_id, bucket_start, sample_count, min_mw, max_mw, sum_mw)
+        ON target.dataset_id = source.dataset_id AND target.bucket_start = source.bucket_start
+        WHEN MATCHED THEN
+            UPDATE SET
+                sample_count = source.sample_count,
+                min_mw = source.min_mw,
+                max_mw = source.max_mw,
+                avg_mw = source.sum_mw / source.sample_count,
+                sum_mw = source.sum_mw,
+                updated_at = GETUTCDATE()
+        WHEN NOT MATCHED BY TARGET THEN
+            INSERT (dataset_id, bucket_start, sample_count, min_mw, max_mw, avg_mw, sum_mw)
+            VALUES (source.dataset_id, source.bucket_start, source.sample_count, source.min_mw,
+                    source.max_mw, source.sum_mw / source.sample_count, source.sum_mw);
+        """)
+
+        touched_from = f"SELECT dataset_id, bucket_start AS ts FROM {touched}"
+        aggregate_from = (table, "bucket_start",
+                          "SUM(f.sample_count), MIN(f.min_mw), MAX(f.max_mw), SUM(f.sum_mw)")
+
+    for _, unit in ROLLUP_TABLES:
+        cursor.execute(f"DROP TABLE #touched_{unit.lower()}")
+
+
+def _company_rows(df: pd.DataFrame) -> list:
+    """Convert a Silver companies frame into parameter tuples for dim_companies."""
+    for column in COMPANY_COLUMNS:
+        if column not in df.columns:
+            df[column] = None
+
+    df = df[COMPANY_COLUMNS].copy()
+    df["registration_date"] = pd.to_datetime(df["registration_date"], errors="coerce").dt.date
+    df = df.astype(object).where(df.notna(), None)
+    return list(df.itertuples(index=False, name=None))
+
+
+def _electricity_rows(df: pd.DataFrame) -> list:
+    """Convert a Silver Fingrid frame into parameter tuples for fact_electricity_production."""
+    out = pd.DataFrame({
+        "start_time": _naive_utc(df["startTime"]),
+        "end_time": _naive_utc(df["endTime"]) if "endTime" in df.columns else None,
+        "value_mw": pd.to_numeric(df["value"], errors="coerce").round(2),
+        "dataset_id": df["datasetId"].fillna(192) if "datasetId" in df.columns else 192,
+        "hour_of_day": df.get("hour"),
+        "day_of_week": df.get("day_of_week"),
+        "date_key": pd.to_datetime(df["date"], errors="coerce").dt.date if "date" in df.columns else None,
+    })
+    out = out.dropna(subset=["start_time", "value_mw", "dataset_id"])
+    out = out.astype(object).where(out.notna(), None)
+    return list(out.itertuples(index=False, name=None))
+
+
+def _eurostat_rows(df: pd.DataFrame) -> list:
+    """Convert a Silver Eurostat frame into parameter tuples for fact_eurostat_observations."""
+    df = df.dropna(subset=["geo", "time_period", "value"])
+    df = df.astype(object).where(df.notna(), None)
+    return list(df[EUROSTAT_COLUMNS].itertuples(index=False, name=None))
+
+
+def _naive_utc(series: pd.Series) -> pd.Series:
+    """Parse timestamps and express them as naive UTC for DATETIME2 columns."""
+    return pd.to_datetime(series, utc=True, errors="coerce").dt.tz_localize(None)
+
+
+# Silver → Gold loads: (result key, Silver prefix, GoldLoader method)
+LOAD_TARGETS = [
+    ("companies", "prh/companies/", "load_companies"),
+    ("electricity", "fingrid/electricity_production/", "load_electricity"),
+    ("eurostat", "eurostat/observations/", "load_eurostat"),
+]
+# Targets whose load only inserts new keys; reloaded blobs are passed
+# repair=True so rows already in Gold are corrected (the others merge anyway)
+REPAIR_TARGETS = {"electricity"}
+
+
+def load_target(loader: GoldLoader, target: str, reload_range: tuple = None) -> dict:
+    """
+    Load the Silver blobs of one target that are not in the Gold load ledger.
+
+    The ledger is the ``load/<target>`` manifest, recording every Silver
+    blob that has been pushed to SQL and how many rows it produced. Loads
+    skip rows already in Gold, so blobs reloaded after a crash (those
+    recorded since the last ledger save) are not duplicated.
+
+    Args:
+        loader: GoldLoader to use
+        target: Key in LOAD_TARGETS
+        reload_range: Optional (start, end) timestamp prefixes, e.g.
+            ("20240101", "20240131"); Silver blobs whose names fall in the
+            range are loaded again even if the ledger has them, correcting
+            rows that differ from Silver
+
+    Returns:
+        Rows loaded per Silver blob in this run
+    """
+    _, prefix, method = next(entry for entry in LOAD_TARGETS if entry[0] == target)
+    with metrics.span(f"load:{target}", stage="load", source=target) as span:
+        with BlobManifest(loader.storage, f"load/{target}") as ledger:
+            blobs = loader.storage.list_blobs(SILVER_CONTAINER, prefix)
+
+            repairs = []
+            if reload_range:
+                start, end = reload_range
+                repairs = [blob for blob in blobs if _stem_in_range(blob_stem(blob), start, end)]
+                print(f"   🔁 {target}: reloading {len(repairs)} Silver blobs in {start} → {end}")
+                ledger.forget(repairs)
+
+            pending = ledger.pending(blobs)
+            if not pending:
+                print(f"   ⏭️ {target}: no new Silver blobs")
+
+            loaded = {}
+            load = getattr(loader, method)
+            for blob in pending:
+                if target in REPAIR_TARGETS and blob in repairs:
+                    loaded[blob] = load(blob, repair=True)
+                else:
+                    loaded[blob] = load(blob)
+                ledger.record(blob, rows=loaded[blob])
+        span.attributes["blobs"] = len(pending)
+    return loaded
+
+
+def run_gold_load(reload_range: tuple = None, loader: GoldLoader = None) -> dict:
+    """Load new Silver blobs of every target in LOAD_TARGETS into Gold."""
+    loader = loader or GoldLoader()
+    results = {target: load_target(loader, target, reload_range) for target, _, _ in LOAD_TARGETS}
+    stats = loader.db.pool_stats()
+    print(f"   🔌 SQL pool: {stats['created']} opened, {stats['checkouts']} checkouts, "
+          f"{stats['waits']} waits ({stats['wait_seconds']}s)")
+    return results
+
+
+def _stage_metric_row(span, columns: list = STAGE_METRIC_COLUMNS) -> tuple:
+    """Parameter tuple of a span for the given pipeline_stage_metrics ``columns``."""
+    counters = span.counters
+    attributes = {key: value for key, value in span.attributes.items() if key not in ("stage", "source")}
+    values = dict(zip(STAGE_METRIC_COLUMNS, (
+        span.trace_id, span.span_id, span.parent.span_id if span.parent else None, span.name,
+        span.attributes.get("stage"), span.attributes.get("source"),
+        "success" if span.status == "ok" else "error", span.error,
+        _span_time(span.start_ns), _span_time(span.end_ns),
+        span.wall_seconds, span.cpu_seconds, span.peak_rss_mb,
+        *(counters[counter] for counter in metrics.COUNTERS),
+        json.dumps(attributes) if attributes else None,
+    )))
+    return tuple(values[column] for column in columns)
+
+
+def _span_time(ns: int) -> datetime:
+    """Span timestamp (ns since the epoch) as naive UTC for DATETIME2."""
+    return datetime.utcfromtimestamp(ns / 1e9) if ns else None
+
+
+def _stem_in_range(stem: str, start: str, end: str) -> bool:
+    """Whether a timestamp blob name falls within [start, end] at their precision."""
+    return (not start or stem[:len(start)] >= start) and (not end or stem[:len(end)] <= end)
+
+
 def initialize_database():
     """Initialize the database schema."""
     db = DatabaseManager()
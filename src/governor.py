@@ -0,0 +1,321 @@
+"""Per-host request governor: rate limiting, adaptive concurrency, retries and circuit breaking."""
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import requests
+from src.config import (
+    GOVERNOR_MAX_RETRIES,
+    GOVERNOR_BACKOFF_BASE,
+    GOVERNOR_BACKOFF_CAP,
+    GOVERNOR_LATENCY_TARGET,
+    GOVERNOR_BREAKER_FAILURES,
+    GOVERNOR_BREAKER_RESET,
+    GOVERNOR_SLOT_TIMEOUT,
+)
+
+# Responses that mean "slow down": they shrink the concurrency limit
+THROTTLE_STATUSES = {429, 503}
+# Responses worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Transport errors worth retrying; they count as failures for the breaker
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while a host's circuit is open."""
+
+
+class TokenBucket:
+    """
+    Token bucket allowing ``rate`` requests per second with bursts of ``burst``.
+
+    ``defer`` empties the bucket until a point in time, which is how a
+    ``Retry-After`` answer pauses every request to the host, not just the
+    one that received it.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def defer(self, seconds: float) -> None:
+        """Hand out no tokens for ``seconds``."""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+            self._updated = max(self._updated, self._paused_until)
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency limit.
+
+    Every fast, successful response raises the limit by ``1 / limit`` (about
+    +1 per round of requests); a throttled response halves it and a response
+    slower than ``latency_target`` shrinks it by 10%. Decreases are spaced by
+    the smoothed latency so one burst of 429s counts once.
+
+    ``acquire`` gives up after ``timeout`` seconds, so a slot that was never
+    released shows up as a TimeoutError rather than a hung pipeline.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, initial: float = None,
+                 latency_target: float = None, timeout: float = None):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = min(min_limit, self.max_limit)
+        self.limit = float(initial or max(self.min_limit, self.max_limit // 2))
+        self.latency_target = latency_target or GOVERNOR_LATENCY_TARGET
+        self.timeout = GOVERNOR_SLOT_TIMEOUT if timeout is None else timeout
+        self.in_flight = 0
+        self._latency = None
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        deadline = time.monotonic() + self.timeout
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"no concurrency slot within {self.timeout}s ({self.in_flight} in flight)"
+                    )
+                self._condition.wait(remaining)
+            self.in_flight += 1
+
+    def release(self, latency: float, throttled: bool = False) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+            now = time.monotonic()
+            if throttled or latency > self.latency_target:
+                if now - self._last_decrease >= self._latency:
+                    factor = 0.5 if throttled else 0.9
+                    self.limit = max(self.min_limit, self.limit * factor)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a host after ``failures`` consecutive failures.
+
+    While open, calls fail immediately with CircuitOpenError. After
+    ``reset_timeout`` seconds one probe call is let through (half-open): a
+    success closes the circuit, a failure opens it again, and a neutral
+    outcome (a 429, or an error that says nothing about the host) lets the
+    next call probe instead.
+    """
+
+    def __init__(self, failures: int = None, reset_timeout: float = None):
+        self.failures = failures or GOVERNOR_BREAKER_FAILURES
+        self.reset_timeout = reset_timeout or GOVERNOR_BREAKER_RESET
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self._opened_at < self.reset_timeout or self._probing:
+                    raise CircuitOpenError(
+                        f"circuit open after {self.consecutive_failures} consecutive failures"
+                    )
+                self.state = "half_open"
+            if self.state == "half_open":
+                if self._probing:
+                    raise CircuitOpenError("circuit half-open, probe in flight")
+                self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self.consecutive_failures >= self.failures:
+                if self.state != "open":
+                    self.opened += 1
+                self.state = "open"
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def record_neutral(self) -> None:
+        with self._lock:
+            self._probing = False
+
+
+class RequestGovernor:
+    """
+    Admission control for all requests to one upstream host.
+
+    A request waits for a rate token and a concurrency slot, is refused
+    outright while the circuit is open, and is retried on connection errors
+    and 429/5xx answers. Retries wait for ``Retry-After`` when the server
+    sends one (pausing the whole host) or for an exponential backoff with
+    full jitter otherwise. The concurrency slot and the circuit breaker are
+    settled after every attempt, including ones that raise.
+    """
+
+    def __init__(self, rate: float, burst: int, max_concurrency: int, max_retries: int = None,
+                 latency_target: float = None, breaker: CircuitBreaker = None):
+        self.bucket = TokenBucket(rate, burst)
+        self.limit = AdaptiveLimit(max_concurrency, latency_target=latency_target)
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = GOVERNOR_MAX_RETRIES if max_retries is None else max_retries
+        self.counters = {"requests": 0, "retries": 0, "throttled": 0, "errors": 0, "rejected": 0}
+        self._counter_lock = threading.Lock()
+
+    def request(self, send) -> requests.Response:
+        """
+        Send a request through the governor.
+
+        Args:
+            send: Callable performing the HTTP request and returning a Response
+
+        Returns:
+            The final response (which may still be an error status once
+            retries are exhausted)
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                self._count("rejected")
+                raise
+            try:
+                self.bucket.acquire()
+                self.limit.acquire()
+            except BaseException:
+                self.breaker.record_neutral()
+                raise
+            self._count("requests")
+            response = self._attempt(send, final=attempt == self.max_retries)
+            if response is None:
+                self._count("retries")
+                time.sleep(backoff_delay(attempt))
+                continue
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+
+            self._count("retries")
+            wait = retry_after_seconds(response)
+            if wait is not None:
+                wait += random.uniform(0, min(1.0, 0.1 * wait + 0.1))
+                self.bucket.defer(wait)
+            else:
+                wait = backoff_delay(attempt)
+            response.close()
+            time.sleep(wait)
+
+    def _attempt(self, send, final: bool):
+        """
+        Make one call holding a concurrency slot, then release the slot and
+        update the breaker whatever the call did.
+
+        Returns the response, or None after a retryable transport error
+        (re-raised instead on the ``final`` attempt). Any other exception
+        is re-raised as a neutral outcome for the breaker.
+        """
+        started = time.monotonic()
+        try:
+            response = send()
+        except RETRY_EXCEPTIONS:
+            self._settle(started, throttled=True, outcome="failure")
+            self._count("errors")
+            if final:
+                raise
+            return None
+        except BaseException:
+            self._settle(started, throttled=False, outcome="neutral")
+            raise
+
+        status = response.status_code
+        throttled = status in THROTTLE_STATUSES
+        if status >= 500:
+            outcome = "failure"
+            self._count("errors")
+        else:
+            outcome = "neutral" if throttled else "success"
+        if throttled:
+            self._count("throttled")
+        self._settle(started, throttled, outcome)
+        return response
+
+    def _settle(self, started: float, throttled: bool, outcome: str) -> None:
+        """Release the concurrency slot and report ``outcome`` to the breaker."""
+        self.limit.release(time.monotonic() - started, throttled=throttled)
+        if outcome == "failure":
+            self.breaker.record_failure()
+        elif outcome == "success":
+            self.breaker.record_success()
+        else:
+            self.breaker.record_neutral()
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            counters = dict(self.counters)
+        return {
+            **counters,
+            "limit": round(self.limit.limit, 2),
+            "circuit": self.breaker.state,
+            "circuit_opened": self.breaker.opened,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._counter_lock:
+            self.counters[name] += 1
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for retry ``attempt`` (0-based)."""
+    return random.uniform(0, min(GOVERNOR_BACKOFF_CAP, GOVERNOR_BACKOFF_BASE * 2 ** attempt))
+
+
+def retry_after_seconds(response: requests.Response) -> float:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date), or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return min(GOVERNOR_BACKOFF_CAP, max(0.0, float(value)))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return min(GOVERNOR_BACKOFF_CAP, max(0.0, (when - datetime.now(timezone.utc)).total_seconds()))
@@ -0,0 +1,100 @@
+"""HTTP validation cache (ETag / Last-Modified) for Bronze ingestion."""
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+from src.config import HTTP_CACHE_MAX_ENTRIES, HTTP_CACHE_TTL_DAYS
+
+
+class HttpValidationCache:
+    """
+    Remembers the validators and Bronze blob of the last response per URL.
+
+    Requests are made conditional with ``If-None-Match`` / ``If-Modified-Since``.
+    A ``304 Not Modified``, or a ``200`` whose body hashes to the stored
+    digest, means the previously landed Bronze blob is still current. The
+    index is persisted as a pipeline state document so it survives between
+    runs; entries unused for ``ttl_days`` are evicted, and the least recently
+    used entries are dropped beyond ``max_entries``.
+    """
+
+    STATE_NAME = "http_cache/index"
+
+    def __init__(self, storage, max_entries: int = None, ttl_days: int = None):
+        self.storage = storage
+        self.max_entries = max_entries or HTTP_CACHE_MAX_ENTRIES
+        self.ttl = timedelta(days=ttl_days or HTTP_CACHE_TTL_DAYS)
+        self._entries = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, params: dict = None) -> str:
+        """Cache key for a URL and its query parameters."""
+        return f"{url}?{urlencode(sorted(params.items()))}" if params else url
+
+    def conditional_headers(self, key: str) -> dict:
+        """Request headers that let the server answer 304 for an unchanged resource."""
+        with self._lock:
+            entry = self._load().get(key)
+            headers = {}
+            if entry and entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry and entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            return headers
+
+    def unchanged(self, key: str, response) -> dict:
+        """
+        Check a response against the cached entry.
+
+        Returns:
+            The cached result if the resource is unchanged, otherwise None
+        """
+        with self._lock:
+            entry = self._load().get(key)
+            if not entry:
+                return None
+            if response.status_code != 304 and _digest(response.content) != entry["sha256"]:
+                return None
+            entry["etag"] = response.headers.get("ETag") or entry.get("etag")
+            entry["last_modified"] = response.headers.get("Last-Modified") or entry.get("last_modified")
+            entry["last_used"] = datetime.utcnow().isoformat()
+            self._save()
+            return entry["result"]
+
+    def store(self, key: str, response, result: dict) -> None:
+        """Record the validators, body digest and ingestion result of a fresh download."""
+        with self._lock:
+            self._load()[key] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "sha256": _digest(response.content),
+                "result": result,
+                "last_used": datetime.utcnow().isoformat(),
+            }
+            self._save()
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            state = self.storage.read_state(self.STATE_NAME) or {}
+            self._entries = state.get("entries", {})
+        return self._entries
+
+    def _save(self) -> None:
+        self._evict()
+        self.storage.write_state(self.STATE_NAME, {
+            "updated_at": datetime.utcnow().isoformat(),
+            "entries": self._entries,
+        })
+
+    def _evict(self) -> None:
+        cutoff = (datetime.utcnow() - self.ttl).isoformat()
+        by_age = sorted(self._entries.items(), key=lambda item: item[1]["last_used"], reverse=True)
+        self._entries = {
+            key: entry for key, entry in by_age[:self.max_entries]
+            if entry["last_used"] >= cutoff
+        }
+
+
+def _digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
@@ -1,20 +1,119 @@
 """Data ingestion from Nordic public APIs to Bronze layer."""
+import itertools
+import math
+import threading
 import requests
-from datetime import datetime
-from src.config import API_ENDPOINTS, FINGRID_API_KEY
-from src.storage import AzureStorageClient
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from src.config import (
+    API_ENDPOINTS,
+    FINGRID_API_KEY,
+    FINGRID_PAGE_SIZE,
+    FINGRID_MAX_IN_FLIGHT,
+    FINGRID_LOOKBACK_HOURS,
+    INGEST_MAX_WORKERS,
+    INGEST_MAX_PER_HOST,
+    STAT_FINLAND_TABLES,
+    STAT_FINLAND_CELL_LIMIT,
+    STAT_FINLAND_MAX_IN_FLIGHT,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    GOVERNOR_RATE,
+    GOVERNOR_BURST,
+    API_RATE_LIMITS,
+    BRONZE_FORMAT,
+    PRH_CRAWL_START,
+    PRH_CRAWL_PARTITION_DAYS,
+    PRH_PARTITION_MAX_RESULTS,
+    PRH_MAX_IN_FLIGHT,
+    PRH_CRAWL_PARTITIONS_IN_FLIGHT,
+)
+from src import metrics
+from src.governor import RequestGovernor
+from src.http_cache import HttpValidationCache
+from src.storage import AzureStorageClient, utc_timestamp, blob_stem
+
+FINGRID_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+# State document checkpointing the PRH registry crawl
+PRH_CRAWL_STATE = "prh/crawl"
 
 
 class DataIngester:
     """Ingests data from various Nordic public APIs."""
 
-    def __init__(self):
-        self.storage = AzureStorageClient()
+    def __init__(self, storage=None, endpoints: dict = None, max_per_host: int = None):
+        """
+        Args:
+            storage: Storage client (default: AzureStorageClient)
+            endpoints: API base URLs (default: API_ENDPOINTS)
+            max_per_host: Concurrent requests allowed per upstream host
+                (default: INGEST_MAX_PER_HOST)
+        """
+        self.storage = storage or AzureStorageClient()
+        self.endpoints = endpoints or API_ENDPOINTS
         self.headers = {"User-Agent": "NordicDataFlow/1.0"}
+        self.max_per_host = max_per_host or INGEST_MAX_PER_HOST
+        self.http_cache = HttpValidationCache(self.storage)
+        self._hosts = {}
+        self._hosts_lock = threading.Lock()
+        # Request rate of each API's host, from API_RATE_LIMITS
+        self._host_rates = {
+            urlsplit(url).netloc: API_RATE_LIMITS[name]
+            for name, url in self.endpoints.items() if name in API_RATE_LIMITS
+        }
+
+    def _host(self, url: str) -> tuple:
+        """Get the keep-alive session and request governor for the URL's host."""
+        host = urlsplit(url).netloc
+        with self._hosts_lock:
+            if host not in self._hosts:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_per_host)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                rate, burst = self._host_rates.get(host, (GOVERNOR_RATE, GOVERNOR_BURST))
+                self._hosts[host] = (session, RequestGovernor(rate, burst, self.max_per_host))
+            return self._hosts[host]
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """GET over the host's pooled session, admitted by the host's governor."""
+        return self._request("GET", url, **kwargs)
+
+    def _post(self, url: str, **kwargs) -> requests.Response:
+        """POST over the host's pooled session, admitted by the host's governor."""
+        return self._request("POST", url, **kwargs)
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        session, governor = self._host(url)
+        kwargs.setdefault("timeout", (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+        response = governor.request(lambda: session.request(method, url, **kwargs))
+        metrics.add("http.requests")
+        metrics.add("http.response_bytes", len(response.content))
+        return response
+
+    def governor_stats(self) -> dict:
+        """Request counters, current concurrency limit and circuit state per host."""
+        with self._hosts_lock:
+            return {host: governor.stats() for host, (_, governor) in self._hosts.items()}
+
+    def close(self) -> None:
+        """Close all pooled HTTP connections."""
+        with self._hosts_lock:
+            for session, _ in self._hosts.values():
+                session.close()
+            self._hosts.clear()
 
     def ingest_stat_finland(self, category: str = None) -> dict:
         """
         Ingest data from Statistics Finland (StatFi).
+
+        The request is conditional on the previous download; if the catalog
+        is unchanged no Bronze blob is written and the result has status
+        ``not_modified`` and the earlier blob path.
         
         Args:
             category: Optional category path to fetch specific data
@@ -22,13 +121,17 @@ class DataIngester:
         Returns:
             Ingestion result with blob path
         """
-        url = API_ENDPOINTS["stat_finland"]
+        url = self.endpoints["stat_finland"]
         if category:
             url += category
 
         print(f"📥 Fetching from Statistics Finland: {url}")
-        response = requests.get(url, headers=self.headers)
+        cache_key = self.http_cache.key(url)
+        response = self._get(url, headers=self.http_cache.conditional_headers(cache_key))
         response.raise_for_status()
+        cached = self.http_cache.unchanged(cache_key, response)
+        if cached:
+            return {**cached, "status": "not_modified"}
         data = response.json()
 
         # Add metadata
@@ -42,10 +145,104 @@ class DataIngester:
         blob_path = self.storage.upload_to_bronze(
             data=payload,
             source_name="stat_finland",
-            dataset_name=category or "catalog"
+            dataset_name=category or "catalog",
+            records_path="data" if isinstance(data, list) else None
         )
 
-        return {"status": "success", "blob_path": blob_path, "records": len(data)}
+        result = {"status": "success", "blob_path": blob_path, "records": len(data)}
+        self.http_cache.store(cache_key, response, result)
+        return result
+
+    def ingest_stat_finland_table(
+        self, table_path: str, selections: dict = None, cell_limit: int = None, max_in_flight: int = None
+    ) -> dict:
+        """
+        Extract a StatFin table through PxWeb queries that fit the cell limit.
+
+        The table metadata is read first; the selection (every value of
+        every variable unless ``selections`` narrows it) is then split into
+        chunks of at most ``cell_limit`` cells, which are queried
+        concurrently; the StatFin host's governor keeps them under the
+        API's rate limit (API_RATE_LIMITS). Each chunk's json-stat2
+        response is written to Bronze as ``{run}_c{chunk}``, and the Silver
+        transform turns the chunks into part files of one Parquet dataset.
+
+        Args:
+            table_path: Table path under the StatFin root (e.g.
+                "vaerak/statfin_vaerak_pxt_11re.px")
+            selections: Optional {variable code: [value codes]} overrides
+            cell_limit: Max cells per query (default: STAT_FINLAND_CELL_LIMIT)
+            max_in_flight: Concurrent queries (default: STAT_FINLAND_MAX_IN_FLIGHT)
+
+        Returns:
+            Ingestion result with the Bronze blob path of every chunk
+        """
+        url = f"{self.endpoints['stat_finland']}{table_path}"
+        table_id = blob_stem(table_path)
+
+        print(f"📥 Reading StatFin table metadata: {table_path}")
+        response = self._get(url)
+        response.raise_for_status()
+        metadata = response.json()
+
+        selection = {
+            variable["code"]: list((selections or {}).get(variable["code"], variable["values"]))
+            for variable in metadata["variables"]
+        }
+        chunks = plan_pxweb_chunks(selection, cell_limit or STAT_FINLAND_CELL_LIMIT)
+        run_stamp = utc_timestamp()
+        print(f"   🧩 {_cell_count(selection)} cells in {len(chunks)} queries")
+
+        def fetch_chunk(index: int, chunk: dict) -> str:
+            query = {
+                "query": [
+                    {"code": code, "selection": {"filter": "item", "values": values}}
+                    for code, values in chunk.items()
+                ],
+                "response": {"format": "json-stat2"},
+            }
+            response = self._post(url, json=query)
+            response.raise_for_status()
+            payload = {
+                "source": "statistics_finland",
+                "ingested_at": datetime.utcnow().isoformat(),
+                "table": table_path,
+                "chunk": index,
+                "chunks": len(chunks),
+                "query": query["query"],
+                "data": response.json(),
+            }
+            return self.storage.upload_to_bronze(
+                data=payload,
+                source_name="stat_finland",
+                dataset_name=f"tables/{table_id}",
+                blob_stem=f"{run_stamp}_c{index:05d}",
+            )
+
+        with ThreadPoolExecutor(max_workers=max_in_flight or STAT_FINLAND_MAX_IN_FLIGHT) as executor:
+            fetch_chunk = metrics.propagate(fetch_chunk)
+            futures = [executor.submit(fetch_chunk, index, chunk) for index, chunk in enumerate(chunks, 1)]
+            blob_paths = sorted(future.result() for future in futures)
+
+        return {
+            "status": "success",
+            "table": table_path,
+            "blob_path": blob_paths[0] if blob_paths else None,
+            "blob_paths": blob_paths,
+            "chunks": len(chunks),
+            "cells": _cell_count(selection),
+        }
+
+    def ingest_stat_finland_tables(self, tables: list = None) -> dict:
+        """Extract every configured StatFin table (default: STAT_FINLAND_TABLES)."""
+        tables = STAT_FINLAND_TABLES if tables is None else tables
+        result = {"status": "success" if tables else "skipped", "tables": {}, "chunks": 0, "cells": 0}
+        for table_path in tables:
+            extracted = self.ingest_stat_finland_table(table_path)
+            result["tables"][table_path] = extracted["blob_paths"]
+            result["chunks"] += extracted["chunks"]
+            result["cells"] += extracted["cells"]
+        return result
 
     def ingest_prh_companies(self, name: str = None, business_id: str = None) -> dict:
         """
@@ -58,7 +255,7 @@ class DataIngester:
         Returns:
             Ingestion result with blob path
         """
-        url = API_ENDPOINTS["prh_ytj"]
+        url = self.endpoints["prh_ytj"]
         params = {}
         if name:
             params["name"] = name
@@ -66,7 +263,7 @@ class DataIngester:
             params["businessId"] = business_id
 
         print(f"📥 Fetching from PRH YTJ: {url}")
-        response = requests.get(url, params=params, headers=self.headers)
+        response = self._get(url, params=params)
         response.raise_for_status()
         data = response.json()
 
@@ -78,19 +275,117 @@ class DataIngester:
             "data": data
         }
 
+        # YTJ v3 returns "companies"; older responses used "results"
+        records_key = "companies" if "companies" in data else "results"
         query_id = name or business_id or "all"
         blob_path = self.storage.upload_to_bronze(
             data=payload,
             source_name="prh",
-            dataset_name=f"companies_{query_id}"
+            dataset_name=f"companies_{query_id}",
+            records_path=f"data.{records_key}"
         )
 
-        results = data.get("results", [])
+        results = data.get(records_key, [])
         return {"status": "success", "blob_path": blob_path, "records": len(results)}
 
+    def crawl_prh_companies(
+        self,
+        start_date=None,
+        end_date=None,
+        partition_days: int = None,
+        max_in_flight: int = None,
+        partitions_in_flight: int = None,
+    ) -> dict:
+        """
+        Crawl the PRH YTJ v3 registry by registration date partitions.
+
+        The date range is cut into ``partition_days`` windows; a window with
+        more than PRH_PARTITION_MAX_RESULTS companies is halved until it is
+        small enough. Each partition's pages are fetched with up to
+        ``max_in_flight`` concurrent requests and streamed, in page order,
+        into one NDJSON Bronze blob, so a partition is never held in memory.
+
+        Finished partitions are checkpointed in the ``prh/crawl`` state
+        document. A crawl that did not complete is resumed on the next call
+        (same crawl id, finished partitions skipped); once complete, the next
+        crawl starts from its last date.
+
+        Args:
+            start_date: First registration date (default: resume, else the
+                previous crawl's end, else PRH_CRAWL_START)
+            end_date: Last registration date (default: today, UTC)
+            partition_days: Initial window length (default: PRH_CRAWL_PARTITION_DAYS;
+                a resumed crawl keeps its original length)
+            max_in_flight: Concurrent page requests per partition (default: PRH_MAX_IN_FLIGHT)
+            partitions_in_flight: Partitions crawled at once
+                (default: PRH_CRAWL_PARTITIONS_IN_FLIGHT)
+
+        Returns:
+            Crawl result with the Bronze blob path of every partition written
+        """
+        previous = self.storage.read_state(PRH_CRAWL_STATE) or {}
+        state, resume = self._prh_crawl_state(previous, start_date, end_date, partition_days)
+        if state is None:
+            return {"status": "skipped", "crawl_id": None, "resumed": False,
+                    "blob_path": None, "blob_paths": [], "records": 0, "partitions": 0}
+
+        crawl = _PrhCrawl(self, state, max_in_flight or PRH_MAX_IN_FLIGHT)
+        start, end = (date.fromisoformat(day) for day in state["range"])
+        if start > end:
+            print(f"📥 PRH crawl is up to date ({previous.get('high_water_mark')})")
+            return crawl.result(resume)
+        self.storage.write_state(PRH_CRAWL_STATE, state)
+
+        windows = _date_windows(start, end, state["partition_days"])
+        print(f"📥 Crawling PRH registry {start} → {end} in {len(windows)} partitions"
+              f"{' (resuming ' + state['crawl_id'] + ')' if resume else ''}")
+        with ThreadPoolExecutor(max_workers=partitions_in_flight or PRH_CRAWL_PARTITIONS_IN_FLIGHT) as executor:
+            crawl_partition = metrics.propagate(crawl.crawl_partition)
+            for future in [executor.submit(crawl_partition, *window) for window in windows]:
+                future.result()
+
+        # The next crawl starts again at this date, catching companies
+        # registered after this run on the same day
+        state["completed_at"] = datetime.utcnow().isoformat()
+        state["high_water_mark"] = end.isoformat()
+        self.storage.write_state(PRH_CRAWL_STATE, state)
+        return crawl.result(resume)
+
+    @staticmethod
+    def _prh_crawl_state(previous: dict, start_date, end_date, partition_days: int) -> tuple:
+        """
+        State document of the crawl to run: the interrupted crawl in
+        ``previous`` when there is one and no ``start_date`` was given,
+        otherwise a new crawl.
+
+        Returns:
+            (state, whether it resumes ``previous``); state is None when
+            there is no date to start from
+        """
+        if previous.get("crawl_id") and not previous.get("completed_at") and start_date is None:
+            # Same range and windows as the interrupted run, so finished partitions match
+            return {**previous, "partitions": previous.get("partitions", {})}, True
+
+        start = _as_date(start_date) or _as_date(previous.get("high_water_mark")) or _as_date(PRH_CRAWL_START)
+        if start is None:
+            return None, False
+        end = _as_date(end_date) or datetime.utcnow().date()
+        return {
+            "crawl_id": utc_timestamp(),
+            "range": [start.isoformat(), end.isoformat()],
+            "partition_days": partition_days or PRH_CRAWL_PARTITION_DAYS,
+            "partitions": {},
+            "high_water_mark": previous.get("high_water_mark"),
+            "started_at": datetime.utcnow().isoformat(),
+            "completed_at": None,
+        }, False
+
     def ingest_eurostat(self, dataset_code: str, params: dict = None) -> dict:
         """
         Ingest data from Eurostat.
+
+        Like ``ingest_stat_finland``, an unchanged dataset is not re-uploaded
+        and is reported with status ``not_modified``.
         
         Args:
             dataset_code: Eurostat dataset code (e.g., 'nama_10_gdp')
@@ -99,14 +394,18 @@ class DataIngester:
         Returns:
             Ingestion result with blob path
         """
-        url = f"{API_ENDPOINTS['eurostat']}{dataset_code}"
+        url = f"{self.endpoints['eurostat']}{dataset_code}"
         query_params = {"format": "JSON", "lang": "EN"}
         if params:
             query_params.update(params)
 
         print(f"📥 Fetching from Eurostat: {dataset_code}")
-        response = requests.get(url, params=query_params, headers=self.headers)
+        cache_key = self.http_cache.key(url, query_params)
+        response = self._get(url, params=query_params, headers=self.http_cache.conditional_headers(cache_key))
         response.raise_for_status()
+        cached = self.http_cache.unchanged(cache_key, response)
+        if cached:
+            return {**cached, "status": "not_modified"}
         data = response.json()
 
         # Add metadata
@@ -123,7 +422,9 @@ class DataIngester:
             dataset_name=dataset_code
         )
 
-        return {"status": "success", "blob_path": blob_path, "label": data.get("label")}
+        result = {"status": "success", "blob_path": blob_path, "label": data.get("label")}
+        self.http_cache.store(cache_key, response, result)
+        return result
 
     def ingest_fingrid(self, dataset_id: int, page_size: int = 100) -> dict:
         """
@@ -139,7 +440,7 @@ class DataIngester:
         if not FINGRID_API_KEY:
             raise ValueError("FINGRID_API_KEY not set in environment")
 
-        url = f"{API_ENDPOINTS['fingrid']}{dataset_id}/data"
+        url = f"{self.endpoints['fingrid']}{dataset_id}/data"
         headers = {
             **self.headers,
             "x-api-key": FINGRID_API_KEY
@@ -147,7 +448,7 @@ class DataIngester:
         params = {"pageSize": page_size}
 
         print(f"📥 Fetching from Fingrid: Dataset {dataset_id}")
-        response = requests.get(url, headers=headers, params=params)
+        response = self._get(url, headers=headers, params=params)
         response.raise_for_status()
         data = response.json()
 
@@ -162,59 +463,442 @@ class DataIngester:
         blob_path = self.storage.upload_to_bronze(
             data=payload,
             source_name="fingrid",
-            dataset_name=f"dataset_{dataset_id}"
+            dataset_name=f"dataset_{dataset_id}",
+            records_path="data.data"
         )
 
         records = data.get("data", [])
         return {"status": "success", "blob_path": blob_path, "records": len(records)}
 
+    def ingest_fingrid_window(
+        self,
+        dataset_id: int,
+        start_time: datetime = None,
+        end_time: datetime = None,
+        page_size: int = None,
+        max_in_flight: int = None,
+        incremental: bool = True,
+    ) -> dict:
+        """
+        Ingest every Fingrid record in a time window, page by page.
 
-def run_full_ingestion():
-    """Run a full ingestion cycle for all data sources."""
-    ingester = DataIngester()
-    results = {}
+        The first page is fetched to learn the page count, the remaining
+        pages are fetched with up to ``max_in_flight`` concurrent requests,
+        and each page is written to Bronze as soon as it arrives. A
+        per-dataset high-water mark (latest ingested ``startTime``) is kept
+        in the pipeline state, so by default each run only asks for
+        intervals newer than the previous one.
 
-    print("\n🚀 Starting Full Data Ingestion\n" + "=" * 50)
+        Args:
+            dataset_id: Fingrid dataset ID (e.g., 192 for production)
+            start_time: Window start in UTC (default: watermark, or
+                FINGRID_LOOKBACK_HOURS ago on the first run)
+            end_time: Window end in UTC (default: now)
+            page_size: Records per page (default: FINGRID_PAGE_SIZE)
+            max_in_flight: Concurrent page requests (default: FINGRID_MAX_IN_FLIGHT)
+            incremental: Start after the stored watermark when it is later
+                than ``start_time``; set False to re-fetch a window
 
-    # 1. Statistics Finland - Categories catalog
-    try:
-        results["stat_finland"] = ingester.ingest_stat_finland()
-        print(f"   ✅ StatFi: {results['stat_finland']['records']} categories")
-    except Exception as e:
-        results["stat_finland"] = {"status": "error", "error": str(e)}
-        print(f"   ❌ StatFi: {e}")
+        Returns:
+            Ingestion result with the Bronze blob path of every page
+        """
+        if not FINGRID_API_KEY:
+            raise ValueError("FINGRID_API_KEY not set in environment")
 
-    # 2. PRH - Sample companies (Tietoevry/Vivicta)
-    try:
-        results["prh_vivicta"] = ingester.ingest_prh_companies(name="Vivicta")
-        print(f"   ✅ PRH (Vivicta): {results['prh_vivicta']['records']} companies")
-    except Exception as e:
-        results["prh_vivicta"] = {"status": "error", "error": str(e)}
-        print(f"   ❌ PRH: {e}")
+        page_size = page_size or FINGRID_PAGE_SIZE
+        max_in_flight = max_in_flight or FINGRID_MAX_IN_FLIGHT
+        state_name = f"fingrid/dataset_{dataset_id}_watermark"
+        watermark = _as_utc((self.storage.read_state(state_name) or {}).get("high_water_mark"))
+
+        end_time = _as_utc(end_time) or datetime.utcnow()
+        start_time = _window_start(_as_utc(start_time), end_time, watermark if incremental else None)
+
+        result = {
+            "status": "success",
+            "blob_path": None,
+            "blob_paths": [],
+            "records": 0,
+            "pages": 0,
+            "window": [start_time.strftime(FINGRID_TIME_FORMAT), end_time.strftime(FINGRID_TIME_FORMAT)],
+        }
+        if start_time >= end_time:
+            print(f"📥 Fingrid dataset {dataset_id} is up to date (watermark {watermark})")
+            return result
 
-    # 3. Eurostat - GDP data
-    try:
-        results["eurostat"] = ingester.ingest_eurostat(
-            "nama_10_gdp", 
-            {"lastTimePeriod": "5"}
+        url = f"{self.endpoints['fingrid']}{dataset_id}/data"
+        headers = {
+            **self.headers,
+            "x-api-key": FINGRID_API_KEY
+        }
+        params = {
+            "startTime": result["window"][0],
+            "endTime": result["window"][1],
+            "pageSize": page_size,
+            "sortBy": "startTime",
+            "sortOrder": "asc",
+        }
+
+        def fetch_page(page: int) -> dict:
+            response = self._get(url, headers=headers, params={**params, "page": page})
+            response.raise_for_status()
+            return response.json()
+
+        run_stamp = utc_timestamp()
+        latest_start = None
+
+        def store_page(page: int, data: dict) -> None:
+            nonlocal latest_start
+            records = data.get("data", [])
+            payload = {
+                "source": "fingrid",
+                "ingested_at": datetime.utcnow().isoformat(),
+                "dataset_id": dataset_id,
+                "window": result["window"],
+                "page": page,
+                "data": data
+            }
+            blob_path = self.storage.upload_to_bronze(
+                data=payload,
+                source_name="fingrid",
+                dataset_name=f"dataset_{dataset_id}",
+                blob_stem=f"{run_stamp}_p{page:05d}",
+                records_path="data.data"
+            )
+            result["blob_paths"].append(blob_path)
+            result["records"] += len(records)
+            result["pages"] += 1
+            starts = [record["startTime"] for record in records if record.get("startTime")]
+            latest_start = max([latest_start or ""] + starts)
+
+        print(f"📥 Fetching from Fingrid: Dataset {dataset_id}, {params['startTime']} → {params['endTime']}")
+        _fetch_pages(fetch_page, store_page, max_in_flight)
+
+        # Only advance the watermark once the whole window is in Bronze
+        if latest_start:
+            self.storage.write_state(state_name, {
+                "dataset_id": dataset_id,
+                "high_water_mark": latest_start,
+                "updated_at": datetime.utcnow().isoformat(),
+            })
+
+        result["blob_paths"].sort()
+        result["blob_path"] = result["blob_paths"][0]
+        return result
+
+
+def _window_start(start_time: datetime, end_time: datetime, watermark: datetime) -> datetime:
+    """
+    Start of an incremental window: just after ``watermark`` when it is at
+    or past ``start_time``, else ``start_time``, else FINGRID_LOOKBACK_HOURS
+    before ``end_time``.
+    """
+    if watermark and (start_time is None or watermark >= start_time):
+        return watermark + timedelta(seconds=1)
+    return start_time or end_time - timedelta(hours=FINGRID_LOOKBACK_HOURS)
+
+
+def _fetch_pages(fetch_page, store_page, max_in_flight: int) -> None:
+    """
+    Fetch every page of a paginated query and hand each to ``store_page(page, data)``.
+
+    Page 1 gives the page count (``pagination.lastPage``); the remaining
+    pages are fetched with up to ``max_in_flight`` concurrent requests and
+    stored as they arrive. A failed page fetch raises, so the caller never
+    mistakes a partial window for a complete one.
+    """
+    first = fetch_page(1)
+    store_page(1, first)
+    last_page = (first.get("pagination") or {}).get("lastPage") or 1
+    if last_page < 2:
+        return
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        fetch_page = metrics.propagate(fetch_page)
+        futures = {executor.submit(fetch_page, page): page for page in range(2, last_page + 1)}
+        for future in as_completed(futures):
+            store_page(futures[future], future.result())
+
+
+def _as_utc(value) -> datetime:
+    """Normalise a datetime or ISO-8601 string to a naive UTC datetime."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = (value - value.utcoffset()).replace(tzinfo=None)
+    return value
+
+
+def _as_date(value) -> date:
+    """Normalise a date, datetime or ISO-8601 string to a date."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value[:10])
+
+
+class _PrhCrawl:
+    """
+    Partitions of one PRH registry crawl.
+
+    ``crawl_partition`` may be called from several threads; each finished
+    partition is checkpointed in the crawl ``state`` document right away.
+    """
+
+    def __init__(self, ingester: "DataIngester", state: dict, max_in_flight: int):
+        self.ingester = ingester
+        self.state = state
+        self.max_in_flight = max_in_flight
+        self.url = ingester.endpoints["prh_ytj"]
+        # JSON Bronze blobs cannot be streamed, so crawls always use NDJSON
+        self.fmt = BRONZE_FORMAT if BRONZE_FORMAT != "json" else "ndjson.gz"
+        self.partitions, self.records, self.blob_paths = 0, 0, []
+        self._lock = threading.Lock()
+
+    def crawl_partition(self, first_day: date, last_day: date) -> None:
+        """Crawl a window, halving it while it holds more than PRH_PARTITION_MAX_RESULTS companies."""
+        key = f"{first_day.isoformat()}_{last_day.isoformat()}"
+        if key in self.state["partitions"]:
+            return
+
+        params = {"registrationDateStart": first_day.isoformat(), "registrationDateEnd": last_day.isoformat()}
+        first = self.fetch_page(params, 1)
+        companies = first.get("companies", [])
+        total = first.get("totalResults", len(companies))
+        if total > PRH_PARTITION_MAX_RESULTS and first_day < last_day:
+            middle = first_day + (last_day - first_day) // 2
+            self.crawl_partition(first_day, middle)
+            self.crawl_partition(middle + timedelta(days=1), last_day)
+            return
+
+        blob_path, records = None, 0
+        if companies:
+            stem = f"{self.state['crawl_id']}_{first_day:%Y%m%d}_{last_day:%Y%m%d}"
+            blob_path, records = self.upload(params, companies, total, stem)
+        self.checkpoint(key, blob_path, records)
+
+    def fetch_page(self, params: dict, page: int) -> dict:
+        response = self.ingester._get(self.url, params={**params, "page": page})
+        response.raise_for_status()
+        return response.json()
+
+    def upload(self, params: dict, companies: list, total: int, stem: str) -> tuple:
+        """
+        Stream a partition's pages, in page order, into one NDJSON Bronze blob.
+
+        Args:
+            params: Query of the partition
+            companies: Companies of its first page
+            total: totalResults of the first page
+            stem: Bronze blob name without extension
+
+        Returns:
+            (Bronze blob path, companies written)
+        """
+        pages = math.ceil(total / len(companies))
+        counted = 0
+
+        def stream():
+            nonlocal counted
+            later_pages = _ordered_results(lambda page: self.fetch_page(params, page), range(2, pages + 1),
+                                           self.max_in_flight)
+            for data in itertools.chain([{"companies": companies}], later_pages):
+                for company in data.get("companies", []):
+                    counted += 1
+                    yield company
+
+        payload = {
+            "source": "prh_ytj",
+            "ingested_at": datetime.utcnow().isoformat(),
+            "crawl_id": self.state["crawl_id"],
+            "query": params,
+            "data": {"totalResults": total, "companies": stream()},
+        }
+        blob_path = self.ingester.storage.upload_to_bronze(
+            data=payload,
+            source_name="prh",
+            dataset_name="companies_crawl",
+            blob_stem=stem,
+            records_path="data.companies",
+            fmt=self.fmt,
         )
-        print(f"   ✅ Eurostat: {results['eurostat']['label']}")
-    except Exception as e:
-        results["eurostat"] = {"status": "error", "error": str(e)}
-        print(f"   ❌ Eurostat: {e}")
+        return blob_path, counted
+
+    def checkpoint(self, key: str, blob_path: str, records: int) -> None:
+        """Record a finished partition in the crawl state and the totals."""
+        with self._lock:
+            self.state["partitions"][key] = {
+                "blob_path": blob_path, "records": records, "crawled_at": datetime.utcnow().isoformat(),
+            }
+            self.ingester.storage.write_state(PRH_CRAWL_STATE, self.state)
+            self.partitions += 1
+            self.records += records
+            if blob_path:
+                self.blob_paths.append(blob_path)
+
+    def result(self, resumed: bool) -> dict:
+        """Crawl result in the shape returned by DataIngester.crawl_prh_companies."""
+        blob_paths = sorted(self.blob_paths)
+        return {
+            "status": "success",
+            "crawl_id": self.state["crawl_id"],
+            "resumed": resumed,
+            "blob_path": blob_paths[0] if blob_paths else None,
+            "blob_paths": blob_paths,
+            "records": self.records,
+            "partitions": self.partitions,
+        }
 
+
+def _date_windows(start: date, end: date, days: int) -> list:
+    """Consecutive (first, last) date windows of ``days`` days covering start..end."""
+    windows = []
+    window_start = start
+    while window_start <= end:
+        window_end = min(window_start + timedelta(days=days - 1), end)
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(days=1)
+    return windows
+
+
+def _ordered_results(fetch, items, max_in_flight: int):
+    """
+    Yield ``fetch(item)`` for each item in order, with up to ``max_in_flight`` running ahead.
+
+    Unlike ``as_completed`` this keeps the input order, and unlike mapping
+    everything up front it holds at most ``max_in_flight`` results at once.
+    """
+    items = iter(items)
+    fetch = metrics.propagate(fetch)
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        window = deque(executor.submit(fetch, item) for item in _take(items, max_in_flight))
+        while window:
+            result = window.popleft().result()
+            for item in _take(items, 1):
+                window.append(executor.submit(fetch, item))
+            yield result
+
+
+def _take(items, count: int) -> list:
+    return [item for _, item in zip(range(count), items)]
+
+
+def plan_pxweb_chunks(selection: dict, cell_limit: int) -> list:
+    """
+    Split a PxWeb selection into selections of at most ``cell_limit`` cells.
+
+    The variable with the most values is sliced into runs as long as the
+    limit allows given the other variables; if even one value of it is too
+    many cells, each slice is split again on the next largest variable.
+    """
+    cells = _cell_count(selection)
+    if cells <= cell_limit:
+        return [selection]
+
+    code = max(selection, key=lambda key: len(selection[key]))
+    values = selection[code]
+    step = max(1, cell_limit // (cells // len(values)))
+    chunks = []
+    for start in range(0, len(values), step):
+        chunks.extend(plan_pxweb_chunks({**selection, code: values[start:start + step]}, cell_limit))
+    return chunks
+
+
+def _cell_count(selection: dict) -> int:
+    cells = 1
+    for values in selection.values():
+        cells *= len(values)
+    return cells
+
+
+# Sources ingested by run_full_ingestion: (result key, label, ingest call, summary)
+INGESTION_TASKS = [
+    # 1. Statistics Finland - Categories catalog
+    ("stat_finland", "StatFi",
+     lambda ingester: ingester.ingest_stat_finland(),
+     lambda result: f"{result['records']} categories"),
+    # 1b. Statistics Finland - StatFin tables (STAT_FINLAND_TABLES)
+    ("stat_finland_tables", "StatFi tables",
+     lambda ingester: ingester.ingest_stat_finland_tables(),
+     lambda result: f"{len(result['tables'])} tables, {result['cells']} cells in {result['chunks']} queries"),
+    # 2. PRH - Sample companies (Tietoevry/Vivicta)
+    ("prh_vivicta", "PRH (Vivicta)",
+     lambda ingester: ingester.ingest_prh_companies(name="Vivicta"),
+     lambda result: f"{result['records']} companies"),
+    # 2b. PRH - Registry crawl by registration date (PRH_CRAWL_START)
+    ("prh_crawl", "PRH crawl",
+     lambda ingester: ingester.crawl_prh_companies(),
+     lambda result: f"{result['records']} companies in {result['partitions']} partitions"),
+    # 3. Eurostat - GDP data
+    ("eurostat", "Eurostat",
+     lambda ingester: ingester.ingest_eurostat("nama_10_gdp", {"lastTimePeriod": "5"}),
+     lambda result: result["label"]),
     # 4. Fingrid - Electricity production
-    try:
-        results["fingrid"] = ingester.ingest_fingrid(192, page_size=10)
-        print(f"   ✅ Fingrid: {results['fingrid']['records']} records")
-    except Exception as e:
-        results["fingrid"] = {"status": "error", "error": str(e)}
-        print(f"   ❌ Fingrid: {e}")
+    ("fingrid", "Fingrid",
+     lambda ingester: ingester.ingest_fingrid_window(192),
+     lambda result: f"{result['records']} records in {result['pages']} pages"),
+]
+
+
+def run_ingestion_task(ingester: DataIngester, key: str) -> dict:
+    """Run one entry of INGESTION_TASKS, capturing errors in the result."""
+    _, label, ingest, summary = next(task for task in INGESTION_TASKS if task[0] == key)
+    with metrics.span(f"ingest:{key}", stage="ingest", source=key) as span:
+        try:
+            result = ingest(ingester)
+            if result.get("status") == "not_modified":
+                print(f"   ⏭️ {label}: not modified since last run")
+            else:
+                print(f"   ✅ {label}: {summary(result)}")
+            span.add("rows.out", result.get("records") or result.get("cells") or 0)
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+            span.status, span.error = "error", str(e)
+            print(f"   ❌ {label}: {e}")
+    return result
+
+
+def run_full_ingestion(concurrent: bool = True, max_workers: int = None, ingester: DataIngester = None):
+    """
+    Run a full ingestion cycle for all data sources.
+
+    Args:
+        concurrent: Ingest the sources in parallel on a thread pool
+        max_workers: Sources in flight at once (default: INGEST_MAX_WORKERS)
+        ingester: DataIngester to use (default: a new one)
+
+    Returns:
+        Result per source, in INGESTION_TASKS order
+    """
+    ingester = ingester or DataIngester()
+    keys = [task[0] for task in INGESTION_TASKS]
+
+    print("\n🚀 Starting Full Data Ingestion\n" + "=" * 50)
+
+    if concurrent:
+        with ThreadPoolExecutor(max_workers=max_workers or INGEST_MAX_WORKERS) as executor:
+            task = metrics.propagate(run_ingestion_task)
+            futures = {key: executor.submit(task, ingester, key) for key in keys}
+            results = {key: futures[key].result() for key in keys}
+    else:
+        results = {key: run_ingestion_task(ingester, key) for key in keys}
 
     print("\n" + "=" * 50)
     print("📊 Ingestion Complete!")
+    print_governor_stats(ingester)
     return results
 
 
+def print_governor_stats(ingester: DataIngester) -> None:
+    """Print each upstream host's request governor counters."""
+    for host, stats in ingester.governor_stats().items():
+        print(f"   🚦 {host}: {stats['requests']} requests, {stats['retries']} retries, "
+              f"{stats['throttled']} throttled, {stats['errors']} errors, "
+              f"limit {stats['limit']}, circuit {stats['circuit']}")
+
+
 if __name__ == "__main__":
     run_full_ingestion()
@@ -0,0 +1,76 @@
+"""Checkpoint manifests recording which blobs a pipeline phase has processed."""
+from datetime import datetime
+from src.config import MANIFEST_SAVE_EVERY
+from src.storage import blob_stem
+
+
+class BlobManifest:
+    """
+    Persistent record of processed blobs and what they produced.
+
+    A manifest is one pipeline state document (see
+    ``AzureStorageClient.read_state``) mapping blob paths to the outcome of
+    processing them. Since every save rewrites the whole document, it is
+    saved every ``save_every`` recorded blobs and on ``flush``, not after
+    each blob; used as a context manager it is flushed when the block
+    exits, failed or not, so an interrupted run resumes with the first
+    unprocessed blob. Entries of blobs that are no longer listed are
+    pruned, keeping the document as large as the container, not its
+    history.
+    """
+
+    def __init__(self, storage, name: str, save_every: int = None):
+        self.storage = storage
+        self.name = name
+        self.save_every = save_every or MANIFEST_SAVE_EVERY
+        state = storage.read_state(name) or {}
+        self.entries = state.get("entries", {})
+        self._unsaved = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    def is_done(self, blob_path: str) -> bool:
+        return blob_path in self.entries
+
+    def pending(self, blob_paths: list) -> list:
+        """
+        Unprocessed blobs, oldest first (by timestamp file name).
+
+        ``blob_paths`` is the full listing of the phase's blobs; entries of
+        blobs missing from it were deleted and are dropped.
+        """
+        listed = set(blob_paths)
+        for blob in [blob for blob in self.entries if blob not in listed]:
+            del self.entries[blob]
+            self._unsaved += 1
+        todo = [blob for blob in listed if blob not in self.entries]
+        return sorted(todo, key=lambda blob: (blob_stem(blob), blob))
+
+    def record(self, blob_path: str, **outcome) -> None:
+        """Mark a blob as processed, saving the manifest every ``save_every`` blobs."""
+        self.entries[blob_path] = {**outcome, "processed_at": datetime.utcnow().isoformat()}
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+
+    def forget(self, blob_paths: list) -> None:
+        """Mark blobs as unprocessed again so the next run redoes them."""
+        for blob_path in blob_paths:
+            self.entries.pop(blob_path, None)
+        self.save()
+
+    def flush(self) -> None:
+        """Save the manifest if it changed since the last save."""
+        if self._unsaved:
+            self.save()
+
+    def save(self) -> None:
+        self.storage.write_state(self.name, {
+            "updated_at": datetime.utcnow().isoformat(),
+            "entries": self.entries,
+        })
+        self._unsaved = 0
@@ -0,0 +1,311 @@
+"""Pipeline tracing: nested spans with per-stage resource counters, exported as OTLP JSON."""
+import contextvars
+import json
+import os
+import resource
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from src.config import METRICS_RSS_INTERVAL, TRACE_PREFIX
+
+SERVICE_NAME = "nordicdataflow"
+
+# Counters every span carries (zero when nothing was recorded), in the
+# order of the pipeline_stage_metrics columns
+COUNTERS = (
+    "http.requests",
+    "http.response_bytes",
+    "blob.bytes_read",
+    "blob.bytes_written",
+    "rows.in",
+    "rows.out",
+    "rows.dropped",
+    "rows.unchanged",
+    "sql.round_trips",
+    "sql.rows_bound",
+)
+
+_current = contextvars.ContextVar("metrics_span", default=None)
+
+
+class Trace:
+    """The spans of one pipeline run, sharing a trace id."""
+
+    def __init__(self):
+        self.trace_id = secrets.token_hex(16)
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def finished(self, span: "Span") -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def to_otlp(self) -> dict:
+        """The trace in the OTLP/JSON export format (ExportTraceServiceRequest)."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start_ns)
+        return {"resourceSpans": [{
+            "resource": {"attributes": _attributes({"service.name": SERVICE_NAME})},
+            "scopeSpans": [{
+                "scope": {"name": f"{SERVICE_NAME}.pipeline"},
+                "spans": [span.to_otlp() for span in spans],
+            }],
+        }]}
+
+
+class Span:
+    """
+    A timed unit of pipeline work (a run, a phase, one source in a phase).
+
+    Counters added while the span is current (see ``add``) are rolled up
+    into the parent span when it ends, so every level reports the totals of
+    the work below it. CPU time is the span's own thread time plus the
+    thread time of pool work submitted through ``propagate``; peak RSS is
+    the process's resident set size sampled while the span was open.
+    """
+
+    def __init__(self, name: str, parent: "Span" = None, attributes: dict = None):
+        self.name = name
+        self.parent = parent
+        self.trace = parent.trace if parent else Trace()
+        self.span_id = secrets.token_hex(8)
+        self.attributes = dict(attributes or {})
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.status = "ok"
+        self.error = None
+        self.cpu_seconds = 0.0
+        self.peak_rss_mb = current_rss_mb()
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self._thread_start = time.thread_time()
+        self._lock = threading.Lock()
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    @property
+    def wall_seconds(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def add(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def charge_cpu(self, seconds: float) -> None:
+        """Charge CPU time spent on another thread to this span and its ancestors."""
+        span = self
+        while span is not None:
+            with span._lock:
+                span.cpu_seconds += seconds
+            span = span.parent
+
+    def end(self) -> None:
+        self.end_ns = time.time_ns()
+        with self._lock:
+            self.cpu_seconds += time.thread_time() - self._thread_start
+        _sampler.close(self)
+        if self.parent is not None:
+            with self.parent._lock:
+                for counter, value in self.counters.items():
+                    self.parent.counters[counter] = self.parent.counters.get(counter, 0) + value
+                self.parent.peak_rss_mb = max(self.parent.peak_rss_mb, self.peak_rss_mb)
+        self.trace.finished(self)
+
+    def summary(self) -> dict:
+        """Flat dict of the span's timings and counters."""
+        return {
+            "name": self.name,
+            **self.attributes,
+            "status": self.status,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+            **self.counters,
+        }
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": _attributes({
+                **self.attributes,
+                **self.counters,
+                "cpu.seconds": round(self.cpu_seconds, 6),
+                "process.memory.peak_rss_mb": round(self.peak_rss_mb, 1),
+            }),
+            # STATUS_CODE_OK / STATUS_CODE_ERROR
+            "status": {"code": 1} if self.status == "ok" else {"code": 2, "message": self.error or ""},
+        }
+        if self.parent is not None:
+            span["parentSpanId"] = self.parent.span_id
+        return span
+
+
+class _RssSampler:
+    """Background thread raising the ``peak_rss_mb`` of every open span."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.spans = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def open(self, span: Span) -> None:
+        with self._lock:
+            self.spans.add(span)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="metrics-rss", daemon=True)
+                self._thread.start()
+
+    def close(self, span: Span) -> None:
+        span.peak_rss_mb = max(span.peak_rss_mb, current_rss_mb())
+        with self._lock:
+            self.spans.discard(span)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                spans = list(self.spans)
+            if spans:
+                rss = current_rss_mb()
+                for span in spans:
+                    span.peak_rss_mb = max(span.peak_rss_mb, rss)
+
+
+_sampler = _RssSampler(METRICS_RSS_INTERVAL)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Open a span as a child of the current one (or as the root of a new trace).
+
+    Use as ``with metrics.span("load:companies", stage="load", source="companies") as s:``.
+    An exception leaving the block marks the span as failed and propagates.
+    """
+    current = Span(name, _current.get(), attributes)
+    _sampler.open(current)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.error = str(e)
+        raise
+    finally:
+        _current.reset(token)
+        current.end()
+
+
+def current_span() -> Span:
+    """The innermost open span of this thread's context, or None."""
+    return _current.get()
+
+
+def add(counter: str, value: int = 1) -> None:
+    """Add to a counter of the current span; a no-op outside any span."""
+    current = _current.get()
+    if current is not None and value:
+        current.add(counter, value)
+
+
+def propagate(fn):
+    """
+    Wrap ``fn`` to run in the caller's metrics context, e.g. on a thread pool.
+
+    Counters recorded by ``fn`` go to the span that was current when it was
+    wrapped, and the CPU time of the worker thread is charged to that span.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(_charged, fn, args, kwargs)
+    return run
+
+
+def _charged(fn, args, kwargs):
+    started = time.thread_time()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        current = _current.get()
+        if current is not None:
+            current.charge_cpu(time.thread_time() - started)
+
+
+def current_rss_mb() -> float:
+    """Resident set size of the process (Linux), or its high-water mark elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def export_trace(root: Span, storage=None, db=None) -> dict:
+    """
+    Persist a finished run's trace; failures are reported, not raised.
+
+    The OTLP JSON goes to the gold container as ``traces/<run>.json``; the
+    run and its stage spans go to pipeline_runs / pipeline_stage_metrics.
+
+    Returns:
+        Dict with the trace id and the blob path written (if any)
+    """
+    result = {"trace_id": root.trace_id, "blob_path": None, "stages": len(root.trace.spans)}
+    if storage is not None:
+        try:
+            stamp = datetime.fromtimestamp(root.start_ns / 1e9, timezone.utc).strftime("%Y%m%d_%H%M%S")
+            result["blob_path"] = storage.upload_to_gold(
+                json.dumps(root.trace.to_otlp(), separators=(",", ":")), TRACE_PREFIX, "json",
+                blob_stem=f"{stamp}_{root.trace_id}",
+            )
+        except Exception as e:
+            print(f"   ❌ Trace upload failed: {e}")
+    if db is not None:
+        try:
+            db.log_stage_metrics(root)
+        except Exception as e:
+            print(f"   ❌ Stage metrics not stored: {e}")
+    return result
+
+
+def print_trace_summary(root: Span) -> None:
+    """Print wall/CPU time, traffic, rows and memory of each stage of a run."""
+    print("\n📈 Stage metrics")
+    print(f"   {'stage':<28}{'wall s':>8}{'cpu s':>8}{'http MB':>9}{'blob MB':>9}"
+          f"{'rows in':>10}{'rows out':>10}{'dropped':>9}{'unchanged':>10}{'sql rt':>8}{'RSS MB':>8}")
+    spans = sorted(root.trace.spans, key=lambda span: span.start_ns)
+    for stage in [span for span in spans if span is not root] + [root]:
+        counters = stage.counters
+        blob_mb = (counters["blob.bytes_read"] + counters["blob.bytes_written"]) / 2**20
+        print(f"   {stage.name:<28}{stage.wall_seconds:>8.2f}{stage.cpu_seconds:>8.2f}"
+              f"{counters['http.response_bytes'] / 2**20:>9.1f}{blob_mb:>9.1f}"
+              f"{counters['rows.in']:>10}{counters['rows.out']:>10}{counters['rows.dropped']:>9}"
+              f"{counters['rows.unchanged']:>10}{counters['sql.round_trips']:>8}{stage.peak_rss_mb:>8.0f}")
+
+
+def _attributes(values: dict) -> list:
+    """OTLP key/value attribute list."""
+    attributes = []
+    for key, value in values.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        attributes.append({"key": key, "value": typed})
+    return attributes
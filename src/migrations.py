@@ -0,0 +1,174 @@
+"""Versioned schema migrations for the Gold layer (Azure SQL)."""
+
+# (version, description, statements). Versions are applied in order, each in
+# its own transaction together with its schema_migrations row, so a failed
+# migration leaves the database at the previous version.
+MIGRATIONS = [
+    (1, "Remove duplicate (dataset_id, start_time) rows from fact_electricity_production", [
+        """
+        WITH ranked AS (
+            SELECT ROW_NUMBER() OVER (PARTITION BY dataset_id, start_time ORDER BY record_id) AS rn
+            FROM fact_electricity_production
+        )
+        DELETE FROM ranked WHERE rn > 1;
+        """,
+    ]),
+    (2, "Store fact_electricity_production as a clustered columnstore", [
+        # The original PRIMARY KEY is clustered and system-named, so look it up
+        """
+        DECLARE @pk SYSNAME = (
+            SELECT name FROM sys.key_constraints
+            WHERE type = 'PK' AND parent_object_id = OBJECT_ID('dbo.fact_electricity_production')
+        );
+        IF @pk IS NOT NULL
+            EXEC('ALTER TABLE dbo.fact_electricity_production DROP CONSTRAINT ' + QUOTENAME(@pk));
+        """,
+        "CREATE CLUSTERED COLUMNSTORE INDEX cci_fact_electricity_production ON dbo.fact_electricity_production;",
+        """
+        ALTER TABLE dbo.fact_electricity_production
+        ADD CONSTRAINT pk_fact_electricity_production PRIMARY KEY NONCLUSTERED (record_id);
+        """,
+    ]),
+    (3, "Unique key and range indexes on fact_electricity_production", [
+        """
+        CREATE UNIQUE NONCLUSTERED INDEX ux_fact_electricity_dataset_start
+        ON dbo.fact_electricity_production (dataset_id, start_time) INCLUDE (value_mw);
+        """,
+        """
+        CREATE NONCLUSTERED INDEX ix_fact_electricity_start_time
+        ON dbo.fact_electricity_production (start_time DESC) INCLUDE (value_mw, dataset_id);
+        """,
+        """
+        CREATE NONCLUSTERED INDEX ix_fact_electricity_date_key
+        ON dbo.fact_electricity_production (date_key, dataset_id);
+        """,
+    ]),
+    (4, "Lookup indexes on dim_companies", [
+        "CREATE NONCLUSTERED INDEX ix_dim_companies_name ON dbo.dim_companies (name);",
+        "CREATE NONCLUSTERED INDEX ix_dim_companies_city ON dbo.dim_companies (city) INCLUDE (name);",
+    ]),
+    (5, "Eurostat observations fact table", [
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='fact_eurostat_observations' AND xtype='U')
+        CREATE TABLE fact_eurostat_observations (
+            dataset_code NVARCHAR(50) NOT NULL,
+            geo NVARCHAR(20) NOT NULL,
+            time_period NVARCHAR(20) NOT NULL,
+            dimension_key NVARCHAR(300) NOT NULL,
+            value FLOAT NOT NULL,
+            status NVARCHAR(10),
+            loaded_at DATETIME2 DEFAULT GETUTCDATE(),
+            CONSTRAINT pk_fact_eurostat_observations
+                PRIMARY KEY (dataset_code, geo, time_period, dimension_key)
+        );
+        """,
+    ]),
+    (6, "Run timings on pipeline_runs and per-stage metrics table", [
+        """
+        ALTER TABLE pipeline_runs ADD
+            trace_id CHAR(32) NULL,
+            started_at DATETIME2 NULL,
+            finished_at DATETIME2 NULL,
+            wall_seconds FLOAT NULL,
+            cpu_seconds FLOAT NULL,
+            peak_rss_mb FLOAT NULL;
+        """,
+        """
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='pipeline_stage_metrics' AND xtype='U')
+        CREATE TABLE pipeline_stage_metrics (
+            metric_id BIGINT IDENTITY(1,1) PRIMARY KEY,
+            trace_id CHAR(32) NOT NULL,
+            span_id CHAR(16) NOT NULL,
+            parent_span_id CHAR(16),
+            name NVARCHAR(100) NOT NULL,
+            stage NVARCHAR(20),
+            source NVARCHAR(50),
+            status NVARCHAR(20),
+            error_message NVARCHAR(MAX),
+            started_at DATETIME2,
+            finished_at DATETIME2,
+            wall_seconds FLOAT,
+            cpu_seconds FLOAT,
+            peak_rss_mb FLOAT,
+            http_requests INT,
+            http_bytes BIGINT,
+            blob_bytes_read BIGINT,
+            blob_bytes_written BIGINT,
+            rows_in BIGINT,
+            rows_out BIGINT,
+            rows_dropped BIGINT,
+            sql_round_trips INT,
+            sql_rows_bound BIGINT,
+            attributes NVARCHAR(MAX),
+            recorded_at DATETIME2 DEFAULT GETUTCDATE()
+        );
+        """,
+        "CREATE NONCLUSTERED INDEX ix_pipeline_stage_metrics_trace ON dbo.pipeline_stage_metrics (trace_id);",
+        """
+        CREATE NONCLUSTERED INDEX ix_pipeline_stage_metrics_stage
+        ON dbo.pipeline_stage_metrics (stage, source, started_at)
+        INCLUDE (wall_seconds, cpu_seconds, rows_out);
+        """,
+    ]),
+    (7, "Unchanged row counts on pipeline_stage_metrics", [
+        "ALTER TABLE pipeline_stage_metrics ADD rows_unchanged BIGINT NULL;",
+    ]),
+]
+
+CREATE_MIGRATIONS_TABLE = """
+IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='schema_migrations' AND xtype='U')
+CREATE TABLE schema_migrations (
+    version INT PRIMARY KEY,
+    description NVARCHAR(255),
+    applied_at DATETIME2 DEFAULT GETUTCDATE()
+);
+"""
+
+
+def current_version(db) -> int:
+    """Return the highest applied migration version (0 for a fresh database)."""
+    rows = db.fetch_all("""
+    IF OBJECT_ID('schema_migrations', 'U') IS NULL
+        SELECT 0 AS version;
+    ELSE
+        SELECT COALESCE(MAX(version), 0) AS version FROM schema_migrations;
+    """)
+    return rows[0]["version"]
+
+
+def apply_migrations(db, target: int = None) -> list:
+    """
+    Apply pending migrations up to ``target`` (default: the latest).
+
+    Args:
+        db: DatabaseManager for the Gold database
+        target: Highest version to apply
+
+    Returns:
+        List of versions that were applied
+    """
+    db.execute_query(CREATE_MIGRATIONS_TABLE)
+    version = current_version(db)
+    applied = []
+
+    for number, description, statements in MIGRATIONS:
+        if number <= version or (target is not None and number > target):
+            continue
+
+        print(f"🔄 Migration {number}: {description}")
+        with db.get_connection() as conn:
+            cursor = conn.cursor()
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (?, ?)",
+                (number, description),
+            )
+            conn.commit()
+        applied.append(number)
+
+    if applied:
+        print(f"✅ Schema at version {applied[-1]}")
+    else:
+        print(f"⏭️ Schema already at version {version}")
+    return applied
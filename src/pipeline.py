@@ -1,13 +1,32 @@
 """Main ETL pipeline orchestrator."""
+import argparse
 from datetime import datetime
-from src.ingest import run_full_ingestion
-from src.transform import run_transformations
-from src.database import initialize_database, GoldLoader, DatabaseManager
+from src import metrics
+from src.ingest import run_full_ingestion, run_ingestion_task, print_governor_stats, DataIngester
+from src.transform import run_transformations, transform_source, DataTransformer
+from src.database import initialize_database, run_gold_load, load_target, DatabaseManager, GoldLoader
+from src.scheduler import DagScheduler
+from src.snapshots import SnapshotPublisher, publish_snapshots
 from src.storage import AzureStorageClient
-from src.config import SILVER_CONTAINER
 
+# Per-source lanes of the DAG: (ingestion task(s), transform source, load target)
+SOURCE_LANES = [
+    ("stat_finland", "stat_finland", None),
+    ("stat_finland_tables", "stat_finland_tables", None),
+    (("prh_vivicta", "prh_crawl"), "prh", "companies"),
+    ("eurostat", "eurostat", "eurostat"),
+    ("fingrid", "fingrid", "electricity"),
+]
 
-def run_pipeline(skip_ingest: bool = False, skip_transform: bool = False, skip_load: bool = False):
+
+def run_pipeline(
+    skip_ingest: bool = False,
+    skip_transform: bool = False,
+    skip_load: bool = False,
+    reload_range: tuple = None,
+    parallel: bool = True,
+    max_workers: int = None,
+):
     """
     Run the complete ETL pipeline.
     
@@ -15,16 +34,45 @@ def run_pipeline(skip_ingest: bool = False, skip_transform: bool = False, skip_l
         skip_ingest: Skip the ingestion phase (use existing Bronze data)
         skip_transform: Skip transformation phase (use existing Silver data)
         skip_load: Skip loading to Gold/SQL
+        reload_range: (start, end) Silver timestamp range to load again
+            even if already loaded, for repairs
+        parallel: Run each source as its own ingest → transform → load
+            lane on the DAG scheduler instead of phase by phase
+        max_workers: Tasks run at once in parallel mode (default: PIPELINE_MAX_WORKERS)
+
+    The run is traced (see src.metrics): per-stage timings, traffic, rows
+    and memory are printed at the end, uploaded as an OTLP JSON trace to
+    the gold container and, unless the load is skipped, stored in
+    pipeline_runs / pipeline_stage_metrics.
     """
     print("\n" + "=" * 60)
     print("🌊 NordicDataFlow Pipeline - Starting")
     print(f"⏰ Run Time: {datetime.utcnow().isoformat()}")
     print("=" * 60)
 
+    with metrics.span("pipeline.run", mode="parallel" if parallel else "sequential") as run_span:
+        if parallel:
+            results = _run_pipeline_dag(skip_ingest, skip_transform, skip_load, reload_range, max_workers)
+        else:
+            results = _run_pipeline_phases(skip_ingest, skip_transform, skip_load, reload_range)
+
+    metrics.print_trace_summary(run_span)
+    try:
+        results["trace"] = metrics.export_trace(
+            run_span, AzureStorageClient(), None if skip_load else DatabaseManager()
+        )
+    except Exception as e:
+        print(f"   ❌ Trace export failed: {e}")
+    return results
+
+
+def _run_pipeline_phases(skip_ingest: bool, skip_transform: bool, skip_load: bool, reload_range: tuple) -> dict:
+    """Run ingest, transform and load one phase after the other."""
     results = {
         "ingest": None,
         "transform": None,
         "load": None,
+        "publish": None,
         "status": "started"
     }
 
@@ -33,7 +81,8 @@ def run_pipeline(skip_ingest: bool = False, skip_transform: bool = False, skip_l
         print("\n📥 PHASE 1: INGESTION (Bronze Layer)")
         print("-" * 40)
         try:
-            results["ingest"] = run_full_ingestion()
+            with metrics.span("phase:ingest"):
+                results["ingest"] = run_full_ingestion()
         except Exception as e:
             print(f"❌ Ingestion failed: {e}")
             results["ingest"] = {"error": str(e)}
@@ -45,7 +94,13 @@ def run_pipeline(skip_ingest: bool = False, skip_transform: bool = False, skip_l
         print("\n🔄 PHASE 2: TRANSFORMATION (Silver Layer)")
         print("-" * 40)
         try:
-            results["transform"] = run_transformations()
+            # Sources answered with 304 / identical body wrote no new Bronze blob
+            unchanged = {
+                source for source, result in (results["ingest"] or {}).items()
+                if isinstance(result, dict) and result.get("status") == "not_modified"
+            }
+            with metrics.span("phase:transform"):
+                results["transform"] = run_transformations(skip_sources=unchanged)
         except Exception as e:
             print(f"❌ Transformation failed: {e}")
             results["transform"] = {"error": str(e)}
@@ -57,23 +112,18 @@ def run_pipeline(skip_ingest: bool = False, skip_transform: bool = False, skip_l
         print("\n📤 PHASE 3: LOADING (Gold Layer)")
         print("-" * 40)
         try:
-            loader = GoldLoader()
-            storage = AzureStorageClient()
-            load_results = {}
-            
-            # Find latest Silver blobs and load
-            silver_blobs = storage.list_blobs(SILVER_CONTAINER)
-            
-            for blob in silver_blobs:
-                if "companies" in blob:
-                    load_results["companies"] = loader.load_companies(blob)
-                elif "electricity" in blob:
-                    load_results["electricity"] = loader.load_electricity(blob)
-            
-            results["load"] = load_results
+            # Only Silver blobs missing from the load ledger (plus any repair range)
+            with metrics.span("phase:load"):
+                results["load"] = run_gold_load(reload_range=reload_range)
         except Exception as e:
             print(f"❌ Loading failed: {e}")
             results["load"] = {"error": str(e)}
+
+        # Dashboard views are served from these snapshots, not from SQL; they
+        # are published even after a failed load, from whatever Gold holds
+        print("\n📸 Publishing Gold snapshots")
+        print("-" * 40)
+        results["publish"] = publish_snapshots()
     else:
         print("\n⏭️ Skipping load phase")
 
@@ -86,6 +136,109 @@ def run_pipeline(skip_ingest: bool = False, skip_transform: bool = False, skip_l
     return results
 
 
+def _run_pipeline_dag(
+    skip_ingest: bool, skip_transform: bool, skip_load: bool, reload_range: tuple, max_workers: int
+) -> dict:
+    """Run SOURCE_LANES as independent chains on the DAG scheduler."""
+    scheduler = DagScheduler(max_workers=max_workers)
+    ingester = None if skip_ingest else DataIngester()
+    transformer = None if skip_transform else DataTransformer()
+    loader = None if skip_load else GoldLoader()
+
+    loads = _add_lanes(scheduler, ingester, transformer, loader, reload_range)
+
+    # Snapshots are published once every lane has finished loading, from
+    # whatever Gold holds then: like the phased run, a failed lane leaves its
+    # views at their previous data instead of blocking the other views
+    if loads:
+        publisher = SnapshotPublisher(storage=loader.storage, db=loader.db)
+        scheduler.add("publish:snapshots", lambda upstream: publish_snapshots(publisher), loads, always=True)
+
+    print(f"\n🧵 Running {len(scheduler.tasks)} tasks in {len(SOURCE_LANES)} lanes "
+          f"({scheduler.max_workers} workers)")
+    run = scheduler.run()
+    if ingester:
+        print_governor_stats(ingester)
+        ingester.close()
+
+    results = {"ingest": {}, "transform": {}, "load": {}, "publish": {}}
+    for name in scheduler.tasks:
+        phase, key = name.split(":", 1)
+        results[phase][key] = run["results"][name]
+    for phase in ("ingest", "transform", "load", "publish"):
+        results[phase] = results[phase] or None
+    results["tasks"] = run["timings"]
+    results["critical_path"] = run["critical_path"]
+    results["status"] = "completed"
+
+    _print_task_timings(run)
+    print("\n" + "=" * 60)
+    print("🏁 Pipeline Complete!")
+    print("=" * 60)
+
+    return results
+
+
+def _add_lanes(scheduler: DagScheduler, ingester, transformer, loader, reload_range: tuple) -> list:
+    """
+    Register the ingest → transform → load chain of every SOURCE_LANES entry.
+
+    A phase whose worker is None (skipped) is left out of the chain.
+
+    Returns:
+        Names of the load tasks
+    """
+    loads = []
+    for ingest_keys, transform_key, load_key in SOURCE_LANES:
+        if isinstance(ingest_keys, str):
+            ingest_keys = (ingest_keys,)
+        previous = []
+        if ingester:
+            previous = [scheduler.add(f"ingest:{key}", _ingest_task(ingester, key)) for key in ingest_keys]
+        if transform_key and transformer:
+            previous = [scheduler.add(
+                f"transform:{transform_key}", _transform_task(transformer, transform_key, previous), previous
+            )]
+        if load_key and loader:
+            loads.append(scheduler.add(f"load:{load_key}", _load_task(loader, load_key, reload_range), previous))
+    return loads
+
+
+def _ingest_task(ingester: DataIngester, key: str):
+    return lambda upstream: run_ingestion_task(ingester, key)
+
+
+def _transform_task(transformer: DataTransformer, source: str, ingest_names: list):
+    """
+    Transform task of a lane. It is skipped when every upstream ingest
+    answered "not_modified"; a failure is re-raised so the scheduler marks
+    the task failed and skips the lane's load.
+    """
+    def run(upstream):
+        statuses = {(upstream.get(name) or {}).get("status") for name in ingest_names}
+        if ingest_names and statuses == {"not_modified"}:
+            print(f"   ⏭️ {source}: unchanged since last run, skipping transform")
+            return []
+        try:
+            return transform_source(transformer, source)
+        except Exception as e:
+            print(f"   ❌ {source} transform failed: {e}")
+            raise
+    return run
+
+
+def _load_task(loader: GoldLoader, target: str, reload_range: tuple):
+    return lambda upstream: load_target(loader, target, reload_range)
+
+
+def _print_task_timings(run: dict) -> None:
+    print("\n⏱️ Task timings")
+    for name, timing in sorted(run["timings"].items(), key=lambda item: item[1]["start"] or 0):
+        print(f"   {name:<24} {timing['status']:<8} {timing['seconds']:>8.2f}s")
+    print(f"   Critical path: {' → '.join(run['critical_path'])} ({run['critical_path_seconds']:.2f}s "
+          f"of {run['wall_seconds']:.2f}s wall)")
+
+
 def setup():
     """Initialize the database schema."""
     print("🔧 Initializing NordicDataFlow...")
@@ -94,10 +247,27 @@ def setup():
 
 
 if __name__ == "__main__":
-    import sys
-    
-    if len(sys.argv) > 1 and sys.argv[1] == "setup":
+    parser = argparse.ArgumentParser(description="NordicDataFlow ETL pipeline")
+    parser.add_argument("command", nargs="?", choices=["run", "setup"], default="run")
+    parser.add_argument("--skip-ingest", action="store_true")
+    parser.add_argument("--skip-transform", action="store_true")
+    parser.add_argument("--skip-load", action="store_true")
+    parser.add_argument("--reload", nargs=2, metavar=("START", "END"),
+                        help="Reload Silver blobs with timestamps in [START, END] (e.g. 20240101 20240131)")
+    parser.add_argument("--sequential", action="store_true",
+                        help="Run phase by phase instead of per-source parallel lanes")
+    parser.add_argument("--workers", type=int, help="Parallel tasks in lane mode")
+    args = parser.parse_args()
+
+    if args.command == "setup":
         setup()
     else:
         # Run full pipeline
-        run_pipeline()
+        run_pipeline(
+            skip_ingest=args.skip_ingest,
+            skip_transform=args.skip_transform,
+            skip_load=args.skip_load,
+            reload_range=tuple(args.reload) if args.reload else None,
+            parallel=not args.sequential,
+            max_workers=args.workers,
+        )
@@ -0,0 +1,111 @@
+"""Minimal DAG scheduler for running pipeline tasks on a worker pool."""
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from src import metrics
+from src.config import PIPELINE_MAX_WORKERS
+
+
+class DagScheduler:
+    """
+    Runs tasks as soon as their dependencies have finished.
+
+    Each task is a callable taking a dict of its dependencies' results.
+    Independent tasks run concurrently on up to ``max_workers`` threads.
+    A task whose callable raises is marked failed, and every task that
+    depends on it (directly or not) is skipped, except tasks added with
+    ``always=True``: those run once all their dependencies have finished,
+    whatever the outcome (a failed dependency's result is its error dict, a
+    skipped one's is None). Tasks run in the metrics
+    context of the caller of ``run``, so their spans nest under its span.
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or PIPELINE_MAX_WORKERS
+        self.tasks = {}
+
+    def add(self, name: str, fn, deps: list = (), always: bool = False) -> str:
+        """Register a task; dependencies must already be registered."""
+        if name in self.tasks:
+            raise ValueError(f"Task '{name}' already registered")
+        missing = [dep for dep in deps if dep not in self.tasks]
+        if missing:
+            raise ValueError(f"Task '{name}' depends on unknown tasks: {missing}")
+        self.tasks[name] = {"fn": fn, "deps": list(deps), "always": always}
+        return name
+
+    def run(self) -> dict:
+        """
+        Execute all tasks.
+
+        Returns:
+            Dict with ``results`` (task → return value), ``timings``
+            (task → status, start/end offsets and seconds), the
+            ``critical_path`` (longest dependency chain by duration),
+            its length in seconds and the total ``wall_seconds``
+        """
+        results, timings = {}, {}
+        started = time.perf_counter()
+        waiting = dict(self.tasks)
+        running = {}
+
+        def execute(name: str):
+            task = self.tasks[name]
+            upstream = {dep: results[dep] for dep in task["deps"]}
+            begin = time.perf_counter()
+            try:
+                return "success", task["fn"](upstream), begin, time.perf_counter()
+            except Exception as e:
+                return "failed", {"error": str(e)}, begin, time.perf_counter()
+
+        execute = metrics.propagate(execute)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while waiting or running:
+                for name, task in list(waiting.items()):
+                    upstream_failed = any(
+                        timings.get(dep, {}).get("status") in ("failed", "skipped") for dep in task["deps"]
+                    )
+                    if upstream_failed and not task["always"]:
+                        del waiting[name]
+                        results[name] = None
+                        timings[name] = {"status": "skipped", "start": None, "end": None, "seconds": 0.0}
+                    elif all(dep in timings for dep in task["deps"]):
+                        del waiting[name]
+                        running[executor.submit(execute, name)] = name
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    status, result, begin, end = future.result()
+                    results[name] = result
+                    timings[name] = {
+                        "status": status,
+                        "start": round(begin - started, 3),
+                        "end": round(end - started, 3),
+                        "seconds": round(end - begin, 3),
+                    }
+
+        path, path_seconds = self._critical_path(timings)
+        return {
+            "results": results,
+            "timings": timings,
+            "critical_path": path,
+            "critical_path_seconds": round(path_seconds, 3),
+            "wall_seconds": round(time.perf_counter() - started, 3),
+        }
+
+    def _critical_path(self, timings: dict) -> tuple:
+        """Longest chain of dependent tasks by measured duration."""
+        longest = {}
+
+        def chain(name: str) -> tuple:
+            if name not in longest:
+                deps = [chain(dep) for dep in self.tasks[name]["deps"]]
+                path, seconds = max(deps, key=lambda item: item[1]) if deps else ([], 0.0)
+                longest[name] = (path + [name], seconds + timings[name]["seconds"])
+            return longest[name]
+
+        if not self.tasks:
+            return [], 0.0
+        return max((chain(name) for name in self.tasks), key=lambda item: item[1])
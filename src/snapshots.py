@@ -0,0 +1,198 @@
+"""Gold snapshots: precomputed dashboard views published to the gold container."""
+import json
+import secrets
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from src import metrics
+from src.config import (
+    SNAPSHOT_PREFIX,
+    SNAPSHOT_HOURLY_DAYS,
+    SNAPSHOT_DAILY_DAYS,
+    SNAPSHOT_TOP_CITIES,
+)
+from src.database import DatabaseManager
+from src.storage import AzureStorageClient
+
+
+STATS_QUERY = """
+SELECT
+    (SELECT SUM(p.rows) FROM sys.partitions AS p
+     WHERE p.object_id = OBJECT_ID('dbo.fact_electricity_production') AND p.index_id IN (0, 1)) AS electricity_rows,
+    (SELECT SUM(p.rows) FROM sys.partitions AS p
+     WHERE p.object_id = OBJECT_ID('dbo.dim_companies') AND p.index_id IN (0, 1)) AS company_rows,
+    latest.value_mw,
+    latest.start_time
+FROM (SELECT 1 AS anchor) AS one
+OUTER APPLY (
+    SELECT TOP 1 value_mw, start_time FROM fact_electricity_production ORDER BY start_time DESC
+) AS latest;
+"""
+
+LATEST_BY_DATASET_QUERY = """
+SELECT f.dataset_id, f.start_time, f.value_mw
+FROM (SELECT DISTINCT dataset_id FROM agg_electricity_monthly) AS d
+CROSS APPLY (
+    SELECT TOP 1 dataset_id, start_time, value_mw FROM fact_electricity_production
+    WHERE dataset_id = d.dataset_id ORDER BY start_time DESC
+) AS f;
+"""
+
+ROLLUP_QUERY = """
+SELECT dataset_id, bucket_start, avg_mw, min_mw, max_mw, sum_mw, sample_count
+FROM {table}
+WHERE bucket_start >= ?
+ORDER BY dataset_id, bucket_start;
+"""
+
+COMPANIES_BY_FORM_QUERY = """
+SELECT COALESCE(company_form, '') AS company_form, COUNT(*) AS companies
+FROM dim_companies
+GROUP BY company_form
+ORDER BY companies DESC;
+"""
+
+COMPANIES_BY_CITY_QUERY = """
+SELECT TOP (?) COALESCE(city, '') AS city, COUNT(*) AS companies
+FROM dim_companies
+GROUP BY city
+ORDER BY companies DESC;
+"""
+
+
+class SnapshotPublisher:
+    """
+    Materialises the dashboard's Gold views as JSON blobs.
+
+    Every publish writes each view to ``snapshots/{view}/{version}.json`` and
+    then replaces ``snapshots/latest.json``, which names the version and the
+    view blobs. Version blobs are never modified, so readers can cache
+    them indefinitely and use the version as an ETag; versions carry
+    microseconds and a random suffix, so two publishes never share one.
+    """
+
+    def __init__(self, storage=None, db: DatabaseManager = None):
+        self.storage = storage or AzureStorageClient()
+        self.db = db or DatabaseManager()
+
+    def build_views(self) -> dict:
+        """Query Gold and return {view name: JSON-serialisable document}."""
+        now = datetime.utcnow()
+        stats = self.db.fetch_all(STATS_QUERY)[0]
+
+        views = {
+            "stats": {
+                "electricity": {
+                    "latest_mw": float(stats["value_mw"] or 0),
+                    "total_records": int(stats["electricity_rows"] or 0),
+                },
+                "companies": {
+                    "total": int(stats["company_rows"] or 0),
+                },
+                "source": "Gold snapshot",
+            },
+            "electricity_latest": {
+                "datasets": {
+                    str(row["dataset_id"]): {"start_time": row["start_time"], "value_mw": row["value_mw"]}
+                    for row in self.db.fetch_all(LATEST_BY_DATASET_QUERY)
+                },
+                "latest_start_time": stats["start_time"],
+            },
+            "companies_by_form": _columns(self.db.fetch_all(COMPANIES_BY_FORM_QUERY)),
+            "companies_by_city": _columns(
+                self.db.fetch_all(COMPANIES_BY_CITY_QUERY, (SNAPSHOT_TOP_CITIES,))
+            ),
+        }
+
+        windows = {
+            "hourly": now - timedelta(days=SNAPSHOT_HOURLY_DAYS),
+            "daily": now - timedelta(days=SNAPSHOT_DAILY_DAYS),
+            "monthly": datetime(1900, 1, 1),
+        }
+        for granularity, since in windows.items():
+            rows = self.db.fetch_all(ROLLUP_QUERY.format(table=f"agg_electricity_{granularity}"), (since,))
+            views[f"electricity_{granularity}"] = {
+                "granularity": granularity,
+                "since": since,
+                "series": _series_by_dataset(rows),
+            }
+        return views
+
+    def publish(self, views: dict = None) -> dict:
+        """
+        Upload a new snapshot version and point ``latest`` at it.
+
+        Returns:
+            The pointer document that was written
+        """
+        views = views if views is not None else self.build_views()
+        version = snapshot_version()
+        published_at = datetime.utcnow().isoformat()
+        print(f"📸 Publishing {len(views)} Gold snapshot views (version {version})...")
+
+        pointer = {"version": version, "published_at": published_at, "views": {}}
+        for name, document in views.items():
+            body = json.dumps(
+                {**document, "snapshot_version": version, "published_at": published_at},
+                separators=(",", ":"),
+                default=_json_default,
+            )
+            pointer["views"][name] = self.storage.upload_to_gold(
+                body, f"{SNAPSHOT_PREFIX}/{name}", "json", blob_stem=version
+            )
+
+        # The pointer goes last so readers never see a version that is half written
+        self.storage.upload_to_gold(json.dumps(pointer, indent=2), SNAPSHOT_PREFIX, "json", blob_stem="latest")
+        return pointer
+
+
+def snapshot_version() -> str:
+    """Unique snapshot version, e.g. ``20240105_120000_123456_9f3a``; sorts chronologically."""
+    return f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}_{secrets.token_hex(2)}"
+
+
+def _columns(rows: list) -> dict:
+    """Turn a list of row dicts into {column: [values]}."""
+    if not rows:
+        return {}
+    return {column: [row[column] for row in rows] for column in rows[0]}
+
+
+def _series_by_dataset(rows: list) -> dict:
+    """Group rollup rows into compact per-dataset columnar series."""
+    series = {}
+    for row in rows:
+        columns = series.setdefault(str(row["dataset_id"]), {
+            "t": [], "avg": [], "min": [], "max": [], "sum": [], "count": [],
+        })
+        columns["t"].append(row["bucket_start"])
+        columns["avg"].append(row["avg_mw"])
+        columns["min"].append(row["min_mw"])
+        columns["max"].append(row["max_mw"])
+        columns["sum"].append(row["sum_mw"])
+        columns["count"].append(row["sample_count"])
+    return series
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def publish_snapshots(publisher: SnapshotPublisher = None) -> dict:
+    """Publish the Gold snapshot views; errors are reported, not raised."""
+    with metrics.span("publish:snapshots", stage="publish", source="snapshots") as span:
+        try:
+            pointer = (publisher or SnapshotPublisher()).publish()
+            print(f"   ✅ Snapshot {pointer['version']} published")
+            return {"status": "success", "version": pointer["version"], "views": list(pointer["views"])}
+        except Exception as e:
+            span.status, span.error = "error", str(e)
+            print(f"   ❌ Snapshot publish failed: {e}")
+            return {"status": "error", "error": str(e)}
+
+
+if __name__ == "__main__":
+    publish_snapshots()
@@ -1,50 +1,91 @@
 """Azure Blob Storage utilities for Medallion architecture."""
+import base64
+import gzip
 import json
+import uuid
 from datetime import datetime
 from azure.storage.blob import BlobServiceClient
+from src import metrics
 from src.config import (
     AZURE_STORAGE_CONNECTION_STRING,
     BRONZE_CONTAINER,
     SILVER_CONTAINER,
     GOLD_CONTAINER,
+    STATE_PREFIX,
+    BRONZE_FORMAT,
+    BLOB_BLOCK_SIZE,
 )
 
+# Bronze formats and their file extensions
+BRONZE_FORMATS = ("json", "ndjson.gz", "ndjson.zst")
+
+# Header key naming where the NDJSON record lines belong in the payload
+RECORDS_PATH_KEY = "_records_path"
+
 
 class AzureStorageClient:
     """Client for interacting with Azure Blob Storage."""
 
-    def __init__(self):
-        self.blob_service_client = BlobServiceClient.from_connection_string(
+    def __init__(self, blob_service_client=None):
+        self.blob_service_client = blob_service_client or BlobServiceClient.from_connection_string(
             AZURE_STORAGE_CONNECTION_STRING
         )
 
-    def upload_to_bronze(self, data: dict, source_name: str, dataset_name: str) -> str:
+    def upload_to_bronze(
+        self,
+        data: dict,
+        source_name: str,
+        dataset_name: str,
+        blob_stem: str = None,
+        records_path: str = None,
+        fmt: str = None,
+    ) -> str:
         """
         Upload raw data to the Bronze (raw) layer.
+
+        In the ``json`` format the payload is stored as one indented document.
+        The ``ndjson.gz`` / ``ndjson.zst`` formats store a header line with
+        the payload minus its records, followed by one line per record, and
+        compress the stream into staged blocks so the serialised payload is
+        never held in memory as a whole.
         
         Args:
             data: Raw JSON data from API
             source_name: Name of the data source (e.g., 'fingrid', 'prh')
             dataset_name: Name of the specific dataset
+            blob_stem: File name without extension (default: current UTC timestamp)
+            records_path: Dotted path of the record list in ``data``
+                (e.g. 'data.results'); written one record per line in NDJSON
+            fmt: One of BRONZE_FORMATS (default: BRONZE_FORMAT)
             
         Returns:
             Blob path where data was stored
         """
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        blob_name = f"{source_name}/{dataset_name}/{timestamp}.json"
+        fmt = fmt or BRONZE_FORMAT
+        if fmt not in BRONZE_FORMATS:
+            raise ValueError(f"Unknown Bronze format '{fmt}', expected one of {BRONZE_FORMATS}")
+
+        blob_stem = blob_stem or utc_timestamp()
+        blob_name = f"{source_name}/{dataset_name}/{blob_stem}.{fmt}"
         
         container_client = self.blob_service_client.get_container_client(BRONZE_CONTAINER)
         blob_client = container_client.get_blob_client(blob_name)
         
-        blob_client.upload_blob(
-            json.dumps(data, ensure_ascii=False, indent=2),
-            overwrite=True
-        )
+        if fmt == "json":
+            document = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+            blob_client.upload_blob(document, overwrite=True)
+            metrics.add("blob.bytes_written", len(document))
+        else:
+            with BlockBlobWriter(blob_client) as writer, compressed_writer(fmt, writer) as stream:
+                for line in _ndjson_lines(data, records_path):
+                    stream.write(line)
         
         print(f"✅ Uploaded to bronze/{blob_name}")
         return blob_name
 
-    def upload_to_silver(self, data: str, source_name: str, dataset_name: str, file_ext: str = "parquet") -> str:
+    def upload_to_silver(
+        self, data: str, source_name: str, dataset_name: str, file_ext: str = "parquet", blob_stem: str = None
+    ) -> str:
         """
         Upload cleaned/validated data to the Silver layer.
         
@@ -53,22 +94,26 @@ class AzureStorageClient:
             source_name: Name of the data source
             dataset_name: Name of the dataset
             file_ext: File extension (default: parquet)
+            blob_stem: File name without extension (default: current UTC timestamp)
             
         Returns:
             Blob path where data was stored
         """
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        blob_name = f"{source_name}/{dataset_name}/{timestamp}.{file_ext}"
+        blob_stem = blob_stem or utc_timestamp()
+        blob_name = f"{source_name}/{dataset_name}/{blob_stem}.{file_ext}"
         
         container_client = self.blob_service_client.get_container_client(SILVER_CONTAINER)
         blob_client = container_client.get_blob_client(blob_name)
         
         blob_client.upload_blob(data, overwrite=True)
+        metrics.add("blob.bytes_written", len(data))
         
         print(f"✅ Uploaded to silver/{blob_name}")
         return blob_name
 
-    def upload_to_gold(self, data: str, entity_name: str, file_ext: str = "parquet") -> str:
+    def upload_to_gold(
+        self, data: str, entity_name: str, file_ext: str = "parquet", blob_stem: str = None
+    ) -> str:
         """
         Upload aggregated/final data to the Gold layer.
         
@@ -76,29 +121,179 @@ class AzureStorageClient:
             data: Final aggregated data
             entity_name: Name of the business entity
             file_ext: File extension
+            blob_stem: File name without extension (default: UTC timestamp)
             
         Returns:
             Blob path where data was stored
         """
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        blob_name = f"{entity_name}/{timestamp}.{file_ext}"
+        blob_name = f"{entity_name}/{blob_stem or utc_timestamp()}.{file_ext}"
         
         container_client = self.blob_service_client.get_container_client(GOLD_CONTAINER)
         blob_client = container_client.get_blob_client(blob_name)
         
         blob_client.upload_blob(data, overwrite=True)
+        metrics.add("blob.bytes_written", len(data))
         
         print(f"✅ Uploaded to gold/{blob_name}")
         return blob_name
 
+    def open_silver_writer(
+        self, source_name: str, dataset_name: str, file_ext: str = "parquet", blob_stem: str = None
+    ) -> tuple:
+        """
+        Open a streaming writer for a new Silver blob.
+
+        Returns:
+            (blob path, BlockBlobWriter); the blob exists once the writer is closed
+        """
+        blob_stem = blob_stem or utc_timestamp()
+        blob_name = f"{source_name}/{dataset_name}/{blob_stem}.{file_ext}"
+        blob_client = self.blob_service_client.get_blob_client(SILVER_CONTAINER, blob_name)
+        return blob_name, BlockBlobWriter(blob_client)
+
     def read_from_container(self, container: str, blob_name: str) -> bytes:
         """Read data from a specific container and blob."""
         container_client = self.blob_service_client.get_container_client(container)
         blob_client = container_client.get_blob_client(blob_name)
-        return blob_client.download_blob().readall()
+        data = blob_client.download_blob().readall()
+        metrics.add("blob.bytes_read", len(data))
+        return data
+
+    def stream_from_container(self, container: str, blob_name: str):
+        """Iterate over a blob's content in download-sized chunks."""
+        container_client = self.blob_service_client.get_container_client(container)
+        blob_client = container_client.get_blob_client(blob_name)
+        return _metered_chunks(blob_client.download_blob().chunks())
 
     def list_blobs(self, container: str, prefix: str = None) -> list:
         """List all blobs in a container with optional prefix filter."""
         container_client = self.blob_service_client.get_container_client(container)
         blobs = container_client.list_blobs(name_starts_with=prefix)
         return [blob.name for blob in blobs]
+
+    def read_state(self, name: str) -> dict:
+        """
+        Read a pipeline state document (watermark, checkpoint, ...).
+
+        Returns:
+            The stored document, or None if it does not exist yet
+        """
+        blob_client = self.blob_service_client.get_blob_client(BRONZE_CONTAINER, f"{STATE_PREFIX}/{name}.json")
+        if not blob_client.exists():
+            return None
+        document = blob_client.download_blob().readall()
+        metrics.add("blob.bytes_read", len(document))
+        return json.loads(document)
+
+    def write_state(self, name: str, state: dict) -> None:
+        """Persist a pipeline state document, replacing the previous version."""
+        blob_client = self.blob_service_client.get_blob_client(BRONZE_CONTAINER, f"{STATE_PREFIX}/{name}.json")
+        document = json.dumps(state, ensure_ascii=False, indent=2, default=str).encode("utf-8")
+        blob_client.upload_blob(document, overwrite=True)
+        metrics.add("blob.bytes_written", len(document))
+
+
+class BlockBlobWriter:
+    """
+    Write-only file object that uploads to a block blob in fixed-size blocks.
+
+    Each full block is staged as soon as it is written; ``close`` stages the
+    remainder and commits the block list, replacing any existing blob.
+    """
+
+    def __init__(self, blob_client, block_size: int = None):
+        self.blob_client = blob_client
+        self.block_size = block_size or BLOB_BLOCK_SIZE
+        self.bytes_written = 0
+        self._buffer = bytearray()
+        self._block_ids = []
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        self.bytes_written += len(data)
+        while len(self._buffer) >= self.block_size:
+            self._stage(bytes(self._buffer[:self.block_size]))
+            del self._buffer[:self.block_size]
+        return len(data)
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self) -> None:
+        pass
+
+    def tell(self) -> int:
+        return self.bytes_written
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self._buffer or not self._block_ids:
+            self._stage(bytes(self._buffer))
+            self._buffer.clear()
+        self.blob_client.commit_block_list(self._block_ids)
+        self.closed = True
+
+    def _stage(self, block: bytes) -> None:
+        block_id = base64.b64encode(uuid.uuid4().hex.encode()).decode()
+        self.blob_client.stage_block(block_id, block)
+        self._block_ids.append(block_id)
+        metrics.add("blob.bytes_written", len(block))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        # Leave the previous blob in place if the upload failed
+        if exc_type is None:
+            self.close()
+
+
+def _metered_chunks(chunks):
+    """Pass download chunks through, counting them as blob bytes read."""
+    for chunk in chunks:
+        metrics.add("blob.bytes_read", len(chunk))
+        yield chunk
+
+
+def compressed_writer(fmt: str, fileobj):
+    """Wrap a binary file object in the compressor for an NDJSON Bronze format."""
+    if fmt == "ndjson.gz":
+        return gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=6)
+    if fmt == "ndjson.zst":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("BRONZE_FORMAT=ndjson.zst requires the 'zstandard' package") from e
+        return zstandard.ZstdCompressor(level=3).stream_writer(fileobj, closefd=False)
+    raise ValueError(f"'{fmt}' is not a compressed Bronze format")
+
+
+def _ndjson_lines(payload: dict, records_path: str):
+    """Yield the encoded header line and one line per record of a payload."""
+    records = []
+    header = payload
+    if records_path:
+        *parents, leaf = records_path.split(".")
+        header = dict(payload)
+        node = header
+        for key in parents:
+            node[key] = dict(node.get(key) or {})
+            node = node[key]
+        records = node.pop(leaf, None) or []
+        header[RECORDS_PATH_KEY] = records_path
+
+    yield json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n"
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def utc_timestamp() -> str:
+    """Timestamp used to name blobs; sorts chronologically."""
+    return datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+
+
+def blob_stem(blob_name: str) -> str:
+    """File name of a blob without directory or extension(s)."""
+    return blob_name.rsplit("/", 1)[-1].split(".", 1)[0]
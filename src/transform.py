@@ -1,19 +1,137 @@
 """Data transformation from Bronze to Silver layer."""
+import gzip
+import io
 import json
+import zlib
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from io import BytesIO
 from datetime import datetime
-from src.config import BRONZE_CONTAINER, SILVER_CONTAINER
-from src.storage import AzureStorageClient
+from src import metrics
+from src.config import BRONZE_CONTAINER, SILVER_CONTAINER, TRANSFORM_BATCH_SIZE, TRANSFORM_ENGINE, TRANSFORM_ENGINES
+from src.jsonstat import decode_jsonstat, dimension_key
+from src.manifest import BlobManifest
+from src.storage import AzureStorageClient, blob_stem, RECORDS_PATH_KEY
+
+try:
+    import ijson
+except ImportError:  # plain .json Bronze blobs are then parsed in one piece
+    ijson = None
+
+# Transform engines: "pandas" (DataFrame steps) or "arrow" (Arrow compute
+# kernels on typed columns, no intermediate DataFrames); same Silver output.
+# PRH is always flattened with Arrow, so there the engine only picks how
+# duplicate business IDs are found
+ENGINES = ("pandas", "arrow")
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+# Largest piece of decompressed Bronze data split into lines at once; a 4 MiB
+# download chunk of NDJSON can otherwise inflate to tens of megabytes
+DECOMPRESSED_PIECE_SIZE = 1024 * 1024
+
+# Silver schemas of the streaming transforms (one row group per batch)
+FINGRID_RECORD_FIELDS = ["datasetId", "startTime", "endTime", "value"]
+# Typed Fingrid record fields; both engines dedupe on these, so a record
+# gets the same key whatever dtype pandas infers for its batch
+FINGRID_RECORD_SCHEMA = pa.schema([
+    ("datasetId", pa.int64()),
+    ("startTime", pa.string()),
+    ("endTime", pa.string()),
+    ("value", pa.float64()),
+])
+FINGRID_ELECTRICITY_SCHEMA = pa.schema([
+    ("datasetId", pa.int64()),
+    ("startTime", pa.timestamp("us", tz="UTC")),
+    ("endTime", pa.string()),
+    ("value", pa.float64()),
+    ("hour", pa.int32()),
+    ("day_of_week", pa.int32()),
+    ("date", pa.string()),
+    ("transformed_at", pa.string()),
+    ("source_blob", pa.string()),
+])
+PRH_COMPANIES_SCHEMA = pa.schema([
+    ("business_id", pa.string()),
+    ("name", pa.string()),
+    ("registration_date", pa.string()),
+    ("company_form", pa.string()),
+    ("status", pa.string()),
+    ("transformed_at", pa.string()),
+    ("street", pa.string()),
+    ("city", pa.string()),
+    ("post_code", pa.string()),
+    ("previous_names", pa.list_(pa.string())),
+])
+STAT_FINLAND_CATEGORIES_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("text", pa.string()),
+    ("type", pa.string()),
+    ("updated", pa.string()),
+    ("transformed_at", pa.string()),
+])
+EUROSTAT_OBSERVATIONS_SCHEMA = pa.schema([
+    ("dataset_code", pa.string()),
+    ("geo", pa.string()),
+    ("time_period", pa.string()),
+    ("dimension_key", pa.string()),
+    ("value", pa.float64()),
+    ("status", pa.string()),
+    ("transformed_at", pa.string()),
+])
+
+# Fields of a PRH YTJ v3 company that the Silver table is built from. Keys of
+# the API response that are not listed here are ignored during conversion.
+PRH_V3_COMPANY_TYPE = pa.struct([
+    ("businessId", pa.struct([("value", pa.string()), ("registrationDate", pa.string())])),
+    ("names", pa.list_(pa.struct([
+        ("name", pa.string()),
+        ("type", pa.string()),
+        ("endDate", pa.string()),
+    ]))),
+    ("companyForms", pa.list_(pa.struct([
+        ("endDate", pa.string()),
+        ("descriptions", pa.list_(pa.struct([("languageCode", pa.string()), ("description", pa.string())]))),
+    ]))),
+    ("addresses", pa.list_(pa.struct([
+        ("type", pa.int64()),
+        ("street", pa.string()),
+        ("buildingNumber", pa.string()),
+        ("postCode", pa.string()),
+        ("postOffices", pa.list_(pa.struct([("city", pa.string()), ("languageCode", pa.string())]))),
+    ]))),
+    ("registrationDate", pa.string()),
+    ("status", pa.string()),
+])
+
+# Flat (pre-v3) company shape with string business IDs and names
+PRH_FLAT_COMPANY_TYPE = pa.struct([
+    ("businessId", pa.string()),
+    ("name", pa.string()),
+    ("registrationDate", pa.string()),
+    ("companyForm", pa.string()),
+    ("status", pa.string()),
+    ("addresses", pa.list_(pa.struct([("street", pa.string()), ("city", pa.string()), ("postCode", pa.string())]))),
+])
+
+# PRH YTJ v3 lists companies under "companies"; older extracts used "results"
+PRH_RECORDS_PATHS = ("data.companies", "data.results")
+
+# PRH language codes: 1 = Finnish, 3 = English
+PRH_LANG_FI = "1"
+PRH_LANG_EN = "3"
 
 
 class DataTransformer:
     """Transforms raw Bronze data into cleaned Silver data."""
 
-    def __init__(self):
-        self.storage = AzureStorageClient()
+    def __init__(self, storage=None):
+        self.storage = storage or AzureStorageClient()
 
-    def transform_fingrid_data(self, bronze_blob_path: str) -> str:
+    def transform_fingrid_data(self, bronze_blob_path: str, batch_size: int = None, engine: str = None) -> str:
         """
         Transform Fingrid electricity data from Bronze to Silver.
         
@@ -22,62 +140,47 @@ class DataTransformer:
         - Add calculated fields (hour, day_of_week)
         - Remove duplicates
         - Validate data ranges
+
+        Records are decoded incrementally from the Bronze blob and processed
+        ``batch_size`` at a time, each batch becoming one Parquet row group
+        of a block-blob upload, so memory is bounded by the batch size and
+        not by the length of a backfill. Duplicates are dropped across
+        batches by a key per record.
         
         Args:
             bronze_blob_path: Path to the Bronze blob
+            batch_size: Records per batch (default: TRANSFORM_BATCH_SIZE)
+            engine: "pandas" or "arrow" (default: see transform_engine)
             
         Returns:
             Path to the Silver blob
         """
         print(f"🔄 Transforming: {bronze_blob_path}")
-        
-        # Read from Bronze
-        raw_data = self.storage.read_from_container(BRONZE_CONTAINER, bronze_blob_path)
-        payload = json.loads(raw_data.decode("utf-8"))
-        
-        records = payload.get("data", {}).get("data", [])
-        if not records:
+
+        transformed_at = datetime.utcnow().isoformat()
+        step = _fingrid_batch_arrow if transform_engine("fingrid", engine) == "arrow" else _fingrid_batch_pandas
+        seen = None
+
+        def transform(records):
+            nonlocal seen
+            metrics.add("rows.in", len(records))
+            table, seen = step(records, seen, transformed_at, bronze_blob_path)
+            metrics.add("rows.dropped", len(records) - table.num_rows)
+            return table
+
+        records = iter_bronze_records(self.storage, bronze_blob_path, "data.data")
+        batches = (transform(batch) for batch in batched(records, batch_size or TRANSFORM_BATCH_SIZE))
+        silver_path, rows = self._write_silver_batches(
+            batches, FINGRID_ELECTRICITY_SCHEMA, "fingrid", "electricity_production", bronze_blob_path
+        )
+        if not rows:
             print("⚠️ No records to transform")
             return None
 
-        # Convert to DataFrame
-        df = pd.DataFrame(records)
-        
-        # Transform
-        if "startTime" in df.columns:
-            df["startTime"] = pd.to_datetime(df["startTime"])
-            df["hour"] = df["startTime"].dt.hour
-            df["day_of_week"] = df["startTime"].dt.dayofweek
-            df["date"] = df["startTime"].dt.date.astype(str)
-        
-        if "value" in df.columns:
-            df["value"] = pd.to_numeric(df["value"], errors="coerce")
-            # Remove negative values (data quality)
-            df = df[df["value"] >= 0]
-        
-        # Remove duplicates
-        df = df.drop_duplicates()
-        
-        # Add metadata
-        df["transformed_at"] = datetime.utcnow().isoformat()
-        df["source_blob"] = bronze_blob_path
-        
-        # Save as Parquet to Silver
-        buffer = BytesIO()
-        df.to_parquet(buffer, index=False)
-        buffer.seek(0)
-        
-        silver_path = self.storage.upload_to_silver(
-            data=buffer.getvalue(),
-            source_name="fingrid",
-            dataset_name="electricity_production",
-            file_ext="parquet"
-        )
-        
-        print(f"   ✅ Transformed {len(df)} records")
+        print(f"   ✅ Transformed {rows} records")
         return silver_path
 
-    def transform_prh_companies(self, bronze_blob_path: str) -> str:
+    def transform_prh_companies(self, bronze_blob_path: str, batch_size: int = None, engine: str = None) -> str:
         """
         Transform PRH company data from Bronze to Silver.
         
@@ -86,96 +189,686 @@ class DataTransformer:
         - Standardize business ID format
         - Extract registration date
         - Normalize company form names
+
+        Companies are decoded incrementally from the blob download stream
+        and written as Parquet row groups of ``batch_size`` rows, so memory
+        does not grow with the size of the Bronze blob. Both engines use
+        the Arrow flattener (flatten_prh_companies) and differ only in the
+        business ID dedupe: Arrow kernels over sorted hashes with "arrow",
+        a pandas Series and a Python set with "pandas".
         """
         print(f"🔄 Transforming PRH data: {bronze_blob_path}")
-        
-        raw_data = self.storage.read_from_container(BRONZE_CONTAINER, bronze_blob_path)
-        payload = json.loads(raw_data.decode("utf-8"))
-        
-        companies = payload.get("data", {}).get("results", [])
-        if not companies:
+
+        transformed_at = datetime.utcnow().isoformat()
+        arrow = transform_engine("prh", engine) == "arrow"
+        seen_ids = None if arrow else set()
+
+        def flatten(companies):
+            nonlocal seen_ids
+            table = flatten_prh_companies(companies, transformed_at)
+            metrics.add("rows.in", len(companies))
+
+            # Drop duplicate business IDs within and across batches
+            if arrow:
+                rows, seen_ids = _first_unseen(table["business_id"], seen_ids)
+                table = table.take(rows)
+            else:
+                ids = table["business_id"].to_pandas()
+                duplicate = ids.duplicated() | ids.isin(seen_ids)
+                seen_ids.update(ids[~duplicate])
+                table = table.filter(pa.array(~duplicate.to_numpy()))
+            metrics.add("rows.dropped", len(companies) - table.num_rows)
+            return table
+
+        companies = iter_bronze_records(self.storage, bronze_blob_path, PRH_RECORDS_PATHS)
+        batches = (flatten(batch) for batch in batched(companies, batch_size or TRANSFORM_BATCH_SIZE))
+        silver_path, rows = self._write_silver_batches(
+            batches, PRH_COMPANIES_SCHEMA, "prh", "companies", bronze_blob_path
+        )
+        if not rows:
             print("⚠️ No companies to transform")
             return None
 
-        # Flatten and transform
-        cleaned_records = []
-        for company in companies:
-            record = {
-                "business_id": company.get("businessId", ""),
-                "name": company.get("name", ""),
-                "registration_date": company.get("registrationDate", ""),
-                "company_form": company.get("companyForm", ""),
-                "status": company.get("status", ""),
-                "transformed_at": datetime.utcnow().isoformat(),
-            }
-            
-            # Extract address if available
-            addresses = company.get("addresses", [])
-            if addresses:
-                addr = addresses[0]
-                record["street"] = addr.get("street", "")
-                record["city"] = addr.get("city", "")
-                record["post_code"] = addr.get("postCode", "")
-            
-            cleaned_records.append(record)
-        
-        df = pd.DataFrame(cleaned_records)
-        df = df.drop_duplicates(subset=["business_id"])
-        
-        # Save to Silver
-        buffer = BytesIO()
-        df.to_parquet(buffer, index=False)
-        buffer.seek(0)
-        
-        silver_path = self.storage.upload_to_silver(
-            data=buffer.getvalue(),
-            source_name="prh",
-            dataset_name="companies",
-            file_ext="parquet"
-        )
-        
-        print(f"   ✅ Transformed {len(df)} companies")
+        print(f"   ✅ Transformed {rows} companies")
         return silver_path
 
-    def transform_stat_finland(self, bronze_blob_path: str) -> str:
-        """Transform Statistics Finland catalog data."""
+    def transform_stat_finland(self, bronze_blob_path: str, batch_size: int = None) -> str:
+        """Transform Statistics Finland catalog data (streamed like the PRH transform)."""
         print(f"🔄 Transforming StatFi data: {bronze_blob_path}")
-        
-        raw_data = self.storage.read_from_container(BRONZE_CONTAINER, bronze_blob_path)
-        payload = json.loads(raw_data.decode("utf-8"))
-        
-        categories = payload.get("data", [])
-        if not categories:
+
+        transformed_at = datetime.utcnow().isoformat()
+
+        def flatten(categories):
+            metrics.add("rows.in", len(categories))
+            return pa.Table.from_pylist([
+                {
+                    "id": cat.get("id", ""),
+                    "text": cat.get("text", ""),
+                    "type": cat.get("type", ""),
+                    "updated": cat.get("updated", ""),
+                    "transformed_at": transformed_at,
+                }
+                for cat in categories
+            ], schema=STAT_FINLAND_CATEGORIES_SCHEMA)
+
+        categories = iter_bronze_records(self.storage, bronze_blob_path, "data")
+        batches = (flatten(batch) for batch in batched(categories, batch_size or TRANSFORM_BATCH_SIZE))
+        silver_path, rows = self._write_silver_batches(
+            batches, STAT_FINLAND_CATEGORIES_SCHEMA, "stat_finland", "categories", bronze_blob_path
+        )
+        if not rows:
             print("⚠️ No categories to transform")
             return None
 
-        # Flatten categories
-        records = []
-        for cat in categories:
-            records.append({
-                "id": cat.get("id", ""),
-                "text": cat.get("text", ""),
-                "type": cat.get("type", ""),
-                "updated": cat.get("updated", ""),
-                "transformed_at": datetime.utcnow().isoformat(),
-            })
-        
-        df = pd.DataFrame(records)
-        
-        buffer = BytesIO()
-        df.to_parquet(buffer, index=False)
-        buffer.seek(0)
-        
-        silver_path = self.storage.upload_to_silver(
-            data=buffer.getvalue(),
-            source_name="stat_finland",
-            dataset_name="categories",
-            file_ext="parquet"
+        print(f"   ✅ Transformed {rows} categories")
+        return silver_path
+
+    def transform_eurostat(self, bronze_blob_path: str, batch_size: int = None) -> str:
+        """
+        Transform a Eurostat JSON-stat dataset into long-format observations.
+
+        Each observed cell becomes one row keyed by geo, time period and a
+        ``dimension_key`` combining the remaining dimensions (unit, na_item,
+        ...), so datasets with different dimensions share one Silver schema.
+        """
+        print(f"🔄 Transforming Eurostat data: {bronze_blob_path}")
+
+        payload = read_bronze_payload(self.storage, bronze_blob_path)
+        doc = payload.get("data", payload)
+        dataset_code = payload.get("dataset_code") or bronze_blob_path.split("/")[1]
+
+        cells = decode_jsonstat(doc)
+        metrics.add("rows.in", cells.num_rows)
+        roles = doc.get("role", {})
+        geo = (roles.get("geo") or ["geo"])[0]
+        time_dim = (roles.get("time") or ["time"])[0]
+        others = [dim for dim in doc["id"] if dim not in (geo, time_dim)]
+
+        def column(dim):
+            return cells[dim] if dim in cells.column_names else pa.nulls(cells.num_rows, pa.string())
+
+        table = pa.table({
+            "dataset_code": pa.repeat(dataset_code, cells.num_rows),
+            "geo": column(geo),
+            "time_period": column(time_dim),
+            "dimension_key": dimension_key(cells, others),
+            "value": cells["value"],
+            "status": cells["status"],
+            "transformed_at": pa.repeat(datetime.utcnow().isoformat(), cells.num_rows),
+        })
+
+        batches = (pa.Table.from_batches([batch]) for batch in table.to_batches(batch_size or TRANSFORM_BATCH_SIZE))
+        silver_path, rows = self._write_silver_batches(
+            batches, EUROSTAT_OBSERVATIONS_SCHEMA, "eurostat", "observations", bronze_blob_path,
+            silver_stem=f"{blob_stem(bronze_blob_path)}_{dataset_code}",
         )
-        
-        print(f"   ✅ Transformed {len(df)} categories")
+        if not rows:
+            print("⚠️ No Eurostat observations to transform")
+            return None
+
+        print(f"   ✅ Transformed {rows} observations of {dataset_code} "
+              f"({len(doc['id'])} dimensions, {int(np.prod(doc['size']))} cells)")
         return silver_path
 
+    def transform_stat_finland_table(self, bronze_blob_path: str, batch_size: int = None) -> str:
+        """
+        Transform one json-stat2 chunk of a StatFin table into a Silver part file.
+
+        All chunks of a table share its dimension columns, so the files
+        under ``stat_finland/tables/<table>/`` read as one Parquet dataset.
+        """
+        print(f"🔄 Transforming StatFin table chunk: {bronze_blob_path}")
+
+        payload = read_bronze_payload(self.storage, bronze_blob_path)
+        doc = payload["data"]
+        table_id = bronze_blob_path.split("/")[2]
+        cells = decode_jsonstat(doc)
+        metrics.add("rows.in", cells.num_rows)
+
+        schema = pa.schema(
+            [("table_id", pa.string())]
+            + [(dim, pa.string()) for dim in doc["id"]]
+            + [("value", pa.float64()), ("status", pa.string()), ("transformed_at", pa.string())]
+        )
+        table = cells.append_column("table_id", pa.repeat(table_id, cells.num_rows)).append_column(
+            "transformed_at", pa.repeat(datetime.utcnow().isoformat(), cells.num_rows)
+        )
+
+        batches = (pa.Table.from_batches([batch]) for batch in table.to_batches(batch_size or TRANSFORM_BATCH_SIZE))
+        silver_path, rows = self._write_silver_batches(
+            batches, schema, "stat_finland", f"tables/{table_id}", bronze_blob_path
+        )
+        if not rows:
+            print("⚠️ No observations in chunk")
+            return None
+
+        print(f"   ✅ Transformed {rows} observations of {table_id} "
+              f"(chunk {payload.get('chunk')}/{payload.get('chunks')})")
+        return silver_path
+
+    def _write_silver_batches(
+        self, batches, schema: pa.Schema, source_name: str, dataset_name: str, bronze_blob_path: str,
+        silver_stem: str = None,
+    ) -> tuple:
+        """
+        Write Arrow tables to one Silver Parquet blob, a row group per batch.
+
+        The blob is only created once the first non-empty batch arrives. It
+        is named after the Bronze blob unless ``silver_stem`` is given.
+
+        Returns:
+            (Silver blob path or None, rows written)
+        """
+        silver_path, sink, writer = None, None, None
+        rows = 0
+        try:
+            for table in batches:
+                if not table.num_rows:
+                    continue
+                if writer is None:
+                    silver_path, sink = self.storage.open_silver_writer(
+                        source_name, dataset_name, blob_stem=silver_stem or blob_stem(bronze_blob_path)
+                    )
+                    writer = pq.ParquetWriter(sink, schema)
+                writer.write_table(table.select(schema.names).cast(schema))
+                rows += table.num_rows
+        except Exception:
+            # Abandon the partial upload; nothing is committed without sink.close()
+            if writer is not None:
+                writer.close()
+            raise
+
+        if writer is not None:
+            writer.close()
+            sink.close()
+            print(f"✅ Uploaded to silver/{silver_path}")
+        metrics.add("rows.out", rows)
+        return silver_path, rows
+
+
+def transform_engine(source: str, engine: str = None) -> str:
+    """
+    Engine to transform a source with: ``engine`` if given, else the
+    TRANSFORM_ENGINES entry of the source, else TRANSFORM_ENGINE.
+    """
+    engine = engine or TRANSFORM_ENGINES.get(source, TRANSFORM_ENGINE)
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown transform engine '{engine}' (expected one of {', '.join(ENGINES)})")
+    return engine
+
+
+def _fingrid_batch_pandas(records: list, seen: np.ndarray, transformed_at: str, source_blob: str) -> tuple:
+    """
+    Transform a batch of Fingrid records with pandas.
+
+    ``seen`` is the sorted array of 64-bit hashes of the record keys
+    (_fingrid_keys) kept from earlier batches (None for the first batch).
+
+    Returns:
+        (Arrow table in FINGRID_ELECTRICITY_SCHEMA, updated ``seen``)
+    """
+    seen = np.empty(0, dtype=np.uint64) if seen is None else seen
+    df = pd.DataFrame.from_records(records, columns=FINGRID_RECORD_FIELDS)
+
+    # Remove negative and non-numeric values (data quality)
+    df["value"] = pd.to_numeric(df["value"], errors="coerce")
+    df = df[df["value"] >= 0]
+
+    # Remove duplicates within and across batches
+    typed = pa.Table.from_pandas(df, schema=FINGRID_RECORD_SCHEMA, preserve_index=False)
+    keys = pd.util.hash_array(_fingrid_keys(typed).to_numpy(zero_copy_only=False))
+    duplicate = pd.Series(keys).duplicated().to_numpy() | _sorted_contains(seen, keys)
+    df = df[~duplicate].copy()
+    seen = _sorted_insert(seen, keys[~duplicate])
+
+    df["startTime"] = pd.to_datetime(df["startTime"], utc=True)
+    df["hour"] = df["startTime"].dt.hour
+    df["day_of_week"] = df["startTime"].dt.dayofweek
+    df["date"] = pd.Series(
+        df["startTime"].dt.tz_localize(None).to_numpy().astype("datetime64[D]").astype(str), index=df.index
+    ).where(df["startTime"].notna())
+
+    # Add metadata
+    df["transformed_at"] = transformed_at
+    df["source_blob"] = source_blob
+
+    return pa.Table.from_pandas(df, schema=FINGRID_ELECTRICITY_SCHEMA, preserve_index=False), seen
+
+
+def _fingrid_batch_arrow(records: list, seen: pa.Array, transformed_at: str, source_blob: str) -> tuple:
+    """
+    Transform a batch of Fingrid records with Arrow compute kernels.
+
+    Produces the same rows and columns as _fingrid_batch_pandas. Values,
+    timestamps and dates stay in typed Arrow columns, filtering and
+    deduplication select row indices instead of copying frames, and the
+    resulting columns are passed to the Parquet writer as they are.
+    ``seen`` is as for _first_unseen.
+
+    Returns:
+        (Arrow table in FINGRID_ELECTRICITY_SCHEMA, updated ``seen``)
+    """
+    table = pa.table({
+        "datasetId": pa.array([record.get("datasetId") for record in records], pa.int64()),
+        "startTime": pa.array([record.get("startTime") for record in records], pa.string()),
+        "endTime": pa.array([record.get("endTime") for record in records], pa.string()),
+        "value": _float_array([record.get("value") for record in records]),
+    })
+
+    # Remove negative and non-numeric values (data quality)
+    table = table.filter(pc.greater_equal(table["value"], 0))
+
+    # Remove duplicates within and across batches
+    rows, seen = _first_unseen(_fingrid_keys(table), seen)
+    table = table.take(rows)
+
+    start = _utc_timestamps(table["startTime"])
+    return pa.table({
+        "datasetId": table["datasetId"],
+        "startTime": start,
+        "endTime": table["endTime"],
+        "value": table["value"],
+        "hour": pc.hour(start).cast(pa.int32()),
+        "day_of_week": pc.day_of_week(start).cast(pa.int32()),
+        "date": start.cast(pa.date32()).cast(pa.string()),
+        "transformed_at": pa.repeat(pa.scalar(transformed_at), table.num_rows),
+        "source_blob": pa.repeat(pa.scalar(source_blob), table.num_rows),
+    }, schema=FINGRID_ELECTRICITY_SCHEMA), seen
+
+
+def _fingrid_keys(table: pa.Table) -> pa.Array:
+    """Dedupe key of each Fingrid record: its FINGRID_RECORD_SCHEMA fields joined as one string."""
+    return pc.binary_join_element_wise(
+        *(table[field].cast(pa.string()) for field in FINGRID_RECORD_FIELDS), "\x1f",
+        null_handling="replace", null_replacement="\x00",
+    )
+
+
+def _first_unseen(keys, seen: np.ndarray) -> tuple:
+    """
+    Rows holding the first occurrence of each key not seen in earlier batches.
+
+    ``seen`` is the sorted array of 64-bit hashes of the keys kept so far
+    (None before the first batch); a lookup costs O(log n) per key rather
+    than a rebuild of a hash table over every key seen.
+
+    Returns:
+        (ascending row indices, ``seen`` with the hashes of those rows added)
+    """
+    if isinstance(keys, pa.ChunkedArray):
+        keys = keys.combine_chunks()
+    rows = pc.index_in(pc.unique(keys), value_set=keys)
+    hashes = pd.util.hash_array(keys.take(rows).to_numpy(zero_copy_only=False))
+    seen = np.empty(0, dtype=np.uint64) if seen is None else seen
+    unseen = ~_sorted_contains(seen, hashes)
+    return rows.filter(pa.array(unseen)), _sorted_insert(seen, hashes[unseen])
+
+
+def _float_array(values: list) -> pa.Array:
+    """float64 array of JSON values; unparseable values become null (like pd.to_numeric(errors="coerce"))."""
+    try:
+        return pa.array(values, pa.float64())
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        return pa.array([_as_float(value) for value in values], pa.float64())
+
+
+def _as_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _utc_timestamps(values) -> pa.ChunkedArray:
+    """Parse ISO 8601 strings as UTC timestamps; strings without an offset are taken to be UTC."""
+    try:
+        return values.cast(pa.timestamp("us", tz="UTC"))
+    except pa.ArrowInvalid:
+        return pc.assume_timezone(values.cast(pa.timestamp("us")), "UTC")
+
+
+def read_bronze_payload(storage: AzureStorageClient, bronze_blob_path: str) -> dict:
+    """
+    Read a Bronze blob in any supported format back into its payload dict.
+
+    Plain ``.json`` documents are parsed as-is. Compressed NDJSON blobs
+    (detected by gzip/zstd magic bytes) are decompressed, and their record
+    lines are put back at the path named in the header line.
+    """
+    raw_data = storage.read_from_container(BRONZE_CONTAINER, bronze_blob_path)
+    if raw_data.startswith(GZIP_MAGIC):
+        raw_data = gzip.decompress(raw_data)
+    elif raw_data.startswith(ZSTD_MAGIC):
+        import zstandard
+        raw_data = zstandard.ZstdDecompressor().stream_reader(BytesIO(raw_data)).read()
+    elif not bronze_blob_path.endswith(".ndjson"):
+        return json.loads(raw_data.decode("utf-8"))
+
+    lines = raw_data.decode("utf-8").splitlines()
+    payload = json.loads(lines[0])
+    records_path = payload.pop(RECORDS_PATH_KEY, None)
+    if records_path:
+        *parents, leaf = records_path.split(".")
+        node = payload
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[leaf] = [json.loads(line) for line in lines[1:] if line]
+    return payload
+
+
+def flatten_prh_companies(companies: list, transformed_at: str) -> pa.Table:
+    """
+    Flatten a batch of PRH companies into PRH_COMPANIES_SCHEMA columns.
+
+    The batch is converted to one Arrow struct array in a single pass and
+    every output column is derived with Arrow/NumPy array operations over
+    the flattened nested lists:
+
+    - name: the current main name (type '1', no end date), else the first name
+    - previous_names: all names that have an end date
+    - company_form: English (else Finnish, else first) description of the
+      current company form
+    - street/city/post_code: the street address (type 1), else the first
+      address, with the Finnish post office name as city
+
+    Companies in the flat pre-v3 shape (string ``businessId``) are handled
+    by ``_flatten_prh_flat``.
+    """
+    if not companies:
+        return PRH_COMPANIES_SCHEMA.empty_table()
+    if not isinstance(companies[0].get("businessId"), dict):
+        return _flatten_prh_flat(companies, transformed_at)
+
+    arr = pa.array(companies, type=PRH_V3_COMPANY_TYPE)
+    size = len(arr)
+
+    # Names: current main name and the history of ended names
+    names = arr.field("names")
+    name_values = pc.list_flatten(names)
+    name_parents = pc.list_parent_indices(names).to_numpy()
+    ended = pc.is_valid(name_values.field("endDate")).to_numpy(zero_copy_only=False)
+    is_main = pc.fill_null(pc.equal(name_values.field("type"), "1"), False).to_numpy(zero_copy_only=False)
+    current_name = _first_per_parent(name_parents, size, ~ended & is_main)
+    current_name = np.where(current_name >= 0, current_name, _first_per_parent(name_parents, size))
+    previous = np.flatnonzero(ended)
+    previous_names = pa.ListArray.from_arrays(
+        pa.array(np.concatenate([[0], np.cumsum(np.bincount(name_parents[previous], minlength=size))]),
+                 type=pa.int32()),
+        name_values.field("name").take(pa.array(previous, type=pa.int64())),
+    )
+
+    # Company form: description of the current form in English, else Finnish
+    forms = arr.field("companyForms")
+    form_values = pc.list_flatten(forms)
+    form_parents = pc.list_parent_indices(forms).to_numpy()
+    form_open = pc.is_null(form_values.field("endDate")).to_numpy(zero_copy_only=False)
+    current_form = _first_per_parent(form_parents, size, form_open)
+    current_form = np.where(current_form >= 0, current_form, _first_per_parent(form_parents, size))
+
+    descriptions = form_values.field("descriptions")
+    description_values = pc.list_flatten(descriptions)
+    description_parents = pc.list_parent_indices(descriptions).to_numpy()
+    language = description_values.field("languageCode")
+    description = _coalesce_index(
+        _first_per_parent(description_parents, len(form_values),
+                          pc.fill_null(pc.equal(language, PRH_LANG_EN), False).to_numpy(zero_copy_only=False)),
+        _first_per_parent(description_parents, len(form_values),
+                          pc.fill_null(pc.equal(language, PRH_LANG_FI), False).to_numpy(zero_copy_only=False)),
+        _first_per_parent(description_parents, len(form_values)),
+    )
+    form_description = _take_or_null(description, current_form)
+
+    # Address: street address if present, with the Finnish post office name
+    addresses = arr.field("addresses")
+    address_values = pc.list_flatten(addresses)
+    address_parents = pc.list_parent_indices(addresses).to_numpy()
+    is_street = pc.fill_null(pc.equal(address_values.field("type"), 1), False).to_numpy(zero_copy_only=False)
+    address = _coalesce_index(
+        _first_per_parent(address_parents, size, is_street),
+        _first_per_parent(address_parents, size),
+    )
+    offices = address_values.field("postOffices")
+    office_values = pc.list_flatten(offices)
+    office_parents = pc.list_parent_indices(offices).to_numpy()
+    office = _coalesce_index(
+        _first_per_parent(office_parents, len(address_values),
+                          pc.fill_null(pc.equal(office_values.field("languageCode"), PRH_LANG_FI), False)
+                          .to_numpy(zero_copy_only=False)),
+        _first_per_parent(office_parents, len(address_values)),
+    )
+    street = pc.binary_join_element_wise(
+        address_values.field("street"), pc.fill_null(address_values.field("buildingNumber"), ""), " "
+    )
+
+    registration_date = pc.coalesce(arr.field("registrationDate"), arr.field("businessId").field("registrationDate"))
+    return pa.table({
+        "business_id": pc.fill_null(arr.field("businessId").field("value"), ""),
+        "name": pc.fill_null(_take(name_values.field("name"), current_name), ""),
+        "registration_date": pc.fill_null(registration_date, ""),
+        "company_form": pc.fill_null(_take(description_values.field("description"), form_description), ""),
+        "status": pc.fill_null(arr.field("status"), ""),
+        "transformed_at": pa.repeat(transformed_at, size),
+        "street": _take_filled(pc.utf8_trim_whitespace(street), address),
+        "city": pc.if_else(pa.array(address >= 0),
+                           pc.fill_null(_take(office_values.field("city"), _take_or_null(office, address)), ""),
+                           pa.nulls(size, pa.string())),
+        "post_code": _take_filled(address_values.field("postCode"), address),
+        "previous_names": previous_names,
+    }, schema=PRH_COMPANIES_SCHEMA)
+
+
+def _flatten_prh_flat(companies: list, transformed_at: str) -> pa.Table:
+    """Columnar flattening of the flat company shape (first address only)."""
+    arr = pa.array(companies, type=PRH_FLAT_COMPANY_TYPE)
+    size = len(arr)
+    addresses = arr.field("addresses")
+    address_values = pc.list_flatten(addresses)
+    address = _first_per_parent(pc.list_parent_indices(addresses).to_numpy(), size)
+    return pa.table({
+        "business_id": pc.fill_null(arr.field("businessId"), ""),
+        "name": pc.fill_null(arr.field("name"), ""),
+        "registration_date": pc.fill_null(arr.field("registrationDate"), ""),
+        "company_form": pc.fill_null(arr.field("companyForm"), ""),
+        "status": pc.fill_null(arr.field("status"), ""),
+        "transformed_at": pa.repeat(transformed_at, size),
+        "street": _take_filled(address_values.field("street"), address),
+        "city": _take_filled(address_values.field("city"), address),
+        "post_code": _take_filled(address_values.field("postCode"), address),
+        "previous_names": pa.nulls(size, pa.list_(pa.string())),
+    }, schema=PRH_COMPANIES_SCHEMA)
+
+
+def _first_per_parent(parents: np.ndarray, size: int, mask: np.ndarray = None) -> np.ndarray:
+    """
+    Position of the first flattened list element per parent row.
+
+    Args:
+        parents: Parent row index of each flattened element
+        size: Number of parent rows
+        mask: Only consider elements where mask is True
+
+    Returns:
+        Array of length ``size`` with element positions, -1 where none
+    """
+    positions = np.arange(len(parents))
+    if mask is not None:
+        parents, positions = parents[mask], positions[mask]
+    rows, first = np.unique(parents, return_index=True)
+    result = np.full(size, -1, dtype=np.int64)
+    result[rows] = positions[first]
+    return result
+
+
+def _coalesce_index(*candidates: np.ndarray) -> np.ndarray:
+    """First non-negative position across candidate index arrays."""
+    result = candidates[0]
+    for candidate in candidates[1:]:
+        result = np.where(result >= 0, result, candidate)
+    return result
+
+
+def _take_or_null(index: np.ndarray, at: np.ndarray) -> np.ndarray:
+    """Compose two index arrays: ``index[at]`` with -1 propagated."""
+    if not len(index):
+        return np.full(len(at), -1, dtype=np.int64)
+    return np.where(at >= 0, index[np.maximum(at, 0)], -1)
+
+
+def _sorted_contains(haystack: np.ndarray, needles: np.ndarray) -> np.ndarray:
+    """Mask of ``needles`` present in the sorted array ``haystack``."""
+    if not len(haystack):
+        return np.zeros(len(needles), dtype=bool)
+    at = np.minimum(np.searchsorted(haystack, needles), len(haystack) - 1)
+    return haystack[at] == needles
+
+
+def _sorted_insert(haystack: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """The sorted array ``haystack`` with ``values`` added."""
+    values = np.sort(values)
+    return np.insert(haystack, np.searchsorted(haystack, values), values)
+
+
+def _take(values: pa.Array, index: np.ndarray) -> pa.Array:
+    """Gather values by position; -1 positions become null."""
+    return values.take(pa.array(index, mask=index < 0, type=pa.int64()))
+
+
+def _take_filled(values: pa.Array, index: np.ndarray) -> pa.Array:
+    """Like ``_take``, but missing values of existing elements become ''."""
+    taken = _take(values, index)
+    return pc.if_else(pa.array(index >= 0), pc.fill_null(taken, ""), taken)
+
+
+def iter_bronze_records(storage: AzureStorageClient, bronze_blob_path: str, records_path):
+    """
+    Iterate the records of a Bronze blob without loading the whole blob.
+
+    Compressed NDJSON blobs are decompressed chunk by chunk and yield one
+    record per line after the header. Plain JSON documents are parsed
+    incrementally with ijson at ``records_path`` (e.g. 'data.results'),
+    falling back to a full parse when ijson is not installed. A tuple of
+    paths is tried in order until one of them yields records.
+    """
+    if isinstance(records_path, tuple):
+        for path in records_path:
+            found = False
+            for record in iter_bronze_records(storage, bronze_blob_path, path):
+                found = True
+                yield record
+            if found:
+                return
+        return
+
+    chunks = iter(storage.stream_from_container(BRONZE_CONTAINER, bronze_blob_path))
+    first = next(chunks, b"")
+    reader = _bronze_reader(bronze_blob_path, first)
+    yield from reader(_chained(first, chunks), records_path)
+
+
+def _bronze_reader(bronze_blob_path: str, first: bytes):
+    """Record reader for a Bronze blob, chosen by its first bytes and its extension."""
+    if first.startswith(GZIP_MAGIC):
+        return _gzip_records
+    if first.startswith(ZSTD_MAGIC):
+        return _zstd_records
+    if bronze_blob_path.endswith(".ndjson"):
+        return _ndjson_records
+    return _ijson_records if ijson is not None else _json_records
+
+
+def _gzip_records(chunks, records_path: str):
+    """Records of a gzip-compressed NDJSON blob."""
+    yield from _ndjson_records(_gunzipped(chunks), records_path)
+
+
+def _zstd_records(chunks, records_path: str):
+    """Records of a zstd-compressed NDJSON blob."""
+    import zstandard
+    data = zstandard.ZstdDecompressor().read_to_iter(_ChunkStream(chunks), write_size=DECOMPRESSED_PIECE_SIZE)
+    yield from _ndjson_records(data, records_path)
+
+
+def _ndjson_records(data, records_path: str):
+    """Records of an NDJSON blob: every non-empty line after the header line."""
+    lines = _split_lines(data)
+    next(lines, None)  # header line with the payload metadata
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _ijson_records(chunks, records_path: str):
+    """Records of a JSON document, parsed incrementally at ``records_path``."""
+    yield from ijson.items(_ChunkStream(chunks), f"{records_path}.item", use_float=True)
+
+
+def _json_records(chunks, records_path: str):
+    """Records of a JSON document parsed in one piece (ijson not installed)."""
+    payload = json.loads(b"".join(chunks).decode("utf-8"))
+    for key in records_path.split("."):
+        payload = payload.get(key) or {}
+    yield from payload or []
+
+
+def batched(iterable, size: int):
+    """Yield lists of up to ``size`` items from an iterable."""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _chained(first: bytes, chunks):
+    yield first
+    yield from chunks
+
+
+def _gunzipped(chunks):
+    """Decompress gzip chunks in pieces of at most DECOMPRESSED_PIECE_SIZE bytes."""
+    decoder = zlib.decompressobj(wbits=31)
+    for chunk in chunks:
+        while chunk:
+            yield decoder.decompress(chunk, DECOMPRESSED_PIECE_SIZE)
+            chunk = decoder.unconsumed_tail
+    yield decoder.flush()
+
+
+def _split_lines(data):
+    """Split a stream of byte chunks into lines."""
+    pending = b""
+    for chunk in data:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        yield from lines
+    if pending:
+        yield pending
+
+
+class _ChunkStream(io.RawIOBase):
+    """Readable file object over an iterator of byte chunks (for ijson)."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            self._pending = next(self._chunks, None)
+            if self._pending is None:
+                self._pending = b""
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
 
 def get_latest_bronze_blob(storage: AzureStorageClient, source: str, dataset: str) -> str:
     """Get the most recent Bronze blob for a source/dataset."""
@@ -186,40 +879,70 @@ def get_latest_bronze_blob(storage: AzureStorageClient, source: str, dataset: st
     return None
 
 
-def run_transformations():
-    """Run transformations on latest Bronze data."""
-    transformer = DataTransformer()
-    storage = AzureStorageClient()
-    results = {}
+# Bronze → Silver transforms: (result key, Bronze prefix, DataTransformer method)
+TRANSFORM_SOURCES = [
+    ("fingrid", "fingrid/dataset_192/", "transform_fingrid_data"),
+    ("prh", "prh/companies_", "transform_prh_companies"),
+    ("stat_finland", "stat_finland/catalog/", "transform_stat_finland"),
+    ("stat_finland_tables", "stat_finland/tables/", "transform_stat_finland_table"),
+    ("eurostat", "eurostat/", "transform_eurostat"),
+]
 
-    print("\n🔄 Starting Data Transformations\n" + "=" * 50)
 
-    # Transform Fingrid
-    blob = get_latest_bronze_blob(storage, "fingrid", "dataset_192")
-    if blob:
-        try:
-            results["fingrid"] = transformer.transform_fingrid_data(blob)
-        except Exception as e:
-            results["fingrid"] = {"error": str(e)}
-            print(f"   ❌ Fingrid transform failed: {e}")
+def transform_source(transformer: DataTransformer, source: str) -> list:
+    """
+    Transform every Bronze blob of a source that has not been transformed yet.
 
-    # Transform PRH
-    blob = get_latest_bronze_blob(storage, "prh", "companies_Vivicta")
-    if blob:
-        try:
-            results["prh"] = transformer.transform_prh_companies(blob)
-        except Exception as e:
-            results["prh"] = {"error": str(e)}
-            print(f"   ❌ PRH transform failed: {e}")
+    Progress is checkpointed in the ``transform/<source>`` manifest (Bronze
+    blob → Silver blob), so blobs are processed once and in ingestion order.
+    A failure stops the source at the failing blob, which is retried on the
+    next run; after a crash, blobs recorded since the last manifest save
+    are transformed again (overwriting their Silver blobs).
+
+    Returns:
+        Silver blob paths written in this run
+    """
+    _, prefix, method = next(entry for entry in TRANSFORM_SOURCES if entry[0] == source)
+    with metrics.span(f"transform:{source}", stage="transform", source=source) as span:
+        with BlobManifest(transformer.storage, f"transform/{source}") as manifest:
+            pending = manifest.pending(transformer.storage.list_blobs(BRONZE_CONTAINER, prefix))
+            if not pending:
+                print(f"   ⏭️ {source}: no new Bronze blobs")
+
+            silver_paths = []
+            for blob in pending:
+                silver_path = getattr(transformer, method)(blob)
+                manifest.record(blob, silver_blob=silver_path)
+                if silver_path:
+                    silver_paths.append(silver_path)
+        span.attributes["blobs"] = len(pending)
+    return silver_paths
+
+
+def run_transformations(skip_sources: set = None, transformer: DataTransformer = None):
+    """
+    Transform all Bronze blobs that have not been transformed yet.
+
+    Args:
+        skip_sources: Sources whose Bronze data did not change since the
+            last run (e.g. {"stat_finland"}) and need no transform
+        transformer: DataTransformer to use (default: a new one)
+    """
+    skip_sources = skip_sources or set()
+    transformer = transformer or DataTransformer()
+    results = {}
+
+    print("\n🔄 Starting Data Transformations\n" + "=" * 50)
 
-    # Transform StatFi
-    blob = get_latest_bronze_blob(storage, "stat_finland", "catalog")
-    if blob:
+    for source, _, _ in TRANSFORM_SOURCES:
+        if source in skip_sources:
+            print(f"   ⏭️ {source}: unchanged since last run, skipping transform")
+            continue
         try:
-            results["stat_finland"] = transformer.transform_stat_finland(blob)
+            results[source] = transform_source(transformer, source)
         except Exception as e:
-            results["stat_finland"] = {"error": str(e)}
-            print(f"   ❌ StatFi transform failed: {e}")
+            results[source] = {"error": str(e)}
+            print(f"   ❌ {source} transform failed: {e}")
 
     print("\n" + "=" * 50)
     print("📊 Transformation Complete!")
@@ -0,0 +1,164 @@
+"""ConnectionPool sizing, timeouts, recycling and health checks against fake connections."""
+import threading
+import time
+
+import pyodbc
+import pytest
+
+from src import database
+from src.database import ConnectionPool
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, statement, *params):
+        if self.connection.broken:
+            raise pyodbc.Error("08S01", "communication link failure")
+        return self
+
+    def fetchone(self):
+        return (1,)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.broken = False
+        self.closed = False
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Connections opened by pyodbc.connect, in order."""
+    connections = []
+
+    def connect(connection_string):
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    monkeypatch.setattr(database.pyodbc, "connect", connect)
+    return connections
+
+
+def make_pool(**kwargs) -> ConnectionPool:
+    settings = {"max_size": 2, "timeout": 1.0, "idle_timeout": 60, "max_lifetime": 600, "ping_after": 60}
+    return ConnectionPool("DSN=test", **{**settings, **kwargs})
+
+
+def test_acquire_times_out_at_max_size(opened):
+    pool = make_pool(max_size=2, timeout=0.05)
+    pool.acquire()
+    pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+
+    stats = pool.stats()
+    assert len(opened) == 2
+    assert stats["open"] == 2 and stats["checked_out"] == 2
+    assert stats["waits"] == 1
+    assert stats["wait_seconds"] >= 0.04
+
+
+def test_waiter_gets_the_released_connection(opened):
+    pool = make_pool(max_size=1)
+    conn = pool.acquire()
+    releaser = threading.Timer(0.05, pool.release, args=(conn,))
+    releaser.start()
+
+    assert pool.acquire() is conn
+    releaser.join()
+    stats = pool.stats()
+    assert len(opened) == 1
+    assert stats["waits"] == 1 and stats["wait_seconds"] > 0
+    assert stats["checkouts"] == 2
+
+
+def test_zero_timeout_fails_without_waiting(opened):
+    pool = make_pool(max_size=1, timeout=0)
+    pool.acquire()
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+    assert time.monotonic() - started < 0.5
+
+
+def test_database_error_discards_the_connection(opened):
+    pool = make_pool()
+    with pytest.raises(pyodbc.Error):
+        with pool.connection():
+            raise pyodbc.Error("42000", "syntax error")
+
+    assert opened[0].closed
+    assert pool.stats()["open"] == 0
+    with pool.connection() as conn:
+        assert conn is opened[1]
+
+
+def test_other_error_rolls_back_and_keeps_the_connection(opened):
+    pool = make_pool()
+    with pytest.raises(ValueError):
+        with pool.connection():
+            raise ValueError("bad row")
+
+    assert opened[0].rollbacks == 1 and not opened[0].closed
+    with pool.connection() as conn:
+        assert conn is opened[0]
+
+
+def test_idle_connection_is_retired(opened):
+    pool = make_pool(idle_timeout=0.02)
+    pool.release(pool.acquire())
+    time.sleep(0.05)
+
+    assert pool.acquire() is opened[1]
+    assert opened[0].closed
+    assert pool.stats()["recycled"] == 1
+
+
+def test_old_connection_is_retired_at_max_lifetime(opened):
+    pool = make_pool(max_lifetime=0.02)
+    conn = pool.acquire()
+    time.sleep(0.05)
+    pool.release(conn)
+
+    assert opened[0].closed
+    assert pool.stats()["open"] == 0
+    assert pool.acquire() is opened[1]
+
+
+def test_stale_connections_behind_a_fresh_one_are_closed_on_release(opened):
+    pool = make_pool(idle_timeout=0.05)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    time.sleep(0.1)
+    pool.release(second)
+
+    assert opened[0].closed and not opened[1].closed
+    assert pool.stats()["idle"] == 1
+
+
+def test_failed_ping_replaces_the_connection(opened):
+    pool = make_pool(ping_after=0)
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.broken = True
+
+    assert pool.acquire() is opened[1]
+    assert conn.closed
+    stats = pool.stats()
+    assert stats["failed_health_checks"] == 1
+    assert stats["open"] == 1 and stats["checkouts"] == 2  # the failed check-out is not counted
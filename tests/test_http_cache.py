@@ -0,0 +1,41 @@
+"""HttpValidationCache: conditional headers and concurrent first use."""
+import threading
+import time
+
+from src.http_cache import HttpValidationCache
+
+URL = "https://statfin.stat.fi/PxWeb/api/v1/en/StatFin/"
+
+
+class SlowStorage:
+    def __init__(self, entries: dict):
+        self.entries = entries
+        self.reads = 0
+
+    def read_state(self, name):
+        self.reads += 1
+        time.sleep(0.02)  # long enough for unsynchronised callers to overlap
+        return {"entries": self.entries}
+
+    def write_state(self, name, state):
+        pass
+
+
+def test_conditional_headers_from_stored_validators():
+    cache = HttpValidationCache(SlowStorage({URL: {"etag": '"v1"', "last_modified": None}}))
+    assert cache.conditional_headers(URL) == {"If-None-Match": '"v1"'}
+    assert cache.conditional_headers("https://example.com/") == {}
+
+
+def test_concurrent_first_lookups_load_the_index_once():
+    storage = SlowStorage({URL: {"etag": '"v1"', "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT"}})
+    cache = HttpValidationCache(storage)
+    headers = []
+    threads = [threading.Thread(target=lambda: headers.append(cache.conditional_headers(URL))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert storage.reads == 1
+    assert all(header["If-None-Match"] == '"v1"' for header in headers) and len(headers) == 8
@@ -0,0 +1,209 @@
+"""Ingestion: PRH crawl partitions and resume, Fingrid windows and watermarks, PxWeb chunk planning."""
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+import requests
+
+from benchmarks.stubs import MemoryBlobServiceClient, StubAPIServer
+from benchmarks.synthetic import SyntheticAPI
+from src import ingest
+from src.ingest import PRH_CRAWL_STATE, DataIngester, _ordered_results, plan_pxweb_chunks
+from src.storage import AzureStorageClient
+from src.transform import iter_bronze_records
+
+COMPANIES = 1000
+WATERMARK = "fingrid/dataset_192_watermark"
+WINDOW = {"start_time": datetime(2024, 1, 1), "end_time": datetime(2024, 1, 2), "page_size": 10}
+
+
+@pytest.fixture
+def crawler(monkeypatch):
+    # Two 12-year windows of 500 companies, each split in two halves of about 250 (three pages each)
+    monkeypatch.setattr(ingest, "PRH_PARTITION_MAX_RESULTS", 300)
+    payloads = SyntheticAPI(scale=0.001)
+    payloads.prh_companies = COMPANIES
+    with StubAPIServer(latency=0, payloads=payloads) as server:
+        storage = AzureStorageClient(blob_service_client=MemoryBlobServiceClient())
+        ingester = DataIngester(storage=storage, endpoints=server.endpoints)
+        yield ingester
+        ingester.close()
+
+
+def crawl(ingester, **kwargs) -> dict:
+    options = {"start_date": "2000-01-01", "end_date": "2023-12-31", "partition_days": 4383}
+    return ingester.crawl_prh_companies(**{**options, **kwargs})
+
+
+def business_ids(ingester, blob_path: str) -> list:
+    records = iter_bronze_records(ingester.storage, blob_path, ("data.companies",))
+    return [int(company["businessId"]["value"].split("-")[0]) for company in records]
+
+
+def test_crawl_writes_every_company_once_in_page_order(crawler):
+    result = crawl(crawler)
+
+    assert result["status"] == "success" and not result["resumed"]
+    assert result["records"] == COMPANIES
+    assert len(result["blob_paths"]) == 4
+    written = [business_ids(crawler, path) for path in result["blob_paths"]]
+    assert all(200 < len(ids) <= 300 for ids in written)
+    assert sum(written, []) == list(range(COMPANIES))
+
+
+def test_windows_over_the_limit_are_split_before_writing(crawler):
+    crawl(crawler)
+
+    state = crawler.storage.read_state(PRH_CRAWL_STATE)
+    assert sorted(state["partitions"]) == [
+        "2000-01-01_2005-12-31", "2006-01-01_2011-12-31",
+        "2012-01-01_2017-12-31", "2018-01-01_2023-12-31",
+    ]
+    assert all(partition["records"] <= 300 for partition in state["partitions"].values())
+    assert state["completed_at"] and state["high_water_mark"] == "2023-12-31"
+
+
+def test_interrupted_crawl_resumes_without_refetching_finished_partitions(crawler):
+    first = crawl(crawler)
+    state = crawler.storage.read_state(PRH_CRAWL_STATE)
+    lost = state["partitions"].pop("2012-01-01_2017-12-31")
+    state["completed_at"] = None
+    crawler.storage.write_state(PRH_CRAWL_STATE, state)
+
+    resumed = crawler.crawl_prh_companies()
+
+    assert resumed["resumed"] and resumed["crawl_id"] == first["crawl_id"]
+    assert resumed["partitions"] == 1 and resumed["records"] == lost["records"]
+    assert len(crawler.storage.read_state(PRH_CRAWL_STATE)["partitions"]) == 4
+
+
+def test_completed_crawl_restarts_from_its_high_water_mark(crawler):
+    crawl(crawler)
+    result = crawler.crawl_prh_companies(end_date="2023-12-31")
+
+    assert not result["resumed"]
+    assert crawler.storage.read_state(PRH_CRAWL_STATE)["range"] == ["2023-12-31", "2023-12-31"]
+
+
+def test_ordered_results_keep_input_order_with_a_bounded_window():
+    started, running, peak = [], [0], [0]
+    lock = threading.Lock()
+
+    def fetch(item):
+        with lock:
+            started.append(item)
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01 * (5 - item % 5))  # later items finish first
+        with lock:
+            running[0] -= 1
+        return item * 10
+
+    results = _ordered_results(fetch, range(20), max_in_flight=3)
+    assert next(results) == 0
+    assert len(started) <= 4  # the window, plus the one submitted when the first result was taken
+    assert list(results) == [item * 10 for item in range(1, 20)]
+    assert peak[0] <= 3
+
+
+class MissingFingridPage(SyntheticAPI):
+    """Synthetic payloads with one Fingrid page answering 404."""
+
+    def __init__(self, page: str):
+        super().__init__(scale=0.001)
+        self.missing_page = page
+
+    def respond(self, method, path, query, body):
+        if path.startswith("/fingrid/") and query.get("page") == [self.missing_page]:
+            return 404, {}, {"error": "not found"}
+        return super().respond(method, path, query, body)
+
+
+@pytest.fixture
+def fingrid_key(monkeypatch):
+    monkeypatch.setattr(ingest, "FINGRID_API_KEY", "test-key")
+
+
+@contextmanager
+def fingrid_ingester(payloads):
+    payloads.fingrid_records = 50
+    with StubAPIServer(latency=0, payloads=payloads) as server:
+        storage = AzureStorageClient(blob_service_client=MemoryBlobServiceClient())
+        ingester = DataIngester(storage=storage, endpoints=server.endpoints)
+        yield ingester
+        ingester.close()
+
+
+def test_fingrid_window_stores_every_page_and_advances_the_watermark(fingrid_key):
+    with fingrid_ingester(SyntheticAPI(scale=0.001)) as ingester:
+        result = ingester.ingest_fingrid_window(192, **WINDOW)
+
+    assert result["pages"] == 5 and result["records"] == 50
+    assert len(result["blob_paths"]) == 5 and result["blob_path"] == result["blob_paths"][0]
+    # 50 three-minute intervals from midnight: the last one starts at 02:27
+    assert ingester.storage.read_state(WATERMARK)["high_water_mark"] == "2024-01-01T02:27:00.000Z"
+
+
+def test_fingrid_watermark_does_not_advance_when_a_page_fails(fingrid_key):
+    with fingrid_ingester(MissingFingridPage("3")) as ingester:
+        ingester.storage.write_state(WATERMARK, {"dataset_id": 192, "high_water_mark": "2023-12-31T23:57:00.000Z"})
+        with pytest.raises(requests.HTTPError):
+            ingester.ingest_fingrid_window(192, **WINDOW)
+
+    assert ingester.storage.read_state(WATERMARK)["high_water_mark"] == "2023-12-31T23:57:00.000Z"
+
+
+def test_fingrid_window_starts_after_the_watermark(fingrid_key):
+    with fingrid_ingester(SyntheticAPI(scale=0.001)) as ingester:
+        ingester.storage.write_state(WATERMARK, {"dataset_id": 192, "high_water_mark": "2024-01-01T06:00:00.000Z"})
+        incremental = ingester.ingest_fingrid_window(192, **WINDOW)
+        refetch = ingester.ingest_fingrid_window(192, incremental=False, **WINDOW)
+
+    assert incremental["window"][0] == "2024-01-01T06:00:01Z"
+    assert refetch["window"][0] == "2024-01-01T00:00:00Z"
+
+
+def cells(selection: dict) -> list:
+    """Every cell of a selection as a {variable: value} tuple, in a fixed variable order."""
+    codes = sorted(selection)
+    return [tuple(zip(codes, values)) for values in itertools.product(*(selection[code] for code in codes))]
+
+
+def assert_chunks_recombine(selection: dict, chunks: list, cell_limit: int) -> None:
+    assert all(len(cells(chunk)) <= cell_limit for chunk in chunks)
+    assert sorted(sum((cells(chunk) for chunk in chunks), [])) == sorted(cells(selection))
+
+
+def test_small_selection_is_one_chunk():
+    selection = {"Alue": ["SSS", "091"], "Vuosi": ["2022", "2023"]}
+    assert plan_pxweb_chunks(selection, 4) == [selection]
+
+
+def test_chunks_slice_the_largest_variable_and_recombine_exactly():
+    selection = {"Alue": [f"{n:03d}" for n in range(10)], "Vuosi": ["2021", "2022", "2023"], "Tiedot": ["a", "b"]}
+    chunks = plan_pxweb_chunks(selection, 20)
+
+    assert len(chunks) == 4  # three municipalities (18 cells) per chunk
+    assert all(chunk["Vuosi"] == selection["Vuosi"] for chunk in chunks)
+    assert_chunks_recombine(selection, chunks, 20)
+
+
+def test_one_value_over_the_limit_splits_the_next_variable():
+    # One Alue value is already 3 x 3 = 9 cells, over the limit of 5
+    selection = {"Alue": ["a", "b", "c", "d"], "Vuosi": ["2021", "2022", "2023"], "Tiedot": ["x", "y", "z"]}
+    chunks = plan_pxweb_chunks(selection, 5)
+
+    assert all(len(chunk["Alue"]) == 1 for chunk in chunks)
+    assert len(chunks) == 12
+    assert_chunks_recombine(selection, chunks, 5)
+
+
+def test_single_variable_longer_than_the_limit():
+    selection = {"Alue": [str(n) for n in range(100)]}
+    chunks = plan_pxweb_chunks(selection, 30)
+
+    assert [len(chunk["Alue"]) for chunk in chunks] == [30, 30, 30, 10]
+    assert_chunks_recombine(selection, chunks, 30)
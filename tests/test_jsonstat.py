@@ -0,0 +1,58 @@
+"""JSON-stat decoding: dense and sparse values, status flags and index-less dimensions."""
+import pytest
+
+from src.jsonstat import category_codes, decode_jsonstat
+
+DIMENSIONS = {
+    "unit": {"category": {"label": {"EUR": "Euro"}}},  # single category, no index
+    "geo": {"category": {"index": {"SE": 1, "FI": 0}}},
+    "time": {"category": {"index": ["2020", "2021", "2022"]}},
+}
+DENSE = [1.0, 2.0, None, 4.0, 5.0, 6.0]
+SPARSE = {"5": 6.0, "0": 1.0, "3": 4.0, "1": 2.0, "4": 5.0}
+
+
+def dataset(value, status=None) -> dict:
+    doc = {"id": ["unit", "geo", "time"], "size": [1, 2, 3], "dimension": DIMENSIONS, "value": value}
+    if status is not None:
+        doc["status"] = status
+    return doc
+
+
+def rows(doc: dict) -> list:
+    return [
+        (row["unit"], row["geo"], row["time"], row["value"], row["status"])
+        for row in decode_jsonstat(doc).to_pylist()
+    ]
+
+
+@pytest.mark.parametrize("value", [DENSE, SPARSE], ids=["dense", "sparse"])
+def test_observed_cells_are_decoded_row_major(value):
+    assert rows(dataset(value)) == [
+        ("EUR", "FI", "2020", 1.0, None),
+        ("EUR", "FI", "2021", 2.0, None),
+        ("EUR", "SE", "2020", 4.0, None),
+        ("EUR", "SE", "2021", 5.0, None),
+        ("EUR", "SE", "2022", 6.0, None),
+    ]
+
+
+@pytest.mark.parametrize("status", [
+    ["p", None, "e", "e", None, None],
+    {"3": "e", "0": "p", "2": "e"},
+], ids=["list", "dict"])
+@pytest.mark.parametrize("value", [DENSE, SPARSE], ids=["dense", "sparse"])
+def test_status_flags_follow_their_cells(value, status):
+    # Cell 2 has no value, so its flag is dropped with it
+    flags = [row[-1] for row in rows(dataset(value, status))]
+    assert flags == ["p", None, "e", None, None]
+
+
+def test_single_status_string_applies_to_every_cell():
+    assert {row[-1] for row in rows(dataset(SPARSE, "p"))} == {"p"}
+
+
+def test_category_codes_without_index():
+    assert category_codes(DIMENSIONS["unit"]) == ["EUR"]
+    assert category_codes({"category": {}}) == [""]
+    assert category_codes(DIMENSIONS["geo"]) == ["FI", "SE"]
@@ -0,0 +1,60 @@
+"""BlobManifest: batched saves, flush on exit and pruning of deleted blobs."""
+import pytest
+
+from src.manifest import BlobManifest
+
+
+class RecordingStorage:
+    def __init__(self):
+        self.states = {}
+        self.writes = 0
+
+    def read_state(self, name):
+        return self.states.get(name)
+
+    def write_state(self, name, state):
+        self.states[name] = state
+        self.writes += 1
+
+
+def blobs(count: int) -> list:
+    return [f"fingrid/dataset_192/20240101_{n:06d}.json" for n in range(count)]
+
+
+def test_record_saves_every_few_blobs_and_on_exit():
+    storage = RecordingStorage()
+    with BlobManifest(storage, "transform/fingrid", save_every=10) as manifest:
+        for blob in manifest.pending(blobs(25)):
+            manifest.record(blob, silver_blob=blob)
+    assert storage.writes == 3  # after 10 and 20 blobs, then the last 5 on exit
+
+    resumed = BlobManifest(storage, "transform/fingrid")
+    assert resumed.pending(blobs(30)) == blobs(30)[25:]
+
+
+def test_blobs_recorded_before_a_failure_are_saved():
+    storage = RecordingStorage()
+    with pytest.raises(RuntimeError):
+        with BlobManifest(storage, "load/electricity", save_every=10) as manifest:
+            manifest.record(blobs(1)[0], rows=1)
+            raise RuntimeError("load failed")
+
+    assert BlobManifest(storage, "load/electricity").is_done(blobs(1)[0])
+
+
+def test_nothing_is_written_when_nothing_changed():
+    storage = RecordingStorage()
+    with BlobManifest(storage, "load/electricity") as manifest:
+        assert manifest.pending([]) == []
+    assert storage.writes == 0
+
+
+def test_entries_of_deleted_blobs_are_pruned():
+    storage = RecordingStorage()
+    with BlobManifest(storage, "load/electricity", save_every=10) as manifest:
+        for blob in manifest.pending(blobs(5)):
+            manifest.record(blob, rows=1)
+
+    with BlobManifest(storage, "load/electricity") as manifest:
+        assert manifest.pending(blobs(5)[3:]) == []
+    assert sorted(storage.states["load/electricity"]["entries"]) == blobs(5)[3:]
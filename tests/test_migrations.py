@@ -0,0 +1,98 @@
+"""Schema migrations: order, one transaction per version and idempotent re-runs."""
+from contextlib import contextmanager
+
+import pytest
+
+from src.migrations import MIGRATIONS, apply_migrations, current_version
+
+LATEST = MIGRATIONS[-1][0]
+
+
+class RecordingCursor:
+    def __init__(self, db, transaction: list):
+        self.db = db
+        self.transaction = transaction
+
+    def execute(self, statement, params=None):
+        if self.db.fail_on and self.db.fail_on in statement:
+            raise RuntimeError("migration failed")
+        self.transaction.append((statement, params))
+
+
+class RecordingConnection:
+    def __init__(self, db):
+        self.db = db
+        self.pending = []
+
+    def cursor(self):
+        return RecordingCursor(self.db, self.pending)
+
+    def commit(self):
+        self.db.commit(self.pending)
+        self.pending = []
+
+
+class RecordingDB:
+    """
+    DatabaseManager stand-in keeping the schema_migrations rows of
+    committed transactions; a transaction that raises is rolled back.
+    """
+
+    def __init__(self, fail_on: str = None):
+        self.fail_on = fail_on
+        self.versions = []
+        self.transactions = []
+
+    def commit(self, statements: list) -> None:
+        if not statements:
+            return
+        self.transactions.append(statements)
+        for statement, params in statements:
+            if statement.startswith("INSERT INTO schema_migrations"):
+                self.versions.append(params[0])
+
+    @contextmanager
+    def get_connection(self):
+        yield RecordingConnection(self)
+
+    def execute_query(self, query, params=None):
+        pass
+
+    def fetch_all(self, query, params=None):
+        return [{"version": max(self.versions, default=0)}]
+
+
+def test_fresh_database_is_at_version_zero():
+    assert current_version(RecordingDB()) == 0
+
+
+def test_versions_are_applied_in_order_one_transaction_each():
+    db = RecordingDB()
+    assert apply_migrations(db) == [number for number, _, _ in MIGRATIONS]
+    assert db.versions == list(range(1, LATEST + 1))
+
+    assert len(db.transactions) == len(MIGRATIONS)
+    for transaction, (number, _, statements) in zip(db.transactions, MIGRATIONS):
+        # The version's statements, then its schema_migrations row, in the same commit
+        assert [statement for statement, _ in transaction[:-1]] == statements
+        assert transaction[-1][1][0] == number
+
+
+def test_target_stops_at_that_version():
+    db = RecordingDB()
+    assert apply_migrations(db, target=3) == [1, 2, 3]
+    assert apply_migrations(db) == list(range(4, LATEST + 1))
+
+
+def test_rerun_after_a_failed_migration_resumes_and_then_is_a_no_op():
+    db = RecordingDB(fail_on="ix_dim_companies_name")  # a statement of version 4
+    with pytest.raises(RuntimeError):
+        apply_migrations(db)
+    assert db.versions == [1, 2, 3]
+    assert current_version(db) == 3
+
+    db.fail_on = None
+    assert apply_migrations(db) == list(range(4, LATEST + 1))
+    committed = len(db.transactions)
+    assert apply_migrations(db) == []
+    assert len(db.transactions) == committed
@@ -0,0 +1,94 @@
+"""DagScheduler: dependency order, skips after a failure and the critical path."""
+import time
+
+import pytest
+
+from src.scheduler import DagScheduler
+
+
+def sleeper(seconds: float, value):
+    def task(upstream):
+        time.sleep(seconds)
+        return value
+    return task
+
+
+def failing(upstream):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def outcome():
+    #   extract ─┬─ clean ─── publish
+    #            └─ broken ── enrich ── report
+    #   other (independent)
+    scheduler = DagScheduler(max_workers=4)
+    scheduler.add("extract", sleeper(0.05, "rows"))
+    scheduler.add("clean", lambda upstream: upstream["extract"].upper(), ["extract"])
+    scheduler.add("publish", sleeper(0.05, "published"), ["clean"])
+    scheduler.add("broken", failing, ["extract"])
+    scheduler.add("enrich", sleeper(0, "never"), ["broken"])
+    scheduler.add("report", sleeper(0, "never"), ["enrich"])
+    scheduler.add("other", sleeper(0, "independent"))
+    return scheduler.run()
+
+
+def test_results_flow_to_dependents(outcome):
+    assert outcome["results"]["clean"] == "ROWS"
+    assert outcome["results"]["publish"] == "published"
+    assert outcome["results"]["other"] == "independent"
+
+
+def test_failure_skips_dependents_transitively(outcome):
+    status = {name: timing["status"] for name, timing in outcome["timings"].items()}
+    assert status == {
+        "extract": "success", "clean": "success", "publish": "success", "other": "success",
+        "broken": "failed", "enrich": "skipped", "report": "skipped",
+    }
+    assert outcome["results"]["broken"] == {"error": "boom"}
+    assert outcome["results"]["enrich"] is None and outcome["results"]["report"] is None
+
+
+def test_critical_path_is_the_longest_chain(outcome):
+    assert outcome["critical_path"] == ["extract", "clean", "publish"]
+    timings = outcome["timings"]
+    expected = sum(timings[name]["seconds"] for name in outcome["critical_path"])
+    assert outcome["critical_path_seconds"] == pytest.approx(expected, abs=0.002)
+    assert outcome["critical_path_seconds"] <= outcome["wall_seconds"]
+
+
+def test_dependents_start_after_their_dependencies_end(outcome):
+    timings = outcome["timings"]
+    assert timings["clean"]["start"] >= timings["extract"]["end"]
+    assert timings["publish"]["start"] >= timings["clean"]["end"]
+
+
+def test_unknown_dependency_is_rejected():
+    scheduler = DagScheduler()
+    with pytest.raises(ValueError, match="unknown tasks"):
+        scheduler.add("load", failing, ["transform"])
+
+
+def test_duplicate_name_is_rejected():
+    scheduler = DagScheduler()
+    scheduler.add("load", failing)
+    with pytest.raises(ValueError, match="already registered"):
+        scheduler.add("load", failing)
+
+
+def test_empty_dag():
+    outcome = DagScheduler().run()
+    assert outcome["results"] == {} and outcome["critical_path"] == []
+
+
+def test_always_task_runs_after_a_failed_dependency():
+    scheduler = DagScheduler(max_workers=2)
+    scheduler.add("load:a", sleeper(0, "loaded"))
+    scheduler.add("load:b", failing)
+    scheduler.add("publish", lambda upstream: dict(upstream), ["load:a", "load:b"], always=True)
+    scheduler.add("notify", sleeper(0, "sent"), ["publish"])
+    outcome = scheduler.run()
+
+    assert outcome["timings"]["publish"]["status"] == "success"
+    assert outcome["results"]["publish"] == {"load:a": "loaded", "load:b": {"error": "boom"}}
+    assert outcome["results"]["notify"] == "sent"
@@ -0,0 +1,65 @@
+"""Electricity series helpers of the dashboard API: level choice, LTTB and envelopes."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from api.function_app import SERIES_LEVELS, SERIES_OVERSAMPLE, choose_level, envelopes, lttb
+
+START = datetime(2024, 1, 1)
+
+
+def test_lttb_keeps_everything_when_threshold_covers_the_series():
+    xs = list(range(10))
+    assert lttb(xs, xs, 10) == list(range(10))
+    assert lttb(xs, xs, 50) == list(range(10))
+
+
+@pytest.mark.parametrize("threshold", [0, 1, 2])
+def test_lttb_keeps_everything_below_three_points(threshold):
+    xs = list(range(10))
+    assert lttb(xs, xs, threshold) == list(range(10))
+
+
+def test_lttb_keeps_first_last_and_threshold_points():
+    xs = list(range(100))
+    ys = [(x * 37) % 11 for x in xs]
+    keep = lttb(xs, ys, 12)
+    assert len(keep) == 12
+    assert keep[0] == 0 and keep[-1] == 99
+    assert keep == sorted(set(keep))
+
+
+def test_lttb_keeps_a_spike():
+    xs = list(range(100))
+    ys = [0.0] * 100
+    ys[41] = 1000.0
+    assert 41 in lttb(xs, ys, 10)
+
+
+@pytest.mark.parametrize("position", range(len(SERIES_LEVELS)))
+def test_choose_level_boundaries(position):
+    name, bucket_seconds, _ = SERIES_LEVELS[position]
+    points = 100
+    # The widest span a level serves returns exactly points * SERIES_OVERSAMPLE rows
+    widest = timedelta(seconds=bucket_seconds * points * SERIES_OVERSAMPLE)
+    assert choose_level(START, START + widest, points)[0] == name
+    beyond = choose_level(START, START + widest + timedelta(seconds=1), points)[0]
+    if position + 1 < len(SERIES_LEVELS):
+        assert beyond == SERIES_LEVELS[position + 1][0]
+    else:
+        assert beyond == name  # the coarsest level serves any span
+
+
+def test_envelopes_cover_dropped_rows():
+    lows = [5, 4, -20, 6, 5, 7, 3, 8]
+    highs = [6, 9, 7, 50, 8, 9, 4, 9]
+    mins, maxs = envelopes([0, 4, 7], lows, highs)
+    assert min(mins) == -20 and max(maxs) == 50
+    # Every row is counted once: rows 0-2 belong to index 0, 3-5 to 4, 6-7 to 7
+    assert mins == [-20, 5, 3]
+    assert maxs == [9, 50, 9]
+
+
+def test_envelopes_of_every_row_are_the_rows_themselves():
+    lows, highs = [1, 2, 3], [4, 5, 6]
+    assert envelopes([0, 1, 2], lows, highs) == (lows, highs)
@@ -0,0 +1,16 @@
+"""SnapshotPublisher versions: every publish gets its own immutable blobs."""
+from benchmarks.stubs import MemoryBlobServiceClient
+from src.snapshots import SnapshotPublisher
+from src.storage import AzureStorageClient
+
+
+def test_back_to_back_publishes_do_not_overwrite_each_other():
+    storage = AzureStorageClient(blob_service_client=MemoryBlobServiceClient())
+    publisher = SnapshotPublisher(storage=storage, db=object())
+
+    first = publisher.publish({"stats": {"total": 1}})
+    second = publisher.publish({"stats": {"total": 2}})
+
+    assert first["version"] != second["version"]
+    assert first["views"]["stats"] != second["views"]["stats"]
+    assert sorted([first["version"], second["version"]]) == [first["version"], second["version"]]
@@ -0,0 +1,57 @@
+"""Fingrid batch transforms: both engines drop the same duplicates. Bronze record readers."""
+import pytest
+
+from benchmarks.stubs import MemoryBlobServiceClient
+from src import transform
+from src.storage import AzureStorageClient
+from src.transform import _fingrid_batch_arrow, _fingrid_batch_pandas, iter_bronze_records
+
+BATCH_TRANSFORMS = {"pandas": _fingrid_batch_pandas, "arrow": _fingrid_batch_arrow}
+
+
+def record(value, dataset_id=192, start="2024-01-01T00:00:00.000Z"):
+    return {"datasetId": dataset_id, "startTime": start, "endTime": "2024-01-01T00:03:00.000Z", "value": value}
+
+
+def run_batches(engine: str, batches: list) -> list:
+    seen, tables = None, []
+    for batch in batches:
+        table, seen = BATCH_TRANSFORMS[engine](batch, seen, "2024-01-02T00:00:00", "fingrid/test.json")
+        tables.append(table.to_pylist())
+    return tables
+
+
+@pytest.mark.parametrize("engine", list(BATCH_TRANSFORMS))
+def test_duplicate_across_int_and_float_batches_is_dropped(engine):
+    # The second batch holds a float, so pandas infers float64 values there but int64 in the first
+    batches = [
+        [record(9000), record(9001, start="2024-01-01T00:03:00.000Z")],
+        [record(9000), record(9001.5, start="2024-01-01T00:06:00.000Z")],
+    ]
+    first, second = run_batches(engine, batches)
+    assert len(first) == 2
+    assert [row["value"] for row in second] == [9001.5]
+
+
+def test_engines_agree_on_mixed_dtype_and_null_batches():
+    batches = [
+        [record(9000, dataset_id=None), record(9001, start=None), record("n/a"), record(9002)],
+        [record(9000.0, dataset_id=None), record(9001.0, start=None), record(9002.0), {"datasetId": 192}],
+        [record(-1), record(9003.25, dataset_id=193)],
+    ]
+    assert run_batches("pandas", batches) == run_batches("arrow", batches)
+
+
+@pytest.mark.parametrize("use_ijson", [True, False])
+@pytest.mark.parametrize("fmt", ["json", "ndjson.gz", "ndjson.zst"])
+def test_bronze_records_read_back_in_every_format(monkeypatch, fmt, use_ijson):
+    if not use_ijson:
+        monkeypatch.setattr(transform, "ijson", None)
+    storage = AzureStorageClient(blob_service_client=MemoryBlobServiceClient())
+    records = [record(9000 + n) for n in range(2000)]
+    blob_path = storage.upload_to_bronze(data={"data": {"results": list(records)}}, source_name="fingrid",
+                                         dataset_name="test", records_path="data.results", fmt=fmt)
+
+    assert list(iter_bronze_records(storage, blob_path, "data.results")) == records
+    # A tuple of paths falls through to the first one holding records
+    assert list(iter_bronze_records(storage, blob_path, ("data.companies", "data.results"))) == records